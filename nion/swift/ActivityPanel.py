@@ -30,12 +30,16 @@ class ActivityHandler(Declarative.HandlerLike):
         self.ui_view = u.create_row(
             u.create_label(text="@binding(activity.displayed_title)", word_wrap=True, width=296),
             u.create_stretch(),
+            u.create_push_button(text=_("Cancel"), on_clicked="cancel", visible="@binding(activity.can_cancel)"),
             spacing=8
         )
 
     def close(self) -> None:
         pass
 
+    def cancel(self, widget: Declarative.UIWidget) -> None:
+        self.activity.cancel()
+
 
 class ActivityComponentFactory(typing.Protocol):
     def make_activity_component(self, activity: Activity.Activity) -> typing.Optional[Declarative.HandlerLike]: ...
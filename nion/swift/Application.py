@@ -13,6 +13,7 @@ import pathlib
 import pkgutil
 import re
 import sys
+import time
 import typing
 import uuid
 
@@ -20,29 +21,26 @@ import uuid
 # None
 
 # local libraries
-from nion.swift import ActivityPanel
 from nion.swift import DataPanel
 from nion.swift import DocumentController
 from nion.swift import FilterPanel
-from nion.swift import HistogramPanel
-from nion.swift import InfoPanel
 from nion.swift import Inspector
-from nion.swift import MetadataPanel
 from nion.swift import NotificationDialog
 from nion.swift import Panel
 from nion.swift import ProjectPanel
-from nion.swift import SessionPanel
 from nion.swift import Task
 from nion.swift import Test
-from nion.swift import ToolbarPanel
 from nion.swift import Workspace
 from nion.swift.model import ApplicationData
 from nion.swift.model import Cache
 from nion.swift.model import ColorMaps
+from nion.swift.model import DataResidency
 from nion.swift.model import DocumentModel
 from nion.swift.model import FileStorageSystem
+from nion.swift.model import ImportExportManager
 from nion.swift.model import PlugInManager
 from nion.swift.model import Profile
+from nion.swift.model import Symbolic
 from nion.ui import Application as UIApplication
 from nion.ui import CanvasItem
 from nion.ui import Declarative
@@ -121,21 +119,28 @@ class Application(UIApplication.BaseApplication):
 
         self.__menu_handlers: typing.List[typing.Callable[[DocumentController.DocumentController], None]] = []
 
+        # the duration of each startup step, for the startup report.
+        self.__startup_times: typing.List[typing.Tuple[str, float]] = list()
+
+        # placeholders for contributions of plug-ins which are loaded on first use.
+        self.__lazy_io_handlers: typing.List[ImportExportManager.ImportExportHandler] = list()
+
         Registry.register_component(Inspector.DeclarativeImageChooserConstructor(self), {"declarative_constructor"})
         Registry.register_component(Inspector.DeclarativeDataSourceChooserConstructor(self), {"declarative_constructor"})
 
+        # panel modules not otherwise needed at startup are imported when the panel is first shown.
         workspace_manager = Workspace.WorkspaceManager()
-        workspace_manager.register_panel(SessionPanel.SessionPanel, "session-panel", _("Session"), ["left", "right"], "right", {"min-width": 320, "height": 80})
+        workspace_manager.register_panel(Workspace.import_panel_class("nion.swift.SessionPanel", "SessionPanel"), "session-panel", _("Session"), ["left", "right"], "right", {"min-width": 320, "height": 80})
         workspace_manager.register_panel(ProjectPanel.CollectionsPanel, "collections-panel", _("Collections"), ["left", "right"], "left", {"min-width": 320, "min-height": 200})
         workspace_manager.register_panel(DataPanel.DataPanel, "data-panel", _("Data Panel"), ["left", "right"], "left", {"min-width": 320, "min-height": 320})
-        workspace_manager.register_panel(HistogramPanel.HistogramPanel, "histogram-panel", _("Histogram"), ["left", "right"], "right", {"min-width": 320, "height": 140})
-        workspace_manager.register_panel(InfoPanel.InfoPanel, "info-panel", _("Info"), ["left", "right"], "right", {"min-width": 320, "height": 60})
+        workspace_manager.register_panel(Workspace.import_panel_class("nion.swift.HistogramPanel", "HistogramPanel"), "histogram-panel", _("Histogram"), ["left", "right"], "right", {"min-width": 320, "height": 140})
+        workspace_manager.register_panel(Workspace.import_panel_class("nion.swift.InfoPanel", "InfoPanel"), "info-panel", _("Info"), ["left", "right"], "right", {"min-width": 320, "height": 60})
         workspace_manager.register_panel(Inspector.InspectorPanel, "inspector-panel", _("Inspector"), ["left", "right"], "right", {"min-width": 320})
         workspace_manager.register_panel(Task.TaskPanel, "task-panel", _("Task Panel"), ["left", "right"], "right", {"min-width": 320})
         workspace_manager.register_panel(Panel.OutputPanel, "output-panel", _("Output"), ["bottom"], "bottom", {"min-width": 480, "min-height": 200})
-        workspace_manager.register_panel(ToolbarPanel.ToolbarPanel, "toolbar-panel", _("Toolbar"), ["top"], "top", {"height": 30})
-        workspace_manager.register_panel(MetadataPanel.MetadataPanel, "metadata-panel", _("Metadata"), ["left", "right"], "right", {"width": 320, "height": 8})
-        workspace_manager.register_panel(ActivityPanel.ActivityPanel, "activity-panel", _("Activity"), ["left", "right"], "right", {"min-width": 320, "height": 80})
+        workspace_manager.register_panel(Workspace.import_panel_class("nion.swift.ToolbarPanel", "ToolbarPanel"), "toolbar-panel", _("Toolbar"), ["top"], "top", {"height": 30})
+        workspace_manager.register_panel(Workspace.import_panel_class("nion.swift.MetadataPanel", "MetadataPanel"), "metadata-panel", _("Metadata"), ["left", "right"], "right", {"width": 320, "height": 8})
+        workspace_manager.register_panel(Workspace.import_panel_class("nion.swift.ActivityPanel", "ActivityPanel"), "activity-panel", _("Activity"), ["left", "right"], "right", {"min-width": 320, "height": 80})
         workspace_manager.register_filter_panel(FilterPanel.FilterPanel)
 
     def initialize(self, *, load_plug_ins: bool = True, use_root_dir: bool = True) -> None:
@@ -150,19 +155,35 @@ class Application(UIApplication.BaseApplication):
             app_data_file_path = self.ui.get_configuration_location() / pathlib.Path("nionswift_appdata.json")
             ApplicationData.set_file_path(app_data_file_path)
             logging.info("Application data: " + str(app_data_file_path))
+            # keep recently viewed data in memory, within a budget, so that viewing it again does not reload it.
+            try:
+                data_residency_budget_mb = int(self.ui.get_persistent_string("data_residency_budget_mb", "1024"))
+            except ValueError:
+                data_residency_budget_mb = 1024
+            DataResidency.set_budget(data_residency_budget_mb * 1024 * 1024)
+            start = time.perf_counter()
             PlugInManager.load_plug_ins(self.ui.get_document_location(), self.ui.get_data_location(), get_root_dir() if use_root_dir else None)
+            self.__record_startup_time("Load plug-ins", start)
+            self.__register_lazy_plug_in_contributions()
+            start = time.perf_counter()
             color_maps_dir = self.ui.get_configuration_location() / pathlib.Path("Color Maps")
             if color_maps_dir.exists():
                 logging.info("Loading color maps from " + str(color_maps_dir))
                 ColorMaps.load_color_maps(color_maps_dir)
             else:
                 logging.info("NOT Loading color maps from " + str(color_maps_dir) + " (missing)")
+            self.__record_startup_time("Load color maps", start)
         Registry.register_component(self, {"application"})
 
     def deinitialize(self) -> None:
         # shut down hardware source manager, unload plug-ins, and really exit ui
         NotificationDialog.close_notification_dialog()
         Registry.unregister_component(self, {"application"})
+        for io_handler in self.__lazy_io_handlers:
+            # placeholders unregister themselves when loaded.
+            if io_handler in ImportExportManager.ImportExportManager().get_readers():
+                ImportExportManager.ImportExportManager().unregister_io_handler(io_handler)
+        self.__lazy_io_handlers = list()
         if self.__profile:
             self.__profile.close()
             self.__profile = None
@@ -328,15 +349,18 @@ class Application(UIApplication.BaseApplication):
             project_reference = profile.get_project_reference(profile.work_project_reference_uuid) if profile.work_project_reference_uuid else None
 
         if project_reference:
+            start = time.perf_counter()
             try:
                 document_controller = self.open_project_window(project_reference, update_last_project_reference)
             except Exception:
                 self.show_ok_dialog(_("Error Opening Project"), _("Unable to open default project."), completion_fn=self.show_choose_project_dialog)
                 return True
+            self.__record_startup_time("Open project", start)
 
             if profile_dir is None:
                 # output log message unless we passed a profile_dir for testing.
                 logging.getLogger("loader").info("Welcome to Nion Swift.")
+                logging.getLogger("loader").info(self.startup_report)
 
             selected_display_panel = document_controller.selected_display_panel
             if selected_display_panel and is_created and len(document_controller.document_model.display_items) > 0:
@@ -550,6 +574,83 @@ class Application(UIApplication.BaseApplication):
     def document_controllers(self) -> typing.List[DocumentController.DocumentController]:
         return typing.cast(typing.List[DocumentController.DocumentController], self.windows)
 
+    def __record_startup_time(self, name: str, start: float) -> None:
+        self.__startup_times.append((name, time.perf_counter() - start))
+
+    @property
+    def startup_report(self) -> str:
+        """Return a report of the time taken by each startup step and plug-in."""
+        lines = ["Startup times:"]
+        lines.extend(f"  {name}: {duration * 1000:.0f} ms" for name, duration in self.__startup_times)
+        load_times = PlugInManager.get_load_times()
+        if load_times:
+            lines.append("Plug-in load times:")
+            lines.extend(f"  {module_name}: {duration * 1000:.0f} ms" for module_name, duration in sorted(load_times, key=operator.itemgetter(1), reverse=True))
+        deferred_module_names = [lazy_plug_in.module_name for lazy_plug_in in PlugInManager.get_lazy_plug_ins() if not lazy_plug_in.is_loaded]
+        if deferred_module_names:
+            lines.append("Plug-ins deferred until first use: " + ", ".join(deferred_module_names))
+        return "\n".join(lines)
+
+    def __register_lazy_plug_in_contributions(self) -> None:
+        # register placeholders for the contributions declared by plug-ins which are loaded on first use.
+        workspace_manager = Workspace.WorkspaceManager()
+        for lazy_plug_in in PlugInManager.get_lazy_plug_ins():
+            contributions = lazy_plug_in.contributions
+            try:
+                for panel in contributions.get("panels", list()):
+                    workspace_manager.register_lazy_panel(lazy_plug_in.load, panel["panel_id"], panel["panel_name"],
+                                                          panel.get("panel_positions", ["left", "right"]),
+                                                          panel.get("panel_position", "none"),
+                                                          panel.get("panel_properties"))
+                for menu_item in contributions.get("menu_items", list()):
+                    self.__register_lazy_menu_item(lazy_plug_in.load, menu_item)
+                for io_handler_d in contributions.get("io_handlers", list()):
+                    io_handler = ImportExportManager.LazyImportExportHandler(lazy_plug_in.load, io_handler_d["io_handler_id"],
+                                                                             io_handler_d["name"], io_handler_d["extensions"],
+                                                                             can_write=io_handler_d.get("can_write", True),
+                                                                             supports_composite_data=io_handler_d.get("supports_composite_data", False))
+                    ImportExportManager.ImportExportManager().register_io_handler(io_handler)
+                    self.__lazy_io_handlers.append(io_handler)
+                for computation in contributions.get("computations", list()):
+                    Symbolic.register_lazy_computation_type(computation["computation_type_id"], lazy_plug_in.load)
+            except Exception as e:
+                logging.info("Invalid manifest contributions for plug-in '" + lazy_plug_in.module_name + "'.")
+                logging.info(e)
+
+    def __register_lazy_menu_item(self, load_fn: typing.Callable[[], typing.Any], menu_item: typing.Mapping[str, typing.Any]) -> None:
+        # add a placeholder menu item to each window. when it is triggered, remove the placeholders, load the plug-in,
+        # which adds its own menu items to each window, and trigger the plug-in menu item with the same name.
+        menu_item_name = menu_item["menu_item_name"]
+        menu_id = menu_item.get("menu_id", "script_menu")
+        placeholder_actions: typing.List[typing.Tuple[UserInterface.Menu, UserInterface.MenuAction]] = list()
+
+        def execute(document_controller: DocumentController.DocumentController) -> None:
+            if build_menus in self.__menu_handlers:
+                self.unregister_menu_handler(build_menus)
+            for menu, action in placeholder_actions:
+                menu.remove_action(action)
+            placeholder_actions.clear()
+            load_fn()
+            menu = document_controller.get_menu(menu_id)
+            for action in menu.get_menu_actions() if menu else list():
+                if action.title == menu_item_name:
+                    action.trigger()
+                    break
+
+        def build_menus(document_controller: DocumentController.DocumentController) -> None:
+            menu: typing.Optional[UserInterface.Menu]
+            if menu_id == "script_menu":
+                menu = document_controller.get_or_create_menu(menu_id, _("Scripts"), "window_menu")
+            elif "menu_name" in menu_item and "menu_before_id" in menu_item:
+                menu = document_controller.get_or_create_menu(menu_id, menu_item["menu_name"], menu_item["menu_before_id"])
+            else:
+                menu = document_controller.get_menu(menu_id)
+            if menu:
+                action = menu.add_menu_item(menu_item_name, functools.partial(execute, document_controller), key_sequence=menu_item.get("menu_item_key_sequence"))
+                placeholder_actions.append((menu, action))
+
+        self.register_menu_handler(build_menus)
+
     def register_menu_handler(self, new_menu_handler: typing.Callable[[DocumentController.DocumentController], None]) -> typing.Callable[[DocumentController.DocumentController], None]:
         assert new_menu_handler not in self.__menu_handlers
         self.__menu_handlers.append(new_menu_handler)
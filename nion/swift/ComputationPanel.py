@@ -1104,6 +1104,12 @@ class RemoveComputationCommand(Undo.UndoableCommand):
         self.__undelete_logs = typing.cast(typing.Any, None)
         super().close()
 
+    def _get_spill_state(self) -> typing.Any:
+        return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
     def perform(self) -> None:
         document_model = self.__document_controller.document_model
         computation = document_model.computations[self.__computation_index]
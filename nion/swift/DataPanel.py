@@ -19,6 +19,7 @@ from nion.swift import Thumbnails
 from nion.swift.model import DataItem
 from nion.swift.model import DisplayItem
 from nion.swift.model import Persistence
+from nion.swift.model import Prefetch
 from nion.ui import CanvasItem
 from nion.ui import DrawingContext
 from nion.ui import GridCanvasItem
@@ -68,7 +69,11 @@ class DisplayItemAdapter:
             (property, read-only) status_str
             (property, read-only) project_str
             (method) drag_started(ui, x, y, modifiers), returns mime_data, thumbnail_data
+            (method) release_thumbnail()
             (event) needs_update_event
+
+        The drawing of each item is cached until the item or its thumbnail changes, so that repainting unchanged items
+        is cheap.
     """
 
     def __init__(self, display_item: DisplayItem.DisplayItem, ui: UserInterface.UserInterface):
@@ -77,7 +82,13 @@ class DisplayItemAdapter:
 
         self.__display_item = display_item
 
+        # painting may occur on a thread; the lock protects the thumbnail source and the drawing cache.
+        self.__lock = threading.RLock()
+        self.__drawing_cache: typing.Dict[str, typing.Tuple[Geometry.IntRect, DrawingContext.DrawingContext]] = dict()
+        self.__drawing_version = 0
+
         def display_item_changed() -> None:
+            self.__invalidate_drawing()
             self.needs_update_event.fire()
 
         self.__display_changed_event_listener = display_item.item_changed_event.listen(display_item_changed) if display_item else None
@@ -100,12 +111,7 @@ class DisplayItemAdapter:
 
     def close(self) -> None:
         # remove the listener.
-        if self.__thumbnail_updated_event_listener:
-            self.__thumbnail_updated_event_listener.close()
-            self.__thumbnail_updated_event_listener = None
-        if self.__thumbnail_source:
-            self.__thumbnail_source.remove_ref()
-            self.__thumbnail_source = None
+        self.release_thumbnail()
         if self.__display_changed_event_listener:
             self.__display_changed_event_listener.close()
             self.__display_changed_event_listener = None
@@ -162,20 +168,63 @@ class DisplayItemAdapter:
             return mime_data, thumbnail_data
         return None, None
 
+    @property
+    def has_thumbnail(self) -> bool:
+        return self.__thumbnail_source is not None
+
     def calculate_thumbnail_data(self) -> typing.Optional[_NDArray]:
         # grab the display specifier and if there is a display, handle thumbnail updating.
-        if self.__display_item and not self.__thumbnail_source:
-            self.__thumbnail_source = Thumbnails.ThumbnailManager().thumbnail_source_for_display_item(self.ui, self.__display_item).add_ref()
-
-            def thumbnail_updated() -> None:
-                self.needs_update_event.fire()
+        with self.__lock:
+            if self.__display_item and not self.__thumbnail_source:
+                self.__thumbnail_source = Thumbnails.ThumbnailManager().thumbnail_source_for_display_item(self.ui, self.__display_item).add_ref()
+
+                def thumbnail_updated() -> None:
+                    self.__invalidate_drawing()
+                    self.needs_update_event.fire()
+
+                assert self.__thumbnail_source  # type checker
+                self.__thumbnail_updated_event_listener = self.__thumbnail_source.thumbnail_updated_event.listen(thumbnail_updated)
+
+            return self.__thumbnail_source.thumbnail_data if self.__thumbnail_source else None
+
+    def release_thumbnail(self) -> None:
+        """Release the thumbnail source and the cached drawing. Both are recreated when the item is painted again."""
+        with self.__lock:
+            if self.__thumbnail_updated_event_listener:
+                self.__thumbnail_updated_event_listener.close()
+                self.__thumbnail_updated_event_listener = None
+            if self.__thumbnail_source:
+                self.__thumbnail_source.remove_ref()
+                self.__thumbnail_source = None
+            self.__invalidate_drawing()
+
+    def __invalidate_drawing(self) -> None:
+        with self.__lock:
+            self.__drawing_version += 1
+            self.__drawing_cache.clear()
+
+    def __get_drawing(self, kind: str, rect: Geometry.IntRect, draw_fn: typing.Callable[[DrawingContext.DrawingContext, Geometry.IntRect], None]) -> DrawingContext.DrawingContext:
+        # return the cached drawing for kind and rect or draw it. the drawing is only cached if nothing changed while
+        # drawing it, since the thumbnail may be updated on a thread.
+        with self.__lock:
+            cached_drawing = self.__drawing_cache.get(kind)
+            if cached_drawing and cached_drawing[0] == rect:
+                return cached_drawing[1]
+            drawing_version = self.__drawing_version
+        drawing_context = DrawingContext.DrawingContext()
+        draw_fn(drawing_context, rect)
+        with self.__lock:
+            if drawing_version == self.__drawing_version:
+                self.__drawing_cache[kind] = rect, drawing_context
+        return drawing_context
 
-            assert self.__thumbnail_source  # type checker
-            self.__thumbnail_updated_event_listener = self.__thumbnail_source.thumbnail_updated_event.listen(thumbnail_updated)
+    def draw_list_item(self, drawing_context: DrawingContext.DrawingContext, rect: Geometry.IntRect) -> None:
+        drawing_context.add(self.__get_drawing("list", rect, self.__draw_list_item))
 
-        return self.__thumbnail_source.thumbnail_data if self.__thumbnail_source else None
+    def draw_grid_item(self, drawing_context: DrawingContext.DrawingContext, rect: Geometry.IntRect) -> None:
+        drawing_context.add(self.__get_drawing("grid", rect, self.__draw_grid_item))
 
-    def draw_list_item(self, drawing_context: DrawingContext.DrawingContext, rect: Geometry.IntRect) -> None:
+    def __draw_list_item(self, drawing_context: DrawingContext.DrawingContext, rect: Geometry.IntRect) -> None:
         with drawing_context.saver():
             draw_rect = Geometry.IntRect(origin=rect.top_left + Geometry.IntPoint(y=4, x=4), size=Geometry.IntSize(h=72, w=72))
             drawing_context.add(self.__create_thumbnail(draw_rect))
@@ -190,7 +239,7 @@ class DisplayItemAdapter:
                 drawing_context.fill_style = "#888"
                 drawing_context.fill_text(self.project_str, rect.left + 4 + 72 + 4, rect.top + 4 + 12 + 15 + 15 + 15)
 
-    def draw_grid_item(self, drawing_context: DrawingContext.DrawingContext, rect: Geometry.IntRect) -> None:
+    def __draw_grid_item(self, drawing_context: DrawingContext.DrawingContext, rect: Geometry.IntRect) -> None:
         drawing_context.add(self.__create_thumbnail(rect.inset(6)))
 
 
@@ -225,6 +274,14 @@ class ItemExplorerController:
         # moved to the main thread via this object.
         self.__changed_display_item_adapters = False
         self.__changed_display_item_adapters_mutex = threading.RLock()
+        # track the display item adapters painted in the most recent repaint and those holding thumbnails so that
+        # thumbnails far from the visible items can be released. painting may occur on a thread.
+        self.__painted_lock = threading.RLock()
+        self.__painting_display_item_adapters: typing.List[DisplayItemAdapter] = list()
+        self.__painted_display_item_adapters: typing.List[DisplayItemAdapter] = list()
+        self.__thumbnail_display_item_adapters: typing.Set[DisplayItemAdapter] = set()
+        self.__display_item_adapter_indexes: typing.Optional[typing.Dict[DisplayItemAdapter, int]] = None
+        self.thumbnail_margin = 40
         self.__list_canvas_item = canvas_item
 
         def focus_changed(focused: bool) -> None:
@@ -289,6 +346,14 @@ class ItemExplorerController:
         self.__display_item_adapter_end_changes_event_listener = typing.cast(typing.Any, None)
         self.__display_item_adapters = typing.cast(typing.Any, None)
         self.__display_item_adapters_model = typing.cast(typing.Any, None)
+        self.__display_item_adapter_indexes = None
+        with self.__painted_lock:
+            thumbnail_display_item_adapters = list(self.__thumbnail_display_item_adapters)
+            self.__painting_display_item_adapters = list()
+            self.__painted_display_item_adapters = list()
+            self.__thumbnail_display_item_adapters = set()
+        for display_item_adapter in thumbnail_display_item_adapters:
+            display_item_adapter.release_thumbnail()
         self.on_context_menu_event = None
         self.on_drag_started = None
         self.on_focus_changed = None
@@ -372,6 +437,49 @@ class ItemExplorerController:
     def _test_get_display_item_adapter(self, index: int) -> DisplayItemAdapter:
         return self.__display_item_adapters[index]
 
+    # these messages come from the canvas item when repainting, possibly on a thread.
+    def _begin_repaint(self) -> None:
+        with self.__painted_lock:
+            self.__painting_display_item_adapters = list()
+
+    def _display_item_adapter_painted(self, display_item_adapter: DisplayItemAdapter) -> None:
+        with self.__painted_lock:
+            self.__painting_display_item_adapters.append(display_item_adapter)
+            self.__thumbnail_display_item_adapters.add(display_item_adapter)
+
+    def _end_repaint(self) -> None:
+        with self.__painted_lock:
+            self.__painted_display_item_adapters = self.__painting_display_item_adapters
+            self.__painting_display_item_adapters = list()
+        if not self.__closed:
+            self.__event_loop.call_soon_threadsafe(self.__release_offscreen_thumbnails)
+
+    def __release_offscreen_thumbnails(self) -> None:
+        # release the thumbnails of items more than thumbnail_margin (or the number of visible items, if greater) items
+        # away from the items painted most recently. only the items holding thumbnails are examined.
+        if self.__closed:
+            return
+        if self.__display_item_adapter_indexes is None:
+            self.__display_item_adapter_indexes = {display_item_adapter: index for index, display_item_adapter in enumerate(self.__display_item_adapters)}
+        display_item_adapter_indexes = self.__display_item_adapter_indexes
+        with self.__painted_lock:
+            painted_indexes = [display_item_adapter_indexes[display_item_adapter] for display_item_adapter in self.__painted_display_item_adapters if display_item_adapter in display_item_adapter_indexes]
+            thumbnail_display_item_adapters = list(self.__thumbnail_display_item_adapters)
+        if not painted_indexes:
+            return
+        margin = max(self.thumbnail_margin, len(painted_indexes))
+        first_index = min(painted_indexes) - margin
+        last_index = max(painted_indexes) + margin
+        released_display_item_adapters = list()
+        for display_item_adapter in thumbnail_display_item_adapters:
+            index = display_item_adapter_indexes.get(display_item_adapter)
+            if index is None or not (first_index <= index <= last_index):
+                if index is not None:
+                    display_item_adapter.release_thumbnail()
+                released_display_item_adapters.append(display_item_adapter)
+        with self.__painted_lock:
+            self.__thumbnail_display_item_adapters.difference_update(released_display_item_adapters)
+
     def __display_item_adapter_needs_update(self) -> None:
         with self.__changed_display_item_adapters_mutex:
             self.__changed_display_item_adapters = True
@@ -391,6 +499,7 @@ class ItemExplorerController:
     # not thread safe
     def __display_item_adapter_inserted(self, key: str, display_item_adapter: DisplayItemAdapter, before_index: int) -> None:
         if key == "display_item_adapters":
+            self.__display_item_adapter_indexes = None
             self.__display_item_adapters.insert(before_index, display_item_adapter)
             self.__display_item_adapter_needs_update_listeners.insert(before_index, display_item_adapter.needs_update_event.listen(self.__display_item_adapter_needs_update))
 
@@ -398,6 +507,9 @@ class ItemExplorerController:
     # not thread safe
     def __display_item_adapter_removed(self, key: str, display_item_adapter: DisplayItemAdapter, index: int) -> None:
         if key == "display_item_adapters":
+            self.__display_item_adapter_indexes = None
+            with self.__painted_lock:
+                self.__thumbnail_display_item_adapters.discard(display_item_adapter)
             self.__display_item_adapter_needs_update_listeners[index].close()
             del self.__display_item_adapter_needs_update_listeners[index]
             del self.__display_item_adapters[index]
@@ -428,6 +540,7 @@ class ListCanvasItemDelegate(ListCanvasItem.ListCanvasItemDelegate):
         raise NotImplementedError()
 
     def paint_item(self, drawing_context: DrawingContext.DrawingContext, display_item_adapter: DisplayItemAdapter, rect: Geometry.IntRect, is_selected: bool) -> None:
+        self.__data_list_controller._display_item_adapter_painted(display_item_adapter)
         display_item_adapter.draw_list_item(drawing_context, rect)
 
     def context_menu_event(self, index: typing.Optional[int], x: int, y: int, gx: int, gy: int) -> bool:
@@ -460,6 +573,7 @@ class GridCanvasItemDelegate(GridCanvasItem.GridCanvasItemDelegate):
         raise NotImplementedError()
 
     def paint_item(self, drawing_context: DrawingContext.DrawingContext, display_item_adapter: DisplayItemAdapter, rect: Geometry.IntRect, is_selected: bool) -> None:
+        self.__data_grid_controller._display_item_adapter_painted(display_item_adapter)
         display_item_adapter.draw_grid_item(drawing_context, rect)
 
     def context_menu_event(self, index: typing.Optional[int], x: int, y: int, gx: int, gy: int) -> bool:
@@ -478,10 +592,37 @@ class GridCanvasItemDelegate(GridCanvasItem.GridCanvasItemDelegate):
         self.__data_grid_controller.drag_started(index, x, y, modifiers)
 
 
+class DataListCanvasItem(ListCanvasItem.ListCanvasItem):
+    """A list canvas item which tells the controller which items are painted in each repaint."""
+
+    def __init__(self, data_list_controller: DataListController, selection: Selection.IndexedSelection) -> None:
+        super().__init__(ListCanvasItemDelegate(data_list_controller), selection)
+        self.__data_list_controller = data_list_controller
+
+    def _repaint_visible(self, drawing_context: DrawingContext.DrawingContext, visible_rect: Geometry.IntRect) -> None:
+        self.__data_list_controller._begin_repaint()
+        super()._repaint_visible(drawing_context, visible_rect)
+        self.__data_list_controller._end_repaint()
+
+
+class DataGridCanvasItem(GridCanvasItem.GridCanvasItem):
+    """A grid canvas item which tells the controller which items are painted in each repaint."""
+
+    def __init__(self, data_grid_controller: DataGridController, selection: Selection.IndexedSelection,
+                 direction: GridCanvasItem.Direction, wrap: bool) -> None:
+        super().__init__(GridCanvasItemDelegate(data_grid_controller), selection, direction, wrap)
+        self.__data_grid_controller = data_grid_controller
+
+    def _repaint_visible(self, drawing_context: DrawingContext.DrawingContext, visible_rect: Geometry.IntRect) -> None:
+        self.__data_grid_controller._begin_repaint()
+        super()._repaint_visible(drawing_context, visible_rect)
+        self.__data_grid_controller._end_repaint()
+
+
 class DataListController(ItemExplorerController):
     def __init__(self, event_loop: asyncio.AbstractEventLoop, ui: UserInterface.UserInterface,
                  display_item_adapters_model: ListModel.MappedListModel, selection: Selection.IndexedSelection) -> None:
-        canvas_item = ListCanvasItem.ListCanvasItem(ListCanvasItemDelegate(self), selection)
+        canvas_item = DataListCanvasItem(self, selection)
         super().__init__(event_loop, ui, canvas_item, display_item_adapters_model, selection, GridCanvasItem.Direction.Row, True)
 
 
@@ -489,7 +630,7 @@ class DataGridController(ItemExplorerController):
     def __init__(self, event_loop: asyncio.AbstractEventLoop, ui: UserInterface.UserInterface,
                  display_item_adapters_model: ListModel.MappedListModel, selection: Selection.IndexedSelection,
                  direction: GridCanvasItem.Direction = GridCanvasItem.Direction.Row, wrap: bool = True) -> None:
-        canvas_item = GridCanvasItem.GridCanvasItem(GridCanvasItemDelegate(self), selection, direction, wrap)
+        canvas_item = DataGridCanvasItem(self, selection, direction, wrap)
         super().__init__(event_loop, ui, canvas_item, display_item_adapters_model, selection, direction, wrap)
 
 
@@ -544,9 +685,13 @@ class DataPanel(Panel.Panel):
 
         self.__focused = False
 
+        # prefetch the items around the selected item so that stepping through the items is fast.
+        self.__prefetcher = Prefetch.DisplayItemPrefetcher()
+
         def selection_changed() -> None:
             # called when the selection changes; notify selected display item changed if focused.
             self.__notify_focus_changed()
+            self.__prefetch_neighbors()
 
         self.__selection_changed_event_listener = self.__selection.changed_event.listen(selection_changed)
 
@@ -629,6 +774,9 @@ class DataPanel(Panel.Panel):
         self.data_list_controller = typing.cast(DataListController, None)
         self.data_grid_controller.close()
         self.data_grid_controller = typing.cast(DataGridController, None)
+        # the adapters are not unmapped when the model closes; release any thumbnails acquired while drawing.
+        for display_item_adapter in self.__filtered_display_item_adapters_model.display_item_adapters:
+            display_item_adapter.release_thumbnail()
         self.__filtered_display_item_adapters_model.close()
         self.__filtered_display_item_adapters_model = typing.cast(ListModel.MappedListModel, None)
         # button group
@@ -636,6 +784,16 @@ class DataPanel(Panel.Panel):
         self.__view_button_group = typing.cast(CanvasItem.RadioButtonGroup, None)
         self.__selection_changed_event_listener.close()
         self.__selection_changed_event_listener = typing.cast(Event.EventListener, None)
+        self.__prefetcher.close()
+        self.__prefetcher = typing.cast(typing.Any, None)
+
+    def __prefetch_neighbors(self) -> None:
+        # prefetch the neighbors of a single selected item in the order displayed; stop prefetching otherwise.
+        index = self.__selection.current_index
+        if index is not None:
+            self.__prefetcher.prefetch(self.document_controller.filtered_display_items_model.items, index)
+        else:
+            self.__prefetcher.cancel()
 
     def __notify_focus_changed(self) -> None:
         # this is called when the keyboard focus for the data panel is changed.
@@ -974,6 +974,12 @@ class InsertGraphicsCommand(Undo.UndoableCommand):
         self.__display_item_proxy = typing.cast(typing.Any, None)
         super().close()
 
+    def _get_spill_state(self) -> typing.Any:
+        return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
     def perform(self) -> None:
         display_item = self.__display_item_proxy.item
         if display_item:
@@ -1202,6 +1208,12 @@ class MoveDisplayLayerCommand(Undo.UndoableCommand):
         self.__undelete_logs = typing.cast(typing.Any, None)
         super().close()
 
+    def _get_spill_state(self) -> typing.Any:
+        return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
     def perform(self) -> None:
         # add display data channel and display layer to new display item
         # handle the following cases:
@@ -1354,6 +1366,12 @@ class RemoveDisplayLayerCommand(Undo.UndoableCommand):
         self.__undelete_logs = typing.cast(typing.Any, None)
         super().close()
 
+    def _get_spill_state(self) -> typing.Any:
+        return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
     def perform(self) -> None:
         # add display data channel and display layer to new display item
         display_item = self.__display_item_proxy.item
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 # standard libraries
+import concurrent.futures
 import copy
+import datetime
 import functools
 import gettext
 import itertools
@@ -48,6 +50,7 @@ from nion.swift.model import Processing
 from nion.swift.model import Profile
 from nion.swift.model import Project
 from nion.swift.model import Symbolic
+from nion.swift.model import Tracing
 from nion.swift.model import Utility
 from nion.swift.model import WorkspaceLayout
 from nion.ui import CanvasItem
@@ -813,6 +816,17 @@ class DocumentController(Window.Window):
             with Utility.AtomicFileWriter(pathlib.Path(path)) as fp:
                 fp.write(svg)
 
+    def export_performance_trace(self) -> None:
+        filter = "Trace File (*.json);;All Files (*.*)"
+        export_dir = self.ui.get_persistent_string("export_directory", self.ui.get_document_location())
+        export_dir = os.path.join(export_dir, "nionswift-trace-" + datetime.datetime.now().strftime("%Y%m%d-%H%M%S"))
+        path, selected_filter, selected_directory = self.get_save_file_path(_("Export Performance Trace"), export_dir, filter, None)
+        if path and not os.path.splitext(path)[1]:
+            path = path + os.path.extsep + "json"
+        if path:
+            self.ui.set_persistent_string("export_directory", selected_directory)
+            Tracing.export_chrome_trace(pathlib.Path(path))
+
     # this method creates a task. it is thread safe.
     def create_task_context_manager(self, title: str, task_type: str, logging: bool = True) -> Task.TaskContextManager:
         task = Task.Task(title, task_type)  # NOTE: currently, tasks don't get deleted since they are displayed until exit.
@@ -1008,6 +1022,12 @@ class DocumentController(Window.Window):
             self.__data_group_proxy = typing.cast(typing.Any, None)
             super().close()
 
+        def _get_spill_state(self) -> typing.Any:
+            return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+        def _set_spill_state(self, spill_state: typing.Any) -> None:
+            Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
         def _get_modified_state(self) -> typing.Any:
             data_group = self.__data_group_proxy.item
             assert data_group
@@ -1024,12 +1044,14 @@ class DocumentController(Window.Window):
             assert data_group
             index = self.__display_item_index
             display_items: typing.List[DisplayItem.DisplayItem] = list()
-            for data_item in self.__data_items:
-                document_model.append_data_item(data_item)
-                self.__display_item_indexes.append(len(document_model.display_items))
-                maybe_display_item = document_model.get_display_item_for_data_item(data_item)
-                if maybe_display_item:
-                    display_items.append(maybe_display_item)
+            # insert the whole batch within one transaction so the project file is written once.
+            with document_model.transaction_context():
+                for data_item in self.__data_items:
+                    document_model.append_data_item(data_item)
+                    self.__display_item_indexes.append(len(document_model.display_items))
+                    maybe_display_item = document_model.get_display_item_for_data_item(data_item)
+                    if maybe_display_item:
+                        display_items.append(maybe_display_item)
             for display_item in display_items:
                 if not display_item in data_group.display_items:
                     data_group.insert_display_item(index, display_item)
@@ -1490,6 +1512,12 @@ class DocumentController(Window.Window):
             self.__undelete_logs = typing.cast(typing.Any, None)
             super().close()
 
+        def _get_spill_state(self) -> typing.Any:
+            return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+        def _set_spill_state(self, spill_state: typing.Any) -> None:
+            Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
         def perform(self) -> None:
             display_item = self.__display_item_proxy.item
             if display_item:
@@ -1555,6 +1583,12 @@ class DocumentController(Window.Window):
             self.__undelete_logs = typing.cast(typing.Any, None)
             super().close()
 
+        def _get_spill_state(self) -> typing.Any:
+            return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+        def _set_spill_state(self, spill_state: typing.Any) -> None:
+            Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
         def perform(self) -> None:
             document_model = self.__document_controller.document_model
             display_items = [document_model.display_items[index] for index in self.__display_item_indexes]
@@ -1615,6 +1649,12 @@ class DocumentController(Window.Window):
             self.__undelete_logs = typing.cast(typing.Any, None)
             super().close()
 
+        def _get_spill_state(self) -> typing.Any:
+            return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+        def _set_spill_state(self, spill_state: typing.Any) -> None:
+            Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
         def perform(self) -> None:
             document_model = self.__document_controller.document_model
             data_items = [document_model.data_items[index] for index in self.__data_item_indexes]
@@ -1886,6 +1926,12 @@ class DocumentController(Window.Window):
                 self.__data_item_proxy = None
             super().close()
 
+        def _get_spill_state(self) -> typing.Any:
+            return Undo.get_undelete_logs_spill_state([self.__undelete_log])
+
+        def _set_spill_state(self, spill_state: typing.Any) -> None:
+            Undo.set_undelete_logs_spill_state([self.__undelete_log], spill_state)
+
         def perform(self) -> None:
             data_item = self.__data_item_fn()
             self.__data_item_proxy = data_item.create_proxy() if data_item else None
@@ -1973,6 +2019,12 @@ class DocumentController(Window.Window):
                 self.__undelete_log = None
             super().close()
 
+        def _get_spill_state(self) -> typing.Any:
+            return Undo.get_undelete_logs_spill_state([self.__undelete_log])
+
+        def _set_spill_state(self, spill_state: typing.Any) -> None:
+            Undo.set_undelete_logs_spill_state([self.__undelete_log], spill_state)
+
         def perform(self) -> None:
             # regarding focus, see https://github.com/nion-software/nionswift/issues/145
             document_controller = self.__document_controller
@@ -2047,6 +2099,12 @@ class DocumentController(Window.Window):
             self.__undelete_logs = typing.cast(typing.Any, None)
             super().close()
 
+        def _get_spill_state(self) -> typing.Any:
+            return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+        def _set_spill_state(self, spill_state: typing.Any) -> None:
+            Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
         def perform(self) -> None:
             document_model = self.__document_controller.document_model
             display_item = document_model.display_items[self.__display_item_index]
@@ -2265,14 +2323,22 @@ class DocumentController(Window.Window):
             self.__undelete_logs = typing.cast(typing.Any, None)
             super().close()
 
+        def _get_spill_state(self) -> typing.Any:
+            return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+        def _set_spill_state(self, spill_state: typing.Any) -> None:
+            Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
         def perform(self) -> None:
             document_model = self.__document_controller.document_model
             index = self.__data_item_index
-            for data_item in self.__data_items:
-                # insert will throw an exception if data item already exists in the project
-                document_model.insert_data_item(index, data_item, auto_display=True)
-                self.__data_item_indexes.append(index)
-                index += 1
+            # insert the whole batch within one transaction so the project file is written once.
+            with document_model.transaction_context():
+                for data_item in self.__data_items:
+                    # insert will throw an exception if data item already exists in the project
+                    document_model.insert_data_item(index, data_item, auto_display=True)
+                    self.__data_item_indexes.append(index)
+                    index += 1
             if self.__display_panel and self.__data_items:
                 display_item = self.__document_controller.document_model.get_display_item_for_data_item(self.__data_items[-1])
                 if display_item:
@@ -2341,6 +2407,9 @@ class DocumentController(Window.Window):
                         project: typing.Optional[Project.Project] = None) -> typing.Optional[typing.Sequence[DataItem.DataItem]]:
         assert index is not None
 
+        # data items are inserted into the document model project; only prepare their storage when that is the target.
+        project_storage_system = self.document_model._project.project_storage_system if project in (None, self.document_model._project) else None
+
         # this function will be called on a thread to receive files in the background.
         def receive_files_on_thread(file_paths: typing.Sequence[pathlib.Path],
                                     data_group: typing.Optional[DataGroup.DataGroup], index: int,
@@ -2352,20 +2421,46 @@ class DocumentController(Window.Window):
                 task.update_progress(_("Starting import."), (0, len(file_paths)))
                 task_data: typing.Dict[str, typing.Any] = {"headers": ["Number", "File"]}
 
-                for file_index, file_path in enumerate(file_paths):
-                    data: typing.List[typing.List[str]] = task_data.setdefault("data", list())
-                    file_name = file_path.name
-                    task_data_entry = [str(file_index + 1), file_name]
-                    data.append(task_data_entry)
-                    task.update_progress(_("Importing item {}.").format(file_index + 1), (file_index + 1, len(file_paths)), task_data)
+                import_export_manager = ImportExportManager.ImportExportManager()
+
+                def read_data_items(file_path: pathlib.Path) -> typing.Sequence[DataItem.DataItem]:
                     try:
-                        data_items = ImportExportManager.ImportExportManager().read_data_items(file_path)
-                        if data_items:
-                            received_data_items.extend(data_items)
+                        data_items = import_export_manager.read_data_items(file_path) or list()
                     except Exception as e:
                         logging.debug(f"Could not read image {file_path} / {e}")
                         traceback.print_exc()
                         traceback.print_stack()
+                        return list()
+                    # write the storage of the data items here so that inserting them does not write the data. lazy data
+                    # is written after the data items are inserted instead.
+                    if project_storage_system:
+                        for data_item in data_items:
+                            if data_item.has_lazy_data:
+                                continue
+                            try:
+                                project_storage_system.prepare_data_item_storage(data_item)
+                            except Exception as e:
+                                # inserting the data item writes the data instead.
+                                logging.debug(f"Could not prepare storage for {file_path} / {e}")
+                                traceback.print_exc()
+                    return data_items
+
+                # decode the files and write their storage on a pool of threads; files are independent and decoding
+                # and writing is mostly i/o and decompression which release the gil. keep the results in the original
+                # file order.
+                file_data_items: typing.List[typing.Sequence[DataItem.DataItem]] = [list() for file_path in file_paths]
+                max_workers = min(len(file_paths), os.cpu_count() or 1) or 1
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import") as executor:
+                    futures = {executor.submit(read_data_items, file_path): file_index for file_index, file_path in enumerate(file_paths)}
+                    for completed_count, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                        file_index = futures[future]
+                        file_data_items[file_index] = future.result()
+                        data: typing.List[typing.List[str]] = task_data.setdefault("data", list())
+                        data.append([str(file_index + 1), file_paths[file_index].name])
+                        task.update_progress(_("Importing item {}.").format(completed_count), (completed_count, len(file_paths)), task_data)
+
+                for data_items in file_data_items:
+                    received_data_items.extend(data_items)
 
                 task.update_progress(_("Finishing importing."), (len(file_paths), len(file_paths)))
 
@@ -2376,15 +2471,23 @@ class DocumentController(Window.Window):
 
         def receive_files_complete(index: int, data_items: typing.Sequence[DataItem.DataItem]) -> None:
             command: Undo.UndoableCommand
-            if data_group and isinstance(data_group, DataGroup.DataGroup):
-                command = DocumentController.InsertDataGroupDataItemsCommand(self, data_group, data_items, index)
-                command.perform()
-                self.push_undo_command(command)
-            else:
-                index = index if index >= 0 else len(self.document_model.data_items)
-                command = DocumentController.InsertDataItemsCommand(self, data_items, index, display_panel, project=project)
-                command.perform()
-                self.push_undo_command(command)
+            try:
+                if data_group and isinstance(data_group, DataGroup.DataGroup):
+                    command = DocumentController.InsertDataGroupDataItemsCommand(self, data_group, data_items, index)
+                    command.perform()
+                    self.push_undo_command(command)
+                else:
+                    index = index if index >= 0 else len(self.document_model.data_items)
+                    command = DocumentController.InsertDataItemsCommand(self, data_items, index, display_panel, project=project)
+                    command.perform()
+                    self.push_undo_command(command)
+            finally:
+                # remove storage prepared for data items which were not inserted.
+                if project_storage_system:
+                    for data_item in data_items:
+                        project_storage_system.discard_data_item_storage(data_item)
+            # read lazy data from the files and write it to storage in the background.
+            self.document_model.write_lazy_data(data_items)
             if callable(completion_fn):
                 completion_fn(data_items)
 
@@ -2785,16 +2888,46 @@ class ToggleFilterAction(Window.Action):
         return Window.ActionResult(Window.ActionStatus.FINISHED)
 
 
+class TogglePerformanceTraceAction(Window.Action):
+    action_id = "window.toggle_performance_trace"
+    action_name = _("Record Performance Trace")
+
+    def execute(self, context: Window.ActionContext) -> Window.ActionResult:
+        if Tracing.is_enabled():
+            Tracing.disable()
+        else:
+            Tracing.enable()
+        return Window.ActionResult(Window.ActionStatus.FINISHED)
+
+    def is_checked(self, context: Window.ActionContext) -> bool:
+        return Tracing.is_enabled()
+
+
+class ExportPerformanceTraceAction(Window.Action):
+    action_id = "window.export_performance_trace"
+    action_name = _("Export Performance Trace...")
+
+    def execute(self, context: Window.ActionContext) -> Window.ActionResult:
+        raise NotImplementedError()
+
+    def invoke(self, context: Window.ActionContext) -> Window.ActionResult:
+        window = typing.cast(DocumentController, context.window)
+        window.export_performance_trace()
+        return Window.ActionResult(Window.ActionStatus.FINISHED)
+
+
 Window.register_action(DataItemRecorderAction())
 Window.register_action(EditComputationAction())
 Window.register_action(EditDataItemScriptAction())
 Window.register_action(EditDisplayScriptAction())
+Window.register_action(ExportPerformanceTraceAction())
 Window.register_action(GenerateDataAction())
 Window.register_action(OpenConsoleAction())
 Window.register_action(OpenNotificationsAction())
 Window.register_action(OpenProjectDialogAction())
 Window.register_action(OpenRunScriptsAction())
 Window.register_action(ToggleFilterAction())
+Window.register_action(TogglePerformanceTraceAction())
 
 
 class SetToolModeAction(Window.Action):
@@ -16,6 +16,7 @@ import unicodedata
 # None
 
 # local libraries
+from nion.swift.model import Activity
 from nion.swift.model import ImportExportManager
 from nion.ui import Dialog
 from nion.ui import UserInterface
@@ -31,6 +32,9 @@ class ExportDialog(Dialog.OkCancelDialog):
     def __init__(self, ui: UserInterface.UserInterface, parent_window: Window.Window):
         super().__init__(ui, ok_title=_("Export"), parent_window=parent_window)
 
+        # the export continues after the dialog closes, so it runs on the event loop of the parent window.
+        self.__event_loop = parent_window.event_loop
+
         io_handler_id = self.ui.get_persistent_string("export_io_handler_id", "png-io-handler")
 
         self.directory = self.ui.get_persistent_string("export_directory", self.ui.get_document_location())
@@ -160,6 +164,7 @@ class ExportDialog(Dialog.OkCancelDialog):
         directory = self.directory
         writer = self.writer
         if directory and writer:
+            display_items_and_paths = list()
             for index, display_item in enumerate(display_items):
                 data_item = display_item.data_item
                 if data_item:
@@ -182,8 +187,44 @@ class ExportDialog(Dialog.OkCancelDialog):
                         filename = "_".join(components)
                         extension = writer.extensions[0]
                         path = os.path.join(directory, "{0}.{1}".format(filename, extension))
-                        ImportExportManager.ImportExportManager().write_display_item_with_writer(writer, display_item, pathlib.Path(path))
+                        display_items_and_paths.append((display_item, pathlib.Path(path)))
                     except Exception as e:
                         logging.debug("Could not export image %s / %s", str(data_item), str(e))
                         traceback.print_exc()
                         traceback.print_stack()
+            export_job = ImportExportManager.ExportJob(writer, display_items_and_paths)
+            ExportActivity(export_job)
+            export_job.start(self.__event_loop)
+
+
+class ExportActivity(Activity.Activity):
+    """An activity reporting the progress of an export job; finishes itself when the job finishes.
+
+    The job fires its events on the event loop it was started with, so the activity is updated on the UI thread.
+    """
+
+    def __init__(self, export_job: ImportExportManager.ExportJob) -> None:
+        super().__init__("export", _("Export"))
+        self.__export_job = export_job
+        self.__progress_changed_listener = export_job.progress_changed_event.listen(self.__progress_changed)
+        self.__finished_listener = export_job.finished_event.listen(self.__finished)
+        Activity.append_activity(self)
+
+    @property
+    def displayed_title(self) -> str:
+        return self.title + f" ({self.__export_job.completed_count}/{self.__export_job.count})"
+
+    @property
+    def can_cancel(self) -> bool:
+        return True
+
+    def cancel(self) -> None:
+        self.__export_job.cancel()
+
+    def __progress_changed(self, completed_count: int, count: int) -> None:
+        self.notify_property_changed("displayed_title")
+
+    def __finished(self) -> None:
+        self.__progress_changed_listener.close()
+        self.__finished_listener.close()
+        Activity.activity_finished(self)
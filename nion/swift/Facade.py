@@ -201,14 +201,13 @@ class ObjectSpecifier:
             if data_group:
                 return DataGroup(data_group)
         elif object_type in ("region", "graphic"):
-            for display_item in document_model.display_items:
-                for graphic in display_item.graphics:
-                    if graphic.uuid == object_uuid:
-                        return Graphic(graphic)
+            graphic = document_model.get_graphic_by_uuid(object_uuid) if object_uuid else None
+            if graphic:
+                return Graphic(graphic)
         elif object_type == "display_item":
-            for display_item in document_model.display_items:
-                if display_item.uuid == object_uuid:
-                    return Display(display_item)
+            display_item = document_model.get_display_item_by_uuid(object_uuid) if object_uuid else None
+            if display_item:
+                return Display(display_item)
         elif object_type == "hardware_source" and object_id is not None:
             hardware_source = hardware_source_manager().get_hardware_source_for_hardware_source_id(object_id)
             if hardware_source:
@@ -770,7 +769,11 @@ class Graphic(metaclass=SharedInstance):
 
         Scriptable: Yes
         """
-        mask = self._graphic.get_mask(shape)
+        mask = self._graphic.get_cached_mask(shape)
+        # the cached mask is shared until the graphic changes. computation expressions only read it; other callers get
+        # a copy they may modify.
+        if not Symbolic.is_executing_expression():
+            mask = numpy.copy(mask)
         return DataAndMetadata.DataAndMetadata.from_data(mask)
 
     # position, start, end, vector, center, size, bounds, angle
@@ -2626,11 +2629,8 @@ class Library(metaclass=SharedInstance):
         Status: Provisional
         Scriptable: Yes
         """
-        data_items = list()
-        for data_item in self._document_model.data_items:
-            if data_item.uuid == data_item_uuid:
-                data_items.append(data_item)
-        return DataItem(data_items[0]) if len(data_items) == 1 else None
+        data_item = self._document_model.get_data_item_by_uuid(data_item_uuid)
+        return DataItem(data_item) if data_item else None
 
     def get_graphic_by_uuid(self, graphic_uuid: uuid_module.UUID) -> typing.Optional[Graphic]:
         """Get the graphic with the given UUID.
@@ -2642,12 +2642,8 @@ class Library(metaclass=SharedInstance):
         Status: Provisional
         Scriptable: Yes
         """
-        graphics = list()
-        for display_item in self._document_model.display_items:
-            for graphic in display_item.graphics:
-                if graphic.uuid == graphic_uuid:
-                    graphics.append(graphic)
-        return Graphic(graphics[0]) if len(graphics) == 1 else None
+        graphic = self._document_model.get_graphic_by_uuid(graphic_uuid)
+        return Graphic(graphic) if graphic else None
 
     def get_item_by_specifier(self, item_specifier: Persistence.PersistentObjectSpecifier) -> typing.Any:
         """Get the library item with the given item specifier.
@@ -53,6 +53,9 @@ class FilterController:
 
         The item model controller represents the years, months, and days available within the list of
         data items.
+
+        Inserted and removed display items are queued and applied to the date tree in a batch, grouped by day, when
+        the nodes are next updated. Only the nodes whose counts changed are updated in the item model controller.
     """
 
     def __init__(self, document_controller: DocumentController.DocumentController) -> None:
@@ -68,6 +71,11 @@ class FilterController:
         self.__display_item_tree.child_removed = self.__remove_child
         self.__display_item_tree.tree_node_updated = self.__update_tree_node
 
+        self.__text_index = TextFilterIndex()
+
+        self.__pending_inserted_display_items: typing.Dict[_ValueType, typing.Tuple[int, int, int]] = dict()
+        self.__pending_removed_display_items: typing.List[_ValueType] = list()
+
         # thread safe.
         def display_item_inserted(key: str, display_item: _ValueType, before_index: int) -> None:
             """
@@ -80,7 +88,8 @@ class FilterController:
             with self.__display_item_tree_mutex:
                 created_local = display_item.created_local
                 indexes = created_local.year, created_local.month, created_local.day
-                self.__display_item_tree.insert_value(indexes, display_item)
+                self.__pending_inserted_display_items[display_item] = indexes
+            self.__text_index.insert(display_item)
 
         # thread safe.
         def display_item_removed(key: str, display_item: _ValueType, index: int) -> None:
@@ -92,9 +101,10 @@ class FilterController:
             """
             assert threading.current_thread() == threading.main_thread()
             with self.__display_item_tree_mutex:
-                created = display_item.created_local
-                indexes = created.year, created.month, created.day
-                self.__display_item_tree.remove_value(indexes, display_item)
+                # the display item is only in the tree if it is not waiting to be inserted.
+                if self.__pending_inserted_display_items.pop(display_item, None) is None:
+                    self.__pending_removed_display_items.append(display_item)
+            self.__text_index.remove(display_item)
 
         # connect the display_items_model from the document controller to self.
         # when data items are inserted or removed from the document controller, the inserter and remover methods
@@ -106,14 +116,16 @@ class FilterController:
 
         self.__mapping = dict()
         self.__mapping[id(self.__display_item_tree)] = self.item_model_controller.root
-        self.__node_counts_dirty = False
+        self.__dirty_tree_nodes: typing.Dict[int, TreeNode] = dict()
 
         self.__date_filter: typing.Optional[ListModel.Filter] = None
-        self.__text_filter: typing.Optional[ListModel.Filter] = None
+        self.__text_filter: typing.Optional[IndexedTextFilter] = None
 
         for index, display_item in enumerate(self.__display_items_model.display_items):
             display_item_inserted("display_items", display_item, index)
 
+        self.update_all_nodes()
+
     def close(self) -> None:
         # Close the data model controller. Un-listen to the data item list model and close the item model controller.
         self.__display_item_inserted_listener.close()
@@ -124,6 +136,10 @@ class FilterController:
         self.__periodic_listener = typing.cast(typing.Any, None)
         self.item_model_controller.close()
         self.item_model_controller = typing.cast(typing.Any, None)
+        self.__text_index.clear()
+        self.__pending_inserted_display_items = dict()
+        self.__pending_removed_display_items = list()
+        self.__dirty_tree_nodes = dict()
 
     @property
     def document_controller(self) -> DocumentController.DocumentController:
@@ -179,19 +195,36 @@ class FilterController:
 
     def __update_tree_node(self, tree_node: TreeNode) -> None:
         """ Mark the fact that tree node counts need updating when convenient. """
-        self.__node_counts_dirty = True
+        self.__dirty_tree_nodes[id(tree_node)] = tree_node
+
+    def __apply_pending_changes(self) -> None:
+        """ Apply the queued insertions and removals to the tree, inserting the display items for each day together. """
+        with self.__display_item_tree_mutex:
+            pending_removed_display_items = self.__pending_removed_display_items
+            pending_inserted_display_items = self.__pending_inserted_display_items
+            self.__pending_removed_display_items = list()
+            self.__pending_inserted_display_items = dict()
+            if pending_removed_display_items:
+                self.__display_item_tree.remove_values(list(), pending_removed_display_items)
+            display_items_by_indexes: typing.Dict[typing.Tuple[int, int, int], typing.List[_ValueType]] = dict()
+            for display_item, indexes in pending_inserted_display_items.items():
+                display_items_by_indexes.setdefault(indexes, list()).append(display_item)
+            for indexes, display_items in display_items_by_indexes.items():
+                self.__display_item_tree.insert_values(indexes, display_items)
 
     def update_all_nodes(self) -> None:
-        """ Update all tree item displays if needed. Usually for count updates. """
+        """ Apply pending changes and update the tree item displays whose counts changed. """
         item_model_controller = self.item_model_controller
         if item_model_controller:
-            if self.__node_counts_dirty:
-                for item in self.__mapping.values():
-                    if "tree_node" in item.data:  # don't update the root node
-                        tree_node = item.data["tree_node"]
-                        item.data["display"] = self.__display_for_tree_node(tree_node)
-                        item_model_controller.data_changed(item.row, item.parent.row, item.parent.id)
-                self.__node_counts_dirty = False
+            self.__apply_pending_changes()
+            dirty_tree_nodes = self.__dirty_tree_nodes
+            self.__dirty_tree_nodes = dict()
+            for tree_node in dirty_tree_nodes.values():
+                item = self.__mapping.get(id(tree_node))
+                # skip nodes that have been removed since they were marked.
+                if item and item.data.get("tree_node") is tree_node:
+                    item.data["display"] = self.__display_for_tree_node(tree_node)
+                    item_model_controller.data_changed(item.row, item.parent.row, item.parent.id)
 
     def date_browser_selection_changed(self, selected_indexes: typing.Sequence[typing.Tuple[int, int, int]]) -> None:
         """
@@ -222,12 +255,15 @@ class FilterController:
         """
             Called to handle changes to the text filter.
 
+            The filter is evaluated using the text index. If the new text refines the previous text, the new filter
+            only searches within the items matched by the previous filter.
+
             :param text: The text for the filter.
         """
         text = text.strip() if text else None
 
-        if text is not None:
-            self.__text_filter = ListModel.TextFilter("text_for_filter", text)
+        if text:
+            self.__text_filter = IndexedTextFilter(self.__text_index, text, self.__text_filter)
         else:
             self.__text_filter = None
 
@@ -245,6 +281,144 @@ class FilterController:
         self.document_controller.display_filter = ListModel.AndFilter(filters)
 
 
+def _trigrams(text: str) -> typing.Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TextFilterIndex:
+    """
+        An index of the filter text of display items by trigram.
+
+        Items are added and removed as they are inserted into and removed from the display items model. A change to
+        the text of an item is detected when the item is next looked up, by comparing the identity of the cached
+        filter text of the item with the indexed text.
+
+        Each indexing operation increments a generation number and records it with the item so that filters can tell
+        which items have changed since they searched the index.
+
+        This class is thread safe.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.RLock()
+        # item -> (text_for_filter, lower case text, generation)
+        self.__entries: typing.Dict[_ValueType, typing.Tuple[str, str, int]] = dict()
+        self.__trigram_items: typing.Dict[str, typing.Set[_ValueType]] = dict()
+        self.__generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self.__generation
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__trigram_items.clear()
+            self.__generation += 1
+
+    def insert(self, item: _ValueType) -> None:
+        with self.__lock:
+            self.__index_item(item, item.text_for_filter)
+
+    def remove(self, item: _ValueType) -> None:
+        with self.__lock:
+            entry = self.__entries.pop(item, None)
+            if entry:
+                self.__remove_trigrams(item, entry[1])
+                self.__generation += 1
+
+    def get_text_and_generation(self, item: _ValueType) -> typing.Tuple[str, int]:
+        """Return the lower case filter text of the item and the generation in which it was indexed.
+
+        The item is indexed again if its text has changed.
+        """
+        text = item.text_for_filter
+        entry = self.__entries.get(item)
+        if entry is None or entry[0] is not text:
+            with self.__lock:
+                entry = self.__index_item(item, text)
+        return entry[1], entry[2]
+
+    def search(self, text: str, candidates: typing.Optional[typing.Iterable[_ValueType]] = None) -> typing.Set[_ValueType]:
+        """Return the indexed items whose filter text contains text, ignoring case.
+
+        If candidates is specified, only those items are considered.
+        """
+        lower_text = text.lower()
+        with self.__lock:
+            entries = self.__entries
+            if candidates is None:
+                trigrams = _trigrams(lower_text)
+                if trigrams:
+                    item_sets = sorted((self.__trigram_items.get(trigram, set()) for trigram in trigrams), key=len)
+                    candidates = item_sets[0].intersection(*item_sets[1:])
+                else:
+                    candidates = entries.keys()
+            return {item for item in candidates if item in entries and lower_text in entries[item][1]}
+
+    def __index_item(self, item: _ValueType, text: str) -> typing.Tuple[str, str, int]:
+        old_entry = self.__entries.get(item)
+        if old_entry:
+            self.__remove_trigrams(item, old_entry[1])
+        self.__generation += 1
+        lower_text = text.lower()
+        entry = text, lower_text, self.__generation
+        self.__entries[item] = entry
+        for trigram in _trigrams(lower_text):
+            self.__trigram_items.setdefault(trigram, set()).add(item)
+        return entry
+
+    def __remove_trigrams(self, item: _ValueType, lower_text: str) -> None:
+        for trigram in _trigrams(lower_text):
+            items = self.__trigram_items.get(trigram)
+            if items is not None:
+                items.discard(item)
+                if not items:
+                    self.__trigram_items.pop(trigram)
+
+
+class IndexedTextFilter(ListModel.Filter):
+    """
+        A filter matching display items whose filter text contains the text, ignoring case, using a text index.
+
+        The matching items are found by searching the index once. Items indexed after the search, either because they
+        are new or because their text changed, are matched directly against their text.
+
+        If a previous filter is passed and the text refines its text, only the items matched by the previous filter
+        are searched, as long as the index has not changed since.
+    """
+
+    def __init__(self, text_index: TextFilterIndex, text: str, previous_filter: typing.Optional[IndexedTextFilter] = None) -> None:
+        super().__init__()
+        self.__text_index = text_index
+        self.__text = text
+        self.__lower_text = text.lower()
+        self.__generation = text_index.generation
+        if previous_filter and previous_filter.__lower_text in self.__lower_text and previous_filter.__generation == self.__generation:
+            self.__items = text_index.search(text, previous_filter.__items)
+        else:
+            self.__items = text_index.search(text)
+
+    def __deepcopy__(self, memo: typing.Dict[typing.Any, typing.Any]) -> IndexedTextFilter:
+        result = typing.cast(IndexedTextFilter, super().__deepcopy__(memo))
+        result.__text_index = self.__text_index
+        result.__text = self.__text
+        result.__lower_text = self.__lower_text
+        result.__generation = self.__generation
+        result.__items = self.__items
+        return result
+
+    @property
+    def text(self) -> str:
+        return self.__text
+
+    def matches(self, d: typing.Any) -> bool:
+        lower_text, generation = self.__text_index.get_text_and_generation(d)
+        if generation > self.__generation:
+            return self.__lower_text in lower_text
+        return d in self.__items
+
+
 class FilterPanel:
 
     """
@@ -318,7 +492,7 @@ class TreeNode:
         self.reversed = reversed
         self.__weak_parent: typing.Optional[_TreeNodeWeakRefType] = None
         self.children: typing.List[TreeNode] = list()
-        self.values: typing.List[_ValueType] = list()
+        self.values: typing.Set[_ValueType] = set()
         self.__value_reverse_mapping: typing.Dict[_ValueType, _KeyListType] = dict()
         self.child_inserted: typing.Optional[typing.Callable[[TreeNode, int, TreeNode], None]] = None
         self.child_removed: typing.Optional[typing.Callable[[TreeNode, int], None]] = None
@@ -394,11 +568,21 @@ class TreeNode:
             inserted into the document. Also updates the tree node's cumulative
             child count.
         """
-        self.count += 1
+        self.insert_values(keys, [value])
+
+    def insert_values(self, keys: _KeySequenceType, values: typing.Sequence[_ValueType]) -> None:
+        """
+            Insert values (data items) with the same keys into this tree node and then its children, walking the
+            tree once for all of the values. Also updates the tree node's cumulative child count.
+        """
+        if not values:
+            return
+        self.count += len(values)
         if not self.key:
-            self.__value_reverse_mapping[value] = list(keys)
+            for value in values:
+                self.__value_reverse_mapping[value] = list(keys)
         if len(keys) == 0:
-            self.values.append(value)
+            self.values.update(values)
         else:
             key = keys[0]
             index = bisect.bisect_left(self.children, TreeNode(key, reversed=self.reversed))
@@ -412,7 +596,7 @@ class TreeNode:
                 if self.child_inserted:
                     self.child_inserted(self, index, new_tree_node)
             child = self.children[index]
-            child.insert_value(keys[1:], value)
+            child.insert_values(keys[1:], values)
             if self.tree_node_updated:
                 self.tree_node_updated(child)
 
@@ -421,17 +605,33 @@ class TreeNode:
             Remove a value (data item) from this tree node and its children.
             Also updates the tree node's cumulative child count.
         """
-        self.count -= 1
+        self.remove_values(keys, [value])
+
+    def remove_values(self, keys: _KeySequenceType, values: typing.Sequence[_ValueType]) -> None:
+        """
+            Remove values (data items) from this tree node and its children. The root node looks up the keys of each
+            value and removes the values with the same keys together.
+        """
         if not self.key:
-            keys = self.__value_reverse_mapping[value]
-            del self.__value_reverse_mapping[value]
+            values_by_keys: typing.Dict[typing.Tuple[_KeyType, ...], typing.List[_ValueType]] = dict()
+            for value in values:
+                values_by_keys.setdefault(tuple(self.__value_reverse_mapping.pop(value)), list()).append(value)
+            for value_keys, keys_values in values_by_keys.items():
+                self.__remove_values(value_keys, keys_values)
+        else:
+            self.__remove_values(keys, values)
+
+    def __remove_values(self, keys: _KeySequenceType, values: typing.Sequence[_ValueType]) -> None:
+        if not values:
+            return
+        self.count -= len(values)
         if len(keys) == 0:
-            self.values.remove(value)
+            self.values.difference_update(values)
         else:
             key = keys[0]
             index = bisect.bisect_left(self.children, TreeNode(key, reversed=self.reversed))
             assert index != len(self.children) and self.children[index].key == key
-            self.children[index].remove_value(keys[1:], value)
+            self.children[index].__remove_values(keys[1:], values)
             if self.tree_node_updated:
                 self.tree_node_updated(self.children[index])
             if self.children[index].count == 0:
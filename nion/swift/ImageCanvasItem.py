@@ -17,6 +17,7 @@ from nion.data import DataAndMetadata
 from nion.swift import DisplayCanvasItem
 from nion.swift.model import DisplayItem
 from nion.swift.model import Graphics
+from nion.swift.model import Tracing
 from nion.swift.model import UISettings
 from nion.swift.model import Utility
 from nion.ui import CanvasItem
@@ -146,7 +147,7 @@ class GraphicsCanvasItem(CanvasItem.AbstractCanvasItem):
         self.__ui_settings = ui_settings
         self.__displayed_shape: typing.Optional[DataAndMetadata.ShapeType] = None
         self.__graphics: typing.List[Graphics.Graphic] = list()
-        self.__graphics_for_compare: typing.List[Persistence.PersistentDictType] = list()
+        self.__graphics_for_compare: typing.List[typing.Tuple[Graphics.Graphic, int]] = list()
         self.__graphic_selection = DisplayItem.GraphicSelection()
         self.__coordinate_system: typing.List[Calibration.Calibration] = list()
 
@@ -161,7 +162,8 @@ class GraphicsCanvasItem(CanvasItem.AbstractCanvasItem):
         if ((self.__displayed_shape is None) != (displayed_shape is None)) or (self.__displayed_shape != displayed_shape):
             self.__displayed_shape = displayed_shape
             needs_update = True
-        graphics_for_compare = [graphic.write_to_dict() for graphic in graphics]
+        # compare the graphics and their change counts rather than their properties, which are expensive to write.
+        graphics_for_compare = [(graphic, graphic.change_count) for graphic in graphics]
         if graphics_for_compare != self.__graphics_for_compare:
             self.__graphics = list(graphics)
             self.__graphics_for_compare = graphics_for_compare
@@ -416,6 +418,7 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
         self.__coordinate_system: typing.List[Calibration.Calibration] = list()
         self.__graphics: typing.List[Graphics.Graphic] = list()
         self.__graphic_selection: DisplayItem.GraphicSelection = DisplayItem.GraphicSelection()
+        self.__graphic_hit_index = Graphics.GraphicHitIndex()
 
         # used for tracking undo
         self.__undo_command: typing.Optional[Undo.UndoableCommand] = None
@@ -690,7 +693,8 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
             # the graphics are drawn in order, which means the graphics with the higher index are "on top" of the
             # graphics with the lower index. but priority should also be given to selected graphics. so sort the
             # graphics according to whether they are selected or not (selected ones go later), then by their index.
-            for graphic_index, graphic in sorted(enumerate(graphics), key=lambda ig: (ig[0] in selection_indexes, ig[0])):
+            candidate_indexes = self.__get_graphic_candidate_indexes(widget_mapping, start_drag_pos)
+            for graphic_index, graphic in sorted(((i, graphics[i]) for i in candidate_indexes), key=lambda ig: (ig[0] in selection_indexes, ig[0])):
                 if isinstance(graphic, (Graphics.PointTypeGraphic, Graphics.LineTypeGraphic, Graphics.RectangleTypeGraphic, Graphics.SpotGraphic, Graphics.WedgeGraphic, Graphics.RingGraphic, Graphics.LatticeGraphic)):
                     already_selected = graphic_index in selection_indexes
                     move_only = not already_selected or multiple_items_selected
@@ -984,9 +988,10 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
             return True
         if delegate.tool_mode == "pointer":
             def get_pointer_tool_shape() -> str:
-                for graphic in self.__graphics:
+                for graphic_index in self.__get_graphic_candidate_indexes(widget_mapping, mouse_pos):
+                    graphic = self.__graphics[graphic_index]
                     if isinstance(graphic, (Graphics.RectangleTypeGraphic, Graphics.SpotGraphic)):
-                        part, specific = graphic.test(self.__get_mouse_mapping(), self.__ui_settings, Geometry.FloatPoint(x=x, y=y), False)
+                        part, specific = graphic.test(widget_mapping, self.__ui_settings, mouse_pos, False)
                         if part and part.endswith("rotate"):
                             return "cross"
                 return "arrow"
@@ -1077,6 +1082,16 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
         assert widget_mapping
         return widget_mapping
 
+    def __get_graphic_candidate_indexes(self, widget_mapping: ImageCanvasItemMapping, p: Geometry.FloatPoint) -> typing.Sequence[int]:
+        # return the indexes of the graphics which may be hit at p, in order. the index is only rebuilt when the
+        # graphics or the mapping change, so mouse moves only test the graphics near the mouse.
+        canvas_bounds = self.canvas_bounds
+        if not canvas_bounds:
+            return range(len(self.__graphics))
+        mapping_key = widget_mapping.canvas_rect, widget_mapping.data_shape, list(widget_mapping.calibrations)
+        self.__graphic_hit_index.update(self.__graphics, widget_mapping, self.__ui_settings, mapping_key, canvas_bounds.to_float_rect())
+        return self.__graphic_hit_index.get_candidate_indexes(p)
+
     @property
     def mouse_mapping(self) -> ImageCanvasItemMapping:
         return self.__get_mouse_mapping()
@@ -1120,6 +1135,7 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
         # anything has changed.
         self.prepare_display()
 
+    @Tracing.traced("canvas")
     def _repaint(self, drawing_context: DrawingContext.DrawingContext) -> None:
         super()._repaint(drawing_context)
         canvas_bounds = self.canvas_bounds
@@ -1150,6 +1166,7 @@ class ImageCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
 
     # this method will be invoked from the paint thread.
     # data is calculated and then sent to the image canvas item.
+    @Tracing.traced("canvas")
     def prepare_display(self) -> None:
         if self.__data_shape is not None:
             # configure the bitmap canvas item
@@ -3961,6 +3961,12 @@ class RemoveDisplayDataChannelCommand(Undo.UndoableCommand):
         self.__undelete_logs = typing.cast(typing.Any, None)
         super().close()
 
+    def _get_spill_state(self) -> typing.Any:
+        return Undo.get_undelete_logs_spill_state(self.__undelete_logs)
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        Undo.set_undelete_logs_spill_state(self.__undelete_logs, spill_state)
+
     def perform(self) -> None:
         display_item = self.__display_item_proxy.item
         if display_item:
@@ -19,6 +19,7 @@ from nion.swift import LineGraphCanvasItem
 from nion.swift import MimeTypes
 from nion.swift.model import DisplayItem
 from nion.swift.model import Graphics
+from nion.swift.model import Tracing
 from nion.swift.model import UISettings
 from nion.swift.model import Utility
 from nion.ui import CanvasItem
@@ -213,6 +214,7 @@ class LinePlotCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
 
         self.__graphics: typing.List[Graphics.Graphic] = list()
         self.__graphic_selection: typing.Optional[DisplayItem.GraphicSelection] = None
+        self.__graphic_hit_index = Graphics.GraphicHitIndex()
         self.__pending_interval: typing.Optional[Graphics.IntervalGraphic] = None
 
     def close(self) -> None:
@@ -449,6 +451,7 @@ class LinePlotCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
                 self.__view_to_selected_graphics(xdata0)
         return True
 
+    @Tracing.traced("canvas")
     def prepare_display(self) -> None:
         """Prepare the display.
 
@@ -592,6 +595,7 @@ class LinePlotCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
         # anything has changed.
         self.prepare_display()
 
+    @Tracing.traced("canvas")
     def _repaint(self, drawing_context: DrawingContext.DrawingContext) -> None:
         super()._repaint(drawing_context)
 
@@ -698,9 +702,10 @@ class LinePlotCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
                         self.cursor_shape = "hand"
                 elif self.__graphics:
                     graphics = self.__graphics
-                    for graphic_index, graphic in enumerate(graphics):
+                    widget_mapping = self.__get_mouse_mapping()
+                    for graphic_index in self.__get_graphic_candidate_indexes(widget_mapping, pos.to_float_point()):
+                        graphic = graphics[graphic_index]
                         if isinstance(graphic, (Graphics.IntervalGraphic, Graphics.ChannelGraphic)):
-                            widget_mapping = self.__get_mouse_mapping()
                             part, specific = graphic.test(widget_mapping, self.__ui_settings, pos.to_float_point(), False)
                             if part in {"start", "end"} and not modifiers.control:
                                 self.cursor_shape = "size_horizontal"
@@ -848,6 +853,16 @@ class LinePlotCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
     def mouse_mapping(self) -> LinePlotCanvasItemMapping:
         return self.__get_mouse_mapping()
 
+    def __get_graphic_candidate_indexes(self, widget_mapping: LinePlotCanvasItemMapping, p: Geometry.FloatPoint) -> typing.Sequence[int]:
+        # return the indexes of the graphics which may be hit at p, in order. the mapping is linear, so the position
+        # of two channels identifies it. the index is only rebuilt when the graphics or the mapping change.
+        canvas_bounds = self.canvas_bounds
+        if not canvas_bounds:
+            return range(len(self.__graphics))
+        mapping_key = widget_mapping.map_point_channel_norm_to_widget(0.0), widget_mapping.map_point_channel_norm_to_widget(1.0)
+        self.__graphic_hit_index.update(self.__graphics, widget_mapping, self.__ui_settings, mapping_key, canvas_bounds.to_float_rect())
+        return self.__graphic_hit_index.get_candidate_indexes(p)
+
     def begin_tracking_regions(self, pos: Geometry.IntPoint, modifiers: Graphics.ModifiersLike) -> None:
         # keep track of general drag information
         self.__graphic_drag_start_pos = pos
@@ -856,12 +871,13 @@ class LinePlotCanvasItem(DisplayCanvasItem.DisplayCanvasItem):
             self.__tracking_selections = True
             graphics = self.__graphics
             selection_indexes = self.__graphic_selection.indexes
-            for graphic_index, graphic in enumerate(graphics):
+            widget_mapping = self.__get_mouse_mapping()
+            for graphic_index in self.__get_graphic_candidate_indexes(widget_mapping, pos.to_float_point()):
+                graphic = graphics[graphic_index]
                 if isinstance(graphic, (Graphics.IntervalGraphic, Graphics.ChannelGraphic)):
                     already_selected = graphic_index in selection_indexes
                     multiple_items_selected = len(selection_indexes) > 1
                     move_only = not already_selected or multiple_items_selected
-                    widget_mapping = self.__get_mouse_mapping()
                     part, specific = graphic.test(widget_mapping, self.__ui_settings, self.__graphic_drag_start_pos.to_float_point(), move_only)
                     if part:
                         # select item and prepare for drag
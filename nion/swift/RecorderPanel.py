@@ -52,6 +52,7 @@ class Recorder:
         self.__recording_error = False
         self.__recording_interval = 1.0
         self.__recording_count = 0
+        self.__recorded_count = 0
 
         self.__last_complete_xdata: typing.Optional[DataAndMetadata.DataAndMetadata] = None
 
@@ -133,6 +134,12 @@ class Recorder:
                 self.__undelete_log = None
             super().close()
 
+        def _get_spill_state(self) -> typing.Any:
+            return Undo.get_undelete_logs_spill_state([self.__undelete_log])
+
+        def _set_spill_state(self, spill_state: typing.Any) -> None:
+            Undo.set_undelete_logs_spill_state([self.__undelete_log], spill_state)
+
         def perform(self) -> None:
             data_item = self.__data_item_fn()
             self.__data_item_proxy = data_item.create_proxy()
@@ -202,19 +209,20 @@ class Recorder:
                 last_xdata = self.__recording_data_item.xdata
                 self.__recording_index += 1
                 recording_data_shape = self.__recording_data_item.data_shape
-                if current_xdata and last_xdata and recording_data_shape is not None and current_xdata.data_shape == recording_data_shape[1:]:
-                    # continue, append the new data to existing data and update existing data item
-                    intensity_calibration = last_xdata.intensity_calibration
-                    dimensional_calibrations = last_xdata.dimensional_calibrations
-                    data_descriptor = last_xdata.data_descriptor
-                    stacked_data = numpy.vstack([last_xdata.data, [current_xdata.data]])  # type: ignore
-                    sequence_xdata = DataAndMetadata.new_data_and_metadata(
-                        stacked_data,
-                        intensity_calibration=intensity_calibration, dimensional_calibrations=dimensional_calibrations,
-                        data_descriptor=data_descriptor)
-                    self.__recording_data_item.set_xdata(sequence_xdata)
+                if current_xdata and last_xdata and recording_data_shape is not None and current_xdata.data_shape == recording_data_shape[1:] and self.__recorded_count < recording_data_shape[0]:
+                    # continue, write the new data into the next slot of the reserved sequence
+                    data_dtype = numpy.result_type(last_xdata.data_dtype, current_xdata.data_dtype)
+                    if data_dtype != last_xdata.data_dtype:
+                        # the frame needs a wider type than the recording. convert the recording, as stacking would.
+                        last_xdata = DataAndMetadata.new_data_and_metadata(last_xdata.data.astype(data_dtype),
+                                                                           intensity_calibration=last_xdata.intensity_calibration,
+                                                                           dimensional_calibrations=last_xdata.dimensional_calibrations,
+                                                                           metadata=last_xdata.metadata,
+                                                                           data_descriptor=last_xdata.data_descriptor)
+                        self.__recording_data_item.set_xdata(last_xdata)
+                    self.__record_frame(current_xdata, last_xdata.data_metadata)
                 elif current_xdata and not last_xdata:
-                    # first acquisition, create the sequence
+                    # first acquisition, reserve the entire sequence so that each frame can be written in place
                     intensity_calibration = current_xdata.intensity_calibration
                     dimensional_calibrations = [Calibration.Calibration(scale=self.__recording_interval,
                                                                         units="s")] + list(
@@ -222,12 +230,15 @@ class Recorder:
                     data_descriptor = DataAndMetadata.DataDescriptor(True,
                                                                      current_xdata.data_descriptor.collection_dimension_count,
                                                                      current_xdata.data_descriptor.datum_dimension_count)
-                    new_axis_data = current_xdata.data[numpy.newaxis, ...]  # type: ignore
-                    sequence_xdata = DataAndMetadata.new_data_and_metadata(new_axis_data,
-                                                                           intensity_calibration=intensity_calibration,
-                                                                           dimensional_calibrations=dimensional_calibrations,
-                                                                           data_descriptor=data_descriptor)
-                    self.__recording_data_item.set_xdata(sequence_xdata)
+                    data_shape = (max(self.__recording_count, 1),) + tuple(current_xdata.data_shape)
+                    data_dtype = current_xdata.data_dtype
+                    assert data_dtype is not None
+                    data_metadata = DataAndMetadata.DataMetadata((data_shape, data_dtype),
+                                                                 intensity_calibration=intensity_calibration,
+                                                                 dimensional_calibrations=dimensional_calibrations,
+                                                                 data_descriptor=data_descriptor)
+                    self.__recording_data_item.reserve_data(data_shape=data_shape, data_dtype=data_dtype, data_descriptor=data_descriptor)
+                    self.__record_frame(current_xdata, data_metadata)
                     self.__recording_transaction = self.__document_model.item_transaction(self.__recording_data_item)
                 else:
                     # something is amiss. stop.
@@ -237,10 +248,30 @@ class Recorder:
             if self.__recording_index >= self.__recording_count:
                 self.__stop_recording()
 
+    def __record_frame(self, frame_xdata: DataAndMetadata.DataAndMetadata, data_metadata: DataAndMetadata.DataMetadata) -> None:
+        # write the frame into the next slot of the reserved sequence. this costs the same for each frame, no matter
+        # how long the recording is.
+        assert self.__recording_data_item
+        frame_index = self.__recorded_count
+        # the frame is cast to the type of the recording, which may be wider than the frame type.
+        frame_data = frame_xdata.data.astype(data_metadata.data_dtype, copy=False)  # type: ignore
+        new_axis_xdata = DataAndMetadata.new_data_and_metadata(frame_data[numpy.newaxis, ...])
+        self.__recording_data_item.set_data_and_metadata_partial(data_metadata, new_axis_xdata, [slice(0, 1)], [slice(frame_index, frame_index + 1)], update_metadata=True)
+        self.__recorded_count = frame_index + 1
+
+    def __trim_recording(self) -> None:
+        # if the recording stopped early, shorten the sequence to the frames actually recorded.
+        recording_data_item = self.__recording_data_item
+        if recording_data_item and recording_data_item in self.__document_model.data_items:
+            recording_xdata = recording_data_item.xdata
+            if recording_xdata and 0 < self.__recorded_count < recording_xdata.data_shape[0]:
+                recording_data_item.set_xdata(recording_xdata[0:self.__recorded_count])
+
     def start_recording(self, recording_start: float, recording_interval: float, recording_count: int) -> None:
         self.__recording_state = "recording"
         self.__recording_start = recording_start
         self.__recording_index = 0
+        self.__recorded_count = 0
         self.__recording_error = False
         self.__recording_interval = recording_interval
         self.__recording_count = recording_count
@@ -257,6 +288,7 @@ class Recorder:
             self.__recording_index = 0
             self.__recording_error = False
             if self.__recording_data_item and self.__recording_transaction:
+                self.__trim_recording()
                 self.__recording_transaction.close()
                 self.__recording_transaction = None
                 self.__recording_data_item = None
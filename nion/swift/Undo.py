@@ -3,11 +3,59 @@ from __future__ import annotations
 import abc
 import copy
 import gettext
+import pathlib
+import pickle
+import shutil
+import sys
+import tempfile
 import typing
 
+import numpy
+
+from nion.data import DataAndMetadata
+from nion.swift.model import Changes
+
 
 _ = gettext.gettext
 
+# the default limit on the approximate number of bytes retained by the commands on an undo stack.
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+
+# spill states retaining fewer bytes than this are never spilled to disk.
+SPILL_SIZE_THRESHOLD = 64 * 1024
+
+_PLAIN_SCALAR_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def estimate_retained_size(value: typing.Any, visited: typing.Optional[typing.Set[int]] = None) -> int:
+    """Return the approximate number of bytes retained by value.
+
+    Containers, arrays, data and metadata objects, and undelete logs are measured. References to any other objects
+    (such as model objects or proxies) are not owned by the value and count as zero. Memory mapped arrays are backed by
+    files and also count as zero.
+    """
+    visited = visited if visited is not None else set()
+    if id(value) in visited:
+        return 0
+    visited.add(id(value))
+    if isinstance(value, numpy.memmap):
+        return 0
+    if isinstance(value, numpy.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, DataAndMetadata.DataAndMetadata):
+        return estimate_retained_size(value.data_if_loaded, visited) + estimate_retained_size(value.metadata, visited)
+    if isinstance(value, _PLAIN_SCALAR_TYPES):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_retained_size(k, visited) + estimate_retained_size(v, visited) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_retained_size(v, visited) for v in value)
+    if isinstance(value, Changes.UndeleteLog):
+        return estimate_retained_size(value._items, visited)
+    if isinstance(value, Changes.UndeleteBase):
+        return estimate_retained_size(list(vars(value).values()), visited)
+    return 0
+
 
 class UndoableCommand(abc.ABC):
 
@@ -17,8 +65,14 @@ class UndoableCommand(abc.ABC):
         self.__title = title
         self.__command_id = command_id
         self.__is_mergeable = is_mergeable
+        self.__retained_size: typing.Optional[int] = None
+        self.__spill_file_path: typing.Optional[pathlib.Path] = None
+        self.__is_spill_failed = False
 
     def close(self) -> None:
+        if self.__spill_file_path:
+            self.__spill_file_path.unlink(missing_ok=True)
+            self.__spill_file_path = None
         self.__old_modified_state = None
         self.__new_modified_state = None
 
@@ -60,21 +114,92 @@ class UndoableCommand(abc.ABC):
         self._perform()
 
     def undo(self) -> None:
+        self.restore_spilled()
         self._undo()
         self._set_modified_state(self.__old_modified_state)
         self.__is_mergeable = False
+        self.__retained_size = None
 
     def redo(self) -> None:
+        self.restore_spilled()
         self._redo()
         self._set_modified_state(self.__new_modified_state)
+        self.__retained_size = None
 
     def can_merge(self, command: UndoableCommand) -> bool:
         return False
 
     def merge(self, command: UndoableCommand) -> None:
         assert self.command_id and self.command_id == command.command_id
+        self.restore_spilled()
         self._merge(command)
         self.__new_modified_state = self._get_modified_state()
+        self.__retained_size = None
+
+    @property
+    def retained_size(self) -> int:
+        """Return the approximate number of bytes held in memory by this command."""
+        if self.__retained_size is None:
+            self.__retained_size = self._get_retained_size()
+        return self.__retained_size
+
+    @property
+    def is_spilled(self) -> bool:
+        return self.__spill_file_path is not None
+
+    def spill(self, directory: pathlib.Path) -> int:
+        """Move the large data held by this command into a file in directory.
+
+        Only commands implementing _get_spill_state are spilled. The spill state is pickled to the file and released; it
+        is read back before the command is undone, redone, or merged. If the state cannot be pickled, the command stays
+        in memory.
+
+        Returns the approximate number of bytes released.
+        """
+        if self.__spill_file_path or self.__is_spill_failed:
+            return 0
+        spill_state = self._get_spill_state()
+        if spill_state is None or estimate_retained_size(spill_state) < SPILL_SIZE_THRESHOLD:
+            return 0
+        with tempfile.NamedTemporaryFile(dir=directory, prefix="undo-", suffix=".pickle", delete=False) as fp:
+            spill_file_path = pathlib.Path(fp.name)
+            try:
+                pickle.dump(spill_state, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                # leave the command in memory and do not try again.
+                self.__is_spill_failed = True
+        if self.__is_spill_failed:
+            spill_file_path.unlink(missing_ok=True)
+            return 0
+        self.__spill_file_path = spill_file_path
+        self._set_spill_state(None)
+        old_retained_size = self.retained_size
+        self.__retained_size = None
+        return old_retained_size - self.retained_size
+
+    def restore_spilled(self) -> None:
+        """Read back data previously moved to a file by spill."""
+        if self.__spill_file_path:
+            with self.__spill_file_path.open("rb") as fp:
+                self._set_spill_state(pickle.load(fp))
+            self.__spill_file_path.unlink(missing_ok=True)
+            self.__spill_file_path = None
+            self.__retained_size = None
+
+    def _get_retained_size(self) -> int:
+        # override to measure data held outside of the command attributes.
+        return estimate_retained_size([value for name, value in vars(self).items() if not name.startswith("_UndoableCommand__")])
+
+    def _get_spill_state(self) -> typing.Any:
+        """Return the large data held by this command which may be moved to a file, or None if there is none.
+
+        Override in commands holding large snapshots. The state must be picklable. It is released by passing None to
+        _set_spill_state and passed back to _set_spill_state before the command is used again.
+        """
+        return None
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        pass
 
     def _merge(self, command: UndoableCommand) -> None:
         pass
@@ -98,15 +223,53 @@ class UndoableCommand(abc.ABC):
         self._undo()
 
 
+def get_undelete_logs_spill_state(undelete_logs: typing.Sequence[typing.Optional[Changes.UndeleteLog]]) -> typing.Any:
+    """Return the spill state of the undelete logs held by a command, for use in _get_spill_state."""
+    return [undelete_log._get_spill_state() if undelete_log else None for undelete_log in undelete_logs]
+
+
+def set_undelete_logs_spill_state(undelete_logs: typing.Sequence[typing.Optional[Changes.UndeleteLog]], spill_state: typing.Any) -> None:
+    """Release (spill_state is None) or restore the spill state of the undelete logs, for use in _set_spill_state."""
+    for index, undelete_log in enumerate(undelete_logs):
+        if undelete_log:
+            undelete_log._set_spill_state(spill_state[index] if spill_state is not None else None)
+
+
 class UndoStack:
+    """Undo and redo stacks of commands.
+
+    The approximate memory retained by the commands is limited to memory_budget bytes. When over budget, large data
+    held by older commands is spilled to temporary files; if that is not enough, the oldest commands are dropped. The
+    most recent command is always kept in memory.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, *, memory_budget: typing.Optional[int] = None, spill_enabled: bool = True) -> None:
         # undo/redo stack. next item is at the end.
         self.__undo_stack: typing.List[UndoableCommand] = list()
         self.__redo_stack: typing.List[UndoableCommand] = list()
+        self.__memory_budget = memory_budget if memory_budget is not None else DEFAULT_MEMORY_BUDGET
+        self.__spill_enabled = spill_enabled
+        self.__spill_directory: typing.Optional[pathlib.Path] = None
 
     def close(self) -> None:
         self.clear()
+        if self.__spill_directory:
+            shutil.rmtree(self.__spill_directory, ignore_errors=True)
+            self.__spill_directory = None
+
+    @property
+    def memory_budget(self) -> int:
+        return self.__memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, value: int) -> None:
+        self.__memory_budget = value
+        self.__enforce_memory_budget()
+
+    @property
+    def retained_size(self) -> int:
+        """Return the approximate number of bytes held in memory by the commands on the stack."""
+        return sum(undo_command.retained_size for undo_command in self.__undo_stack + self.__redo_stack)
 
     @property
     def can_redo(self) -> bool:
@@ -158,12 +321,14 @@ class UndoStack:
         undo_command = self.__undo_stack.pop()
         undo_command.undo()
         self.__redo_stack.append(undo_command)
+        self.__enforce_memory_budget()
 
     def redo(self) -> None:
         assert len(self.__redo_stack) > 0
         undo_command = self.__redo_stack.pop()
         undo_command.redo()
         self.__undo_stack.append(undo_command)
+        self.__enforce_memory_budget()
 
     def push(self, undo_command: UndoableCommand) -> None:
         assert undo_command
@@ -176,3 +341,24 @@ class UndoStack:
             self.__undo_stack.append(undo_command)
         while len(self.__redo_stack) > 0:
             self.__redo_stack.pop().close()
+        self.__enforce_memory_budget()
+
+    def __enforce_memory_budget(self) -> None:
+        retained_size = self.retained_size
+        if retained_size <= self.__memory_budget:
+            return
+        # the most recent undo and redo commands stay in memory. spill the others, farthest from the top first.
+        spillable_commands = self.__undo_stack[:-1] + self.__redo_stack[:-1]
+        if self.__spill_enabled:
+            for undo_command in spillable_commands:
+                if retained_size <= self.__memory_budget:
+                    break
+                if not undo_command.is_spilled:
+                    if not self.__spill_directory:
+                        self.__spill_directory = pathlib.Path(tempfile.mkdtemp(prefix="nionswift-undo-"))
+                    retained_size -= undo_command.spill(self.__spill_directory)
+        # still over budget; drop the oldest commands.
+        while retained_size > self.__memory_budget and len(self.__undo_stack) > 1:
+            undo_command = self.__undo_stack.pop(0)
+            retained_size -= undo_command.retained_size
+            undo_command.close()
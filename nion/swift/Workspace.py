@@ -4,6 +4,7 @@ from __future__ import annotations
 import copy
 import functools
 import gettext
+import importlib
 import random
 import string
 import threading
@@ -37,6 +38,15 @@ if typing.TYPE_CHECKING:
 _ = gettext.gettext
 
 
+def import_panel_class(module_name: str, class_name: str) -> typing.Callable[[DocumentController.DocumentController, str, Persistence.PersistentDictType], Panel.Panel]:
+    """Return a panel class stand-in which imports the panel class from the module when a panel is first created."""
+    def create_panel(document_controller: DocumentController.DocumentController, panel_id: str, properties: Persistence.PersistentDictType) -> Panel.Panel:
+        panel_class = getattr(importlib.import_module(module_name), class_name)
+        return typing.cast(Panel.Panel, panel_class(document_controller, panel_id, properties))
+
+    return create_panel
+
+
 def create_image_desc() -> Persistence.PersistentDictType:
     return {"type": "image", "identifier": "".join([random.choice(string.ascii_uppercase) for _ in range(2)]), "uuid": str(uuid.uuid4())}
 
@@ -1032,6 +1042,22 @@ class WorkspaceManager(metaclass=Utility.Singleton):
         panel_tuple = panel_class, panel_id, name, list(positions), position, properties
         self.__panel_tuples[panel_id] = panel_tuple
 
+    def register_lazy_panel(self, load_fn: typing.Callable[[], typing.Any], panel_id: str, name: str,
+                            positions: typing.Sequence[str], position: str,
+                            properties: typing.Optional[Persistence.PersistentDictType] = None) -> None:
+        """Register a placeholder for a panel which is registered by calling load_fn when it is first created.
+
+        This allows a plug-in to be loaded when its panel is first shown rather than at startup.
+        """
+        def create_panel(document_controller: DocumentController.DocumentController, panel_id: str, properties: Persistence.PersistentDictType) -> typing.Any:
+            load_fn()
+            panel_class = self.__panel_tuples[panel_id][0]
+            if panel_class == create_panel:
+                raise ValueError(f"Panel '{panel_id}' was not registered when loaded.")
+            return panel_class(document_controller, panel_id, properties)
+
+        self.register_panel(create_panel, panel_id, name, positions, position, properties)
+
     def unregister_panel(self, panel_id: str) -> None:
         del self.__panel_tuples[panel_id]
 
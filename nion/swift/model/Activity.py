@@ -21,6 +21,13 @@ class Activity(Observable.Observable):
     def displayed_title(self) -> str:
         return self.title
 
+    @property
+    def can_cancel(self) -> bool:
+        return False
+
+    def cancel(self) -> None:
+        pass
+
 
 activity_appended_event = Event.Event()
 activity_finished_event = Event.Event()
@@ -16,7 +16,7 @@ import threading
 # None
 
 # local libraries
-# None
+from nion.swift.model import Tracing
 import typing
 import uuid
 
@@ -408,10 +408,11 @@ class DbStorageCache(CacheLike):
                 try:
                     # logging.debug("EXECUTE %s", action_name)
                     # start = time.time()
-                    if result is not None:
-                        result.append(item())
-                    else:
-                        item()
+                    with Tracing.span("DbStorageCache." + action_name, "cache"):
+                        if result is not None:
+                            result.append(item())
+                        else:
+                            item()
                     # elapsed = time.time() - start
                     # logging.debug("ELAPSED %s", elapsed)
                 except Exception as e:
@@ -487,6 +488,7 @@ class DbStorageCache(CacheLike):
             _queue.put((functools.partial(self.__set_cached_value, target, key, value, dirty), None, event, "set_cached_value"))
         # event.wait()
 
+    @Tracing.traced("cache")
     def get_cached_value(self, target: typing.Any, key: str, default_value: typing.Any = None) -> typing.Any:
         assert target is not None
         event = threading.Event()
@@ -507,6 +509,7 @@ class DbStorageCache(CacheLike):
             _queue.put((functools.partial(self.__remove_cached_value, target, key), None, event, "remove_cached_value"))
         # event.wait()
 
+    @Tracing.traced("cache")
     def is_cached_value_dirty(self, target: typing.Any, key: str) -> bool:
         assert target is not None
         event = threading.Event()
@@ -15,6 +15,13 @@ class UndeleteBase(abc.ABC):
     @abc.abstractmethod
     def undelete(self, document_model: DocumentModel.DocumentModel) -> None: ...
 
+    def _get_spill_state(self) -> typing.Any:
+        # return picklable snapshot data which may be moved to a file while the entry is unused. see UndoableCommand.
+        return None
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        pass
+
 
 class UndeleteLog:
 
@@ -33,6 +40,13 @@ class UndeleteLog:
         for entry in reversed(self.__items):
             entry.undelete(document_model)
 
+    def _get_spill_state(self) -> typing.List[typing.Any]:
+        return [item._get_spill_state() for item in self.__items]
+
+    def _set_spill_state(self, spill_state: typing.Optional[typing.List[typing.Any]]) -> None:
+        for index, item in enumerate(self.__items):
+            item._set_spill_state(spill_state[index] if spill_state is not None else None)
+
     @property
     def _items(self) -> typing.List[UndeleteBase]:
         return self.__items
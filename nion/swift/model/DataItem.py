@@ -26,6 +26,8 @@ from nion.data import DataAndMetadata
 from nion.data import Image
 from nion.swift.model import ApplicationData
 from nion.swift.model import Cache
+from nion.swift.model import DataResidency
+from nion.swift.model import DisplayStageCache
 from nion.swift.model import Graphics
 from nion.swift.model import Metadata
 from nion.swift.model import Persistence
@@ -222,6 +224,9 @@ class DataItem(Persistence.PersistentObject):
         self.__metadata: DataAndMetadata.MetadataType = dict()
         self.__data_ref_count = 0
         self.__data_ref_count_mutex = threading.RLock()
+        # reads data which is not in storage yet. see set_lazy_xdata.
+        self.__lazy_data_fn: typing.Optional[typing.Callable[[], typing.Optional[_ImageDataType]]] = None
+        self.__lazy_data_lock = threading.RLock()
         self.__pending_write = True
         self.__in_transaction_state = False
         self.__write_delay_modified_count = 0
@@ -251,6 +256,7 @@ class DataItem(Persistence.PersistentObject):
         self.__suspendable_storage_cache: typing.Optional[Cache.CacheLike] = None
         # Python 3.9+: parameterized set, weakref
         self.__display_data_channel_refs = set()  # type: ignore  # display data channels referencing this data item
+        self.__display_stage_cache = DisplayStageCache.DisplayStageCache()  # display stages shared by those channels
         if data is not None:
             data_and_metadata = DataAndMetadata.DataAndMetadata.from_data(data, timezone=self.timezone, timezone_offset=self.timezone_offset)
             self.__set_data_and_metadata_direct(data_and_metadata)
@@ -286,9 +292,18 @@ class DataItem(Persistence.PersistentObject):
         return data_item_copy
 
     def close(self) -> None:
+        DataResidency.get_residency_manager().discard(self)
+        self.__display_stage_cache.clear()
         self.__data_and_metadata = None
+        with self.__lazy_data_lock:
+            self.__lazy_data_fn = None
         super().close()
 
+    def about_to_be_removed(self, container: Persistence.PersistentObject) -> None:
+        # write lazy data so that it is in storage if the removal is undone.
+        self.write_lazy_data()
+        super().about_to_be_removed(container)
+
     @property
     def created(self) -> datetime.datetime:
         return typing.cast(datetime.datetime, self._get_persistent_property_value("created"))
@@ -410,6 +425,11 @@ class DataItem(Persistence.PersistentObject):
         """Return the list of display data channels referencing this data item."""
         return {display_data_channel_ref() for display_data_channel_ref in self.__display_data_channel_refs}
 
+    @property
+    def display_stage_cache(self) -> DisplayStageCache.DisplayStageCache:
+        """Return the cache of display stages shared by the display data channels referencing this data item."""
+        return self.__display_stage_cache
+
     @property
     def in_transaction_state(self) -> bool:
         return self.__in_transaction_state
@@ -425,6 +445,7 @@ class DataItem(Persistence.PersistentObject):
             self.exit_write_delay()
             if self.__data_and_metadata:
                 self.__data_and_metadata.unloadable = True
+                self.__retain_unloadable_data()
             self._finish_pending_write()
 
     def write_to_dict(self) -> Persistence.PersistentDictType:
@@ -441,7 +462,8 @@ class DataItem(Persistence.PersistentObject):
             self.__pending_write = False
 
     def __write_data(self) -> None:
-        if self.__data_and_metadata:
+        # lazy data is unchanged since it was set; it is written by write_lazy_data.
+        if self.__data_and_metadata and not self.__lazy_data_fn:
             self.write_external_data("data", self.__data_and_metadata.data)
 
     def _finish_pending_write(self) -> None:
@@ -498,6 +520,7 @@ class DataItem(Persistence.PersistentObject):
             self.__enter_write_delay_state()
         elif self.__data_and_metadata:
             self.__data_and_metadata.unloadable = self.persistent_object_context is not None and not self.is_write_delayed
+            self.__retain_unloadable_data()
 
     def _test_get_file_path(self) -> str:
         # hack for test function
@@ -783,6 +806,8 @@ class DataItem(Persistence.PersistentObject):
             self.__data_ref_count += 1
             if self.__data_and_metadata:
                 self.__data_and_metadata.increment_data_ref_count()
+                if initial_count == 0:
+                    DataResidency.get_residency_manager().reclaim(self, self.__data_and_metadata)
         return initial_count + 1
 
     def decrement_data_ref_count(self) -> int:
@@ -791,9 +816,17 @@ class DataItem(Persistence.PersistentObject):
             self.__data_ref_count -= 1
             final_count = self.__data_ref_count
             if self.__data_and_metadata:
+                self.__retain_unloadable_data()
                 self.__data_and_metadata.decrement_data_ref_count()
         return final_count
 
+    def __retain_unloadable_data(self) -> None:
+        # keep recently used data resident, within the memory budget, in case it is used again soon. called when the
+        # data is about to be released or becomes unloadable.
+        with self.__data_ref_count_mutex:
+            if self.__data_ref_count == 0 and self.__data_and_metadata and self.__data_and_metadata.unloadable:
+                DataResidency.get_residency_manager().retain(self, self.__data_and_metadata)
+
     def set_pending_xdata(self, xd: DataAndMetadata.DataAndMetadata) -> None:
         with self.__pending_xdata_lock:
             self.__pending_xdata = xd
@@ -816,8 +849,11 @@ class DataItem(Persistence.PersistentObject):
                 assert not pending_xdata or not pending_queue
                 if pending_xdata:
                     self.set_xdata(pending_xdata)
-                for partial_xdata, partial_src_slice, partial_dst_slice, partial_metadata in pending_queue:
-                    self.set_data_and_metadata_partial(partial_metadata, partial_xdata, partial_src_slice, partial_dst_slice, update_metadata=True)
+                if pending_queue:
+                    # the metadata of each partial update replaces the previous, so only the last is used.
+                    partial_metadata = pending_queue[-1][3]
+                    partial_updates = coalesce_partial_updates([(partial_xdata, partial_src_slice, partial_dst_slice) for partial_xdata, partial_src_slice, partial_dst_slice, _ in pending_queue], partial_metadata.data_shape)
+                    self.set_data_and_metadata_partials(partial_metadata, partial_updates, update_metadata=True)
 
     @property
     def xdata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
@@ -1044,6 +1080,9 @@ class DataItem(Persistence.PersistentObject):
         return self.__data_and_metadata
 
     def __load_data(self) -> typing.Optional[_ImageDataType]:
+        lazy_data_fn = self.__lazy_data_fn
+        if lazy_data_fn:
+            return lazy_data_fn()
         if self.persistent_object_context:
             return typing.cast(typing.Optional[_ImageDataType], self.read_external_data("data"))
         return None
@@ -1075,8 +1114,11 @@ class DataItem(Persistence.PersistentObject):
 
     def __set_data_and_metadata_direct(self, data_and_metadata: typing.Optional[DataAndMetadata.DataAndMetadata],
                                        data_modified: typing.Optional[datetime.datetime] = None) -> None:
+        with self.__lazy_data_lock:
+            self.__lazy_data_fn = None
         with self.__data_ref_count_mutex:
             if self.__data_and_metadata:
+                DataResidency.get_residency_manager().discard(self)
                 self.__data_and_metadata._subtract_data_ref_count(self.__data_ref_count)
             self.__data_and_metadata = data_and_metadata
             if self.__data_and_metadata:
@@ -1115,9 +1157,49 @@ class DataItem(Persistence.PersistentObject):
                 if self.persistent_object_context and not self.is_write_delayed:
                     self.write_external_data("data", self.__data_and_metadata.data)
                     self.__data_and_metadata.unloadable = True
+                    self.__retain_unloadable_data()
         finally:
             self.decrement_data_ref_count()
 
+    def set_lazy_xdata(self, xdata: DataAndMetadata.DataAndMetadata, data_modified: typing.Optional[datetime.datetime] = None) -> None:
+        """Set the data and metadata without reading the data.
+
+        The data is read with the data function of xdata each time it is loaded, until write_lazy_data writes it to
+        storage. Setting or modifying the data discards the data function.
+        """
+        with self.data_source_changes():
+            self.ensure_data_source()
+            with self.__data_ref_count_mutex:
+                if self.__data_ref_count > 0:
+                    # the data is in use, so it must be loaded now.
+                    self.set_data_and_metadata(xdata, data_modified)
+                    return
+                timezone = xdata.timezone or Utility.get_local_timezone()
+                timezone_offset = xdata.timezone_offset or Utility.TimezoneMinutesToStringConverter().convert(Utility.local_utcoffset_minutes())
+                new_data_and_metadata = DataAndMetadata.DataAndMetadata(self.__load_data, xdata.data_shape_and_dtype, xdata.intensity_calibration, xdata.dimensional_calibrations, xdata.metadata, xdata.timestamp, None, xdata.data_descriptor, timezone, timezone_offset)
+                self.__set_data_and_metadata_direct(new_data_and_metadata, data_modified)
+                with self.__lazy_data_lock:
+                    self.__lazy_data_fn = xdata.data_fn
+                new_data_and_metadata.unloadable = True
+
+    @property
+    def has_lazy_data(self) -> bool:
+        """Return whether the data is read with the data function passed to set_lazy_xdata rather than from storage."""
+        return self.__lazy_data_fn is not None
+
+    def write_lazy_data(self) -> None:
+        """Read the lazy data and write it to storage, if the data item has been inserted. Thread safe.
+
+        The data is not written while writes are delayed; call again afterwards.
+        """
+        with self.__lazy_data_lock:
+            lazy_data_fn = self.__lazy_data_fn
+            if lazy_data_fn and self.persistent_object_context and not self.is_write_delayed:
+                data = lazy_data_fn()
+                if data is not None:
+                    self.write_external_data("data", data)
+                self.__lazy_data_fn = None
+
     def reserve_data(self, *, data_shape: DataAndMetadata.ShapeType, data_dtype: numpy.typing.DTypeLike, data_descriptor: DataAndMetadata.DataDescriptor, data_modified: typing.Optional[datetime.datetime] = None) -> None:
         """Reserves the underlying data without necessarily allocating memory. Useful for memory mapped files.
         """
@@ -1135,6 +1217,7 @@ class DataItem(Persistence.PersistentObject):
                 self.__set_data_and_metadata_direct(new_data_and_metadata, data_modified)
                 if self.__data_and_metadata:
                     self.__data_and_metadata.unloadable = True
+                    self.__retain_unloadable_data()
         finally:
             self.decrement_data_ref_count()
 
@@ -1143,8 +1226,21 @@ class DataItem(Persistence.PersistentObject):
                                       dst: typing.Sequence[slice], update_metadata: bool = False,
                                       data_modified: typing.Optional[datetime.datetime] = None) -> None:
         # metadata is updated from data_metadata; data_and_metadata is only used for data
+        self.set_data_and_metadata_partials(data_metadata, [(data_and_metadata, src, dst)], update_metadata, data_modified)
+
+    def set_data_and_metadata_partials(self, data_metadata: DataAndMetadata.DataMetadata,
+                                       partial_updates: typing.Sequence[typing.Tuple[DataAndMetadata.DataAndMetadata, typing.Sequence[slice], typing.Sequence[slice]]],
+                                       update_metadata: bool = False,
+                                       data_modified: typing.Optional[datetime.datetime] = None) -> None:
+        """Copy each (data_and_metadata, src, dst) partial update into the data, in order.
+
+        The data is written and listeners are notified once for all of the partial updates.
+        """
         with self.data_source_changes():
             self.increment_data_ref_count()
+            with self.__lazy_data_lock:
+                # the data is modified in place and written, replacing any lazy data.
+                self.__lazy_data_fn = None
             try:
                 if not self.__data_and_metadata:
                     data: numpy.typing.NDArray[typing.Any] = numpy.zeros(data_metadata.data_shape, data_metadata.data_dtype)
@@ -1175,8 +1271,10 @@ class DataItem(Persistence.PersistentObject):
                         self.__set_data_metadata_direct(data_metadata)
                     assert self.__data_and_metadata.data_shape == data_metadata.data_shape
                     assert self.__data_and_metadata.data_dtype == data_metadata.data_dtype
-                    assert self.__data_and_metadata.data_dtype == data_and_metadata.data_dtype
-                    self.__data_and_metadata._data_ex[tuple(dst)] = data_and_metadata._data_ex[tuple(src)]
+                    target_data = self.__data_and_metadata._data_ex
+                    for data_and_metadata, src, dst in partial_updates:
+                        assert self.__data_and_metadata.data_dtype == data_and_metadata.data_dtype
+                        target_data[tuple(dst)] = data_and_metadata._data_ex[tuple(src)]
                     # mark changes and update session
                     self.__change_changed = True
                     self.__change_data_changed = True
@@ -1188,6 +1286,7 @@ class DataItem(Persistence.PersistentObject):
                     if self.persistent_object_context and not self.is_write_delayed:
                         self.write_external_data("data", self.__data_and_metadata.data)
                         self.__data_and_metadata.unloadable = True
+                        self.__retain_unloadable_data()
             finally:
                 self.decrement_data_ref_count()
 
@@ -1310,12 +1409,77 @@ def create_mask_data(graphics: typing.Sequence[Graphics.Graphic], shape: DataAnd
             if graphic.used_role in ("mask", "fourier_mask"):
                 if mask is None:
                     mask = numpy.zeros(shape)
-                mask = numpy.logical_or(mask, graphic.get_mask(shape, calibrated_origin))
+                mask = numpy.logical_or(mask, graphic.get_cached_mask(shape, calibrated_origin))
     if mask is None:
         mask = numpy.ones(shape)
     return mask
 
 
+_PartialUpdate = typing.Tuple[DataAndMetadata.DataAndMetadata, typing.Sequence[slice], typing.Sequence[slice]]
+_Ranges = typing.List[typing.Tuple[int, int]]
+
+
+def _get_slice_ranges(slices: typing.Sequence[slice], shape: DataAndMetadata.ShapeType) -> typing.Optional[_Ranges]:
+    # return the (start, stop) range in each dimension or None if the slices are not simple contiguous slices.
+    if len(slices) > len(shape):
+        return None
+    ranges = list()
+    for i, n in enumerate(shape):
+        s = slices[i] if i < len(slices) else slice(None)
+        if not isinstance(s, slice):
+            return None
+        start, stop, step = s.indices(n)
+        if step != 1:
+            return None
+        ranges.append((start, max(start, stop)))
+    return ranges
+
+
+def coalesce_partial_updates(partial_updates: typing.Sequence[_PartialUpdate], data_shape: DataAndMetadata.ShapeType) -> typing.List[_PartialUpdate]:
+    """Return an equivalent, possibly shorter, list of (data_and_metadata, src, dst) partial updates.
+
+    Consecutive updates copying from the same source data with the same source to destination offset, differing only
+    along one dimension where they overlap or touch, are merged into a single copy. Updates whose destination is
+    completely overwritten by a later update are dropped. Updates with slices other than simple contiguous slices are
+    kept as they are.
+    """
+    # entries are (data_and_metadata, src_ranges, dst_ranges) or (data_and_metadata, src, dst) if not simple.
+    entries: typing.List[typing.Tuple[DataAndMetadata.DataAndMetadata, typing.Any, typing.Any, bool]] = list()
+    for data_and_metadata, src, dst in partial_updates:
+        src_ranges = _get_slice_ranges(src, data_and_metadata.data_shape)
+        dst_ranges = _get_slice_ranges(dst, data_shape)
+        if src_ranges is None or dst_ranges is None or [b - a for a, b in src_ranges] != [b - a for a, b in dst_ranges]:
+            entries.append((data_and_metadata, src, dst, False))
+            continue
+        if entries and entries[-1][3] and entries[-1][0]._data_ex is data_and_metadata._data_ex:
+            last_src_ranges, last_dst_ranges = entries[-1][1], entries[-1][2]
+            differing = [i for i in range(len(dst_ranges)) if src_ranges[i] != last_src_ranges[i] or dst_ranges[i] != last_dst_ranges[i]]
+            if len(differing) == 1:
+                i = differing[0]
+                (src_start, src_stop), (dst_start, dst_stop) = src_ranges[i], dst_ranges[i]
+                (last_src_start, last_src_stop), (last_dst_start, last_dst_stop) = last_src_ranges[i], last_dst_ranges[i]
+                if dst_start - src_start == last_dst_start - last_src_start and src_start <= last_src_stop and last_src_start <= src_stop:
+                    src_ranges[i] = min(src_start, last_src_start), max(src_stop, last_src_stop)
+                    dst_ranges[i] = min(dst_start, last_dst_start), max(dst_stop, last_dst_stop)
+                    entries.pop()
+        entries.append((data_and_metadata, src_ranges, dst_ranges, True))
+    # drop updates overwritten by a later update, working back from the last update.
+    kept_entries: typing.List[typing.Tuple[DataAndMetadata.DataAndMetadata, typing.Any, typing.Any, bool]] = list()
+    for entry in reversed(entries):
+        if entry[3]:
+            dst_ranges = entry[2]
+            if any(kept_entry[3] and all(b0 <= a0 and a1 <= b1 for (a0, a1), (b0, b1) in zip(dst_ranges, kept_entry[2])) for kept_entry in kept_entries):
+                continue
+        kept_entries.append(entry)
+    result: typing.List[_PartialUpdate] = list()
+    for data_and_metadata, src, dst, is_simple in reversed(kept_entries):
+        if is_simple:
+            src = [slice(start, stop) for start, stop in src]
+            dst = [slice(start, stop) for start, stop in dst]
+        result.append((data_and_metadata, src, dst))
+    return result
+
+
 class DataSource:
     def __init__(self, display_data_channel: DisplayItem.DisplayDataChannel, graphic: typing.Optional[Graphics.Graphic], xdata: typing.Optional[DataAndMetadata.DataAndMetadata] = None) -> None:
         self.__display_data_channel = display_data_channel
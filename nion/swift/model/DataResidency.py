@@ -0,0 +1,177 @@
+"""Keep recently used data resident in memory within a budget.
+
+Data items unload their data when the last reference to the data is released. The residency manager retains the data
+of recently released data items in a least recently used pool so that viewing the item again does not reload it from
+disk. The pool is limited by a budget in bytes and, optionally, by the age of the entries.
+
+A budget of zero disables retention, which is the default.
+"""
+
+from __future__ import annotations
+
+# standard libraries
+import collections
+import dataclasses
+import math
+import threading
+import time
+import typing
+
+# third party libraries
+import numpy
+
+# local libraries
+# None
+
+if typing.TYPE_CHECKING:
+    from nion.data import DataAndMetadata
+
+
+@dataclasses.dataclass(frozen=True)
+class DataResidencyStatistics:
+    hits: int
+    misses: int
+    evictions: int
+    resident_count: int
+    resident_bytes: int
+
+
+@dataclasses.dataclass
+class _ResidentEntry:
+    data_and_metadata: DataAndMetadata.DataAndMetadata
+    nbytes: int
+    timestamp: float
+
+
+class DataResidencyManager:
+    """Retain the data of released items in a least recently used pool, limited by budget_bytes and max_age.
+
+    Clients call retain when the last reference to an item's data is released and reclaim when the item's data is
+    referenced again. The manager holds a data reference on the retained data and releases it when the data is evicted.
+    """
+
+    def __init__(self, budget_bytes: int = 0, max_age: typing.Optional[float] = None) -> None:
+        self.__lock = threading.RLock()
+        self.__entries: typing.OrderedDict[typing.Any, _ResidentEntry] = collections.OrderedDict()
+        self.__budget_bytes = budget_bytes
+        self.__max_age = max_age
+        self.__resident_bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @property
+    def budget_bytes(self) -> int:
+        return self.__budget_bytes
+
+    @budget_bytes.setter
+    def budget_bytes(self, value: int) -> None:
+        with self.__lock:
+            self.__budget_bytes = max(0, value)
+            self.__evict()
+
+    @property
+    def max_age(self) -> typing.Optional[float]:
+        return self.__max_age
+
+    @max_age.setter
+    def max_age(self, value: typing.Optional[float]) -> None:
+        with self.__lock:
+            self.__max_age = value
+            self.__evict()
+
+    def retain(self, key: typing.Any, data_and_metadata: DataAndMetadata.DataAndMetadata) -> None:
+        """Retain the loaded data for key, if it fits within the budget.
+
+        Must be called before the caller releases its last data reference.
+        """
+        nbytes = _get_nbytes(data_and_metadata)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry and entry.data_and_metadata is data_and_metadata:
+                # already retained; mark it as most recently used.
+                entry.timestamp = time.monotonic()
+                self.__entries.move_to_end(key)
+                return
+            self.__discard(key)
+            if 0 < nbytes <= self.__budget_bytes and data_and_metadata.is_data_valid:
+                data_and_metadata.increment_data_ref_count()
+                self.__entries[key] = _ResidentEntry(data_and_metadata, nbytes, time.monotonic())
+                self.__resident_bytes += nbytes
+                self.__evict()
+
+    def reclaim(self, key: typing.Any, data_and_metadata: DataAndMetadata.DataAndMetadata) -> bool:
+        """Stop retaining the data for key and return whether it was resident.
+
+        Must be called after the caller takes its first data reference so that the data stays loaded.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            is_hit = entry is not None and entry.data_and_metadata is data_and_metadata
+            if is_hit:
+                self.__hits += 1
+            elif data_and_metadata.unloadable:
+                self.__misses += 1
+            self.__discard(key)
+            return is_hit
+
+    def discard(self, key: typing.Any) -> None:
+        """Stop retaining the data for key, if any. Call when the data for key is replaced or the key is closed."""
+        with self.__lock:
+            self.__discard(key)
+
+    def clear(self) -> None:
+        with self.__lock:
+            for key in list(self.__entries.keys()):
+                self.__discard(key)
+
+    def reset_statistics(self) -> None:
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
+
+    def get_statistics(self) -> DataResidencyStatistics:
+        with self.__lock:
+            return DataResidencyStatistics(self.__hits, self.__misses, self.__evictions, len(self.__entries), self.__resident_bytes)
+
+    def __discard(self, key: typing.Any) -> None:
+        entry = self.__entries.pop(key, None)
+        if entry:
+            self.__resident_bytes -= entry.nbytes
+            entry.data_and_metadata.decrement_data_ref_count()
+
+    def __evict(self) -> None:
+        # evict the least recently used entries until within budget, and any entries older than max age.
+        expired_timestamp = time.monotonic() - self.__max_age if self.__max_age is not None else -math.inf
+        while self.__entries:
+            key, entry = next(iter(self.__entries.items()))
+            if self.__resident_bytes <= self.__budget_bytes and entry.timestamp >= expired_timestamp:
+                break
+            self.__discard(key)
+            self.__evictions += 1
+
+
+def _get_nbytes(data_and_metadata: DataAndMetadata.DataAndMetadata) -> int:
+    data_shape_and_dtype = data_and_metadata.data_shape_and_dtype
+    if data_shape_and_dtype is None:
+        return 0
+    data_shape, data_dtype = data_shape_and_dtype
+    return int(numpy.prod(data_shape, dtype=numpy.int64)) * numpy.dtype(data_dtype).itemsize
+
+
+_residency_manager = DataResidencyManager()
+
+
+def get_residency_manager() -> DataResidencyManager:
+    return _residency_manager
+
+
+def set_budget(budget_bytes: int, max_age: typing.Optional[float] = None) -> None:
+    """Set the process wide memory budget for retained data. A budget of zero disables retention."""
+    _residency_manager.budget_bytes = budget_bytes
+    _residency_manager.max_age = max_age
+
+
+def get_statistics() -> DataResidencyStatistics:
+    return _residency_manager.get_statistics()
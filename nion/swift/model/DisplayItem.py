@@ -24,10 +24,13 @@ from nion.swift.model import Cache
 from nion.swift.model import Changes
 from nion.swift.model import ColorMaps
 from nion.swift.model import DataItem
+from nion.swift.model import DisplayStageCache
 from nion.swift.model import Graphics
 from nion.swift.model import Model
 from nion.swift.model import Persistence
 from nion.swift.model import Schema
+from nion.swift.model import SliceSum
+from nion.swift.model import Tracing
 from nion.swift.model import Utility
 from nion.utils import Event
 from nion.utils import Geometry
@@ -39,6 +42,8 @@ if typing.TYPE_CHECKING:
 _ImageDataType = Image._ImageDataType
 _RGBA32Type = Image._RGBAImageDataType
 
+_T = typing.TypeVar("_T")
+
 
 _ = gettext.gettext
 
@@ -242,6 +247,9 @@ class CalibrationStyleFractionalCenter(CalibrationStyle):
 class AdjustmentType(typing.Protocol):
     def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType: ...
 
+    # transform a table of distinct values, where counts is the number of times each value occurs in the data.
+    def transform_table(self, values: _ImageDataType, counts: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType: ...
+
 
 def adjustment_factory(adjustment_d: Persistence.PersistentDictType) -> typing.Optional[AdjustmentType]:
     if adjustment_d.get("type", None) == "gamma":
@@ -252,6 +260,9 @@ def adjustment_factory(adjustment_d: Persistence.PersistentDictType) -> typing.O
             def transform(self, data: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType:
                 return numpy.power(numpy.clip(data, 0.0, 1.0), self.__gamma, dtype=numpy.float32)  # type: ignore
 
+            def transform_table(self, values: _ImageDataType, counts: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType:
+                return self.transform(values, display_limits)
+
         return AdjustGamma(adjustment_d.get("gamma", 1.0))
     elif adjustment_d.get("type", None) == "log":
         class AdjustLog:
@@ -260,6 +271,9 @@ def adjustment_factory(adjustment_d: Persistence.PersistentDictType) -> typing.O
                 c = 1.0 / (numpy.log2(1 + range))
                 return c * numpy.log2(1 + range * numpy.clip(data, 0.0, 1.0), dtype=numpy.float32)  # type: ignore
 
+            def transform_table(self, values: _ImageDataType, counts: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType:
+                return self.transform(values, display_limits)
+
         return AdjustLog()
     elif adjustment_d.get("type", None) == "equalized":
         class AdjustEqualized:
@@ -271,11 +285,33 @@ def adjustment_factory(adjustment_d: Persistence.PersistentDictType) -> typing.O
                 equalized = numpy.interp(data.flatten(), bins[:-1], histogram_cdf)  # type: ignore
                 return equalized.reshape(data.shape)  # type: ignore
 
+            def transform_table(self, values: _ImageDataType, counts: _ImageDataType, display_limits: typing.Tuple[float, float]) -> _ImageDataType:
+                # weight the histogram by the counts and limit it to the values present in the data so that it matches
+                # the histogram of the data.
+                values = numpy.clip(values, 0.0, 1.0)
+                present_values = values[counts > 0]
+                if not present_values.size:
+                    return values
+                histogram, bins = numpy.histogram(values, 256, range=(numpy.amin(present_values), numpy.amax(present_values)), weights=counts, density=True)  # type: ignore
+                histogram_cdf = histogram.cumsum()
+                histogram_cdf = histogram_cdf / histogram_cdf[-1]
+                return numpy.interp(values, bins[:-1], histogram_cdf)  # type: ignore
+
         return AdjustEqualized()
     else:
         return None
 
 
+class _DisplayValuesSupersededError(Exception):
+    pass
+
+
+class _LatestDisplayValues:
+    # shared by display values superseding each other, so that superseded display values do not form a chain.
+    def __init__(self, display_values: DisplayValues) -> None:
+        self.display_values = display_values
+
+
 class DisplayValues:
     """Calculate display data used to render the display.
 
@@ -290,6 +326,20 @@ class DisplayValues:
     data -> element -> display -> normalized -> adjusted -> display_rgba
 
     Display renderers may request data at any stage of this pipeline.
+
+    When the display data is 2d integer data of at most 16 bits, display_rgba is calculated by running steps 4 and 5 on
+    a table of the possible values and then looking up the rgba value of each pixel in the table, which avoids float
+    intermediates the size of the data.
+
+    When a slice sum cache is passed, slice sums of 2d collections of 1d data are calculated from the cumulative sums in
+    the cache. When a stage cache is passed, the element data, display data and data range are shared with other display
+    values using the same cache and the same display properties. The data key identifies the version of the data for the
+    caches.
+
+    When the display properties change while display values are being calculated, the display data channel supersedes
+    them with new display values. The superseded display values stop calculating at the next stage and are abandoned;
+    from then on, every value comes from the latest display values. This avoids calculating every intermediate state
+    when properties change rapidly, such as when scrubbing through a sequence.
     """
 
     def __init__(self, data_and_metadata: typing.Optional[DataAndMetadata.DataAndMetadata], sequence_index: int,
@@ -297,9 +347,15 @@ class DisplayValues:
                  display_limits: typing.Optional[typing.Tuple[float, float]],
                  complex_display_type: typing.Optional[str],
                  color_map_data: typing.Optional[_RGBA32Type], brightness: float, contrast: float,
-                 adjustments: typing.Sequence[Persistence.PersistentDictType]) -> None:
+                 adjustments: typing.Sequence[Persistence.PersistentDictType], *,
+                 slice_sum_cache: typing.Optional[SliceSum.SliceSumCache] = None,
+                 stage_cache: typing.Optional[DisplayStageCache.DisplayStageCache] = None,
+                 data_key: typing.Any = None) -> None:
         self.__lock = threading.RLock()
         self.__data_and_metadata = data_and_metadata
+        self.__slice_sum_cache = slice_sum_cache
+        self.__stage_cache = stage_cache
+        self.__data_key = data_key
         self.__sequence_index = sequence_index
         self.__collection_index = collection_index
         self.__slice_center = slice_center
@@ -330,96 +386,189 @@ class DisplayValues:
         self.__display_rgba: typing.Optional[_ImageDataType] = None
         self.__display_rgba_timestamp: typing.Optional[datetime.datetime] = data_and_metadata.timestamp if data_and_metadata else None
         self.__finalized = False
+        self.__latest_display_values = _LatestDisplayValues(self)
+        self.__is_abandoned = False
         self.on_finalize: typing.Optional[typing.Callable[[DisplayValues], None]] = None
 
     def finalize(self) -> None:
+        if self.__is_abandoned:
+            self.__get_latest_display_values().finalize()
+            return
         with self.__lock:
             self.__finalized = True
         if callable(self.on_finalize):
             self.on_finalize(self)
 
+    def supersede(self, display_values: DisplayValues) -> None:
+        """Mark these display values as superseded by newer display values for the same display data channel.
+
+        Stages already calculated remain available. Stages not yet calculated are abandoned and the newer display values
+        are used instead.
+        """
+        display_values.__latest_display_values = self.__latest_display_values
+        self.__latest_display_values.display_values = display_values
+
+    @property
+    def is_abandoned(self) -> bool:
+        return self.__is_abandoned
+
+    def __get_latest_display_values(self) -> DisplayValues:
+        return self.__latest_display_values.display_values
+
+    def __raise_if_superseded(self) -> None:
+        # called before calculating each stage. raises if newer display values exist so that the calculation stops.
+        if self.__latest_display_values.display_values is not self:
+            raise _DisplayValuesSupersededError()
+
+    def __get_latest_value(self, getter: typing.Callable[[DisplayValues], _T]) -> _T:
+        # return the value from these display values, unless they have been abandoned, in which case return the value
+        # from the latest display values. once abandoned, all values come from the latest display values so that
+        # values from different display values are not mixed.
+        display_values = self
+        while True:
+            if display_values.__is_abandoned:
+                display_values = display_values.__get_latest_display_values()
+            try:
+                return getter(display_values)
+            except _DisplayValuesSupersededError:
+                display_values.__is_abandoned = True
+
+    def __get_shared_stage_value(self, stage: str, calculate: typing.Callable[[], _T]) -> _T:
+        # share the stage with other display values for the same version of the data and the same stage parameters.
+        data_and_metadata = self.__data_and_metadata
+        if not self.__stage_cache or data_and_metadata is None:
+            return calculate()
+        collection_index = tuple(self.__collection_index) if self.__collection_index is not None else None
+        stage_key: typing.Tuple[typing.Any, ...] = (stage, self.__sequence_index, collection_index, self.__slice_center, self.__slice_width)
+        if stage != "element":
+            stage_key += (self.__complex_display_type,)
+        return self.__stage_cache.get_stage_value(data_and_metadata, self.__data_key, stage_key, calculate)
+
     @property
     def color_map_data(self) -> typing.Optional[_RGBA32Type]:
-        return self.__color_map_data
+        return self.__get_latest_value(lambda display_values: display_values.__color_map_data)
 
     @property
     def data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
-        return self.__data_and_metadata
+        return self.__get_latest_value(lambda display_values: display_values.__data_and_metadata)
 
     @property
     def element_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_element_data_and_metadata())
+
+    def __get_element_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
         with self.__lock:
             if self.__element_data_and_metadata_dirty:
+                self.__raise_if_superseded()
                 self.__element_data_and_metadata_dirty = False
-                data_and_metadata = self.__data_and_metadata
-                if data_and_metadata is not None:
-                    timestamp = data_and_metadata.timestamp
+                self.__element_data_and_metadata = self.__get_shared_stage_value("element", self.__calculate_element_data_and_metadata)
+            return self.__element_data_and_metadata
+
+    def __calculate_element_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
+        data_and_metadata = self.__data_and_metadata
+        if data_and_metadata is not None:
+            timestamp = data_and_metadata.timestamp
+            with Tracing.span("DisplayValues.element_data", "display"):
+                slice_sum_data_and_metadata = None
+                if self.__slice_sum_cache:
+                    slice_sum_data_and_metadata = self.__slice_sum_cache.get_slice_sum(data_and_metadata,
+                                                                                       self.__data_key,
+                                                                                       self.__slice_center,
+                                                                                       self.__slice_width)
+                if slice_sum_data_and_metadata:
+                    data_and_metadata = slice_sum_data_and_metadata
+                else:
                     data_and_metadata, modified = Core.function_element_data_no_copy(data_and_metadata,
                                                                                      self.__sequence_index,
                                                                                      self.__collection_index,
                                                                                      self.__slice_center,
                                                                                      self.__slice_width,
                                                                                      flag16=False)
-                    if data_and_metadata:
-                        data_and_metadata.data_metadata.timestamp = timestamp
-                    self.__element_data_and_metadata = data_and_metadata
-            return self.__element_data_and_metadata
+            if data_and_metadata:
+                data_and_metadata.data_metadata.timestamp = timestamp
+        return data_and_metadata
 
     @property
     def display_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_display_data_and_metadata())
+
+    def __get_display_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
         with self.__lock:
             if self.__display_data_and_metadata_dirty:
+                self.__raise_if_superseded()
                 self.__display_data_and_metadata_dirty = False
-                data_and_metadata = self.element_data_and_metadata
-                if data_and_metadata is not None:
-                    timestamp = data_and_metadata.timestamp
-                    data_and_metadata, modified = Core.function_scalar_data_no_copy(data_and_metadata, self.__complex_display_type)
-                    if data_and_metadata:
-                        data_and_metadata.data_metadata.timestamp = timestamp
-                    self.__display_data_and_metadata = data_and_metadata
+                self.__display_data_and_metadata = self.__get_shared_stage_value("display", self.__calculate_display_data_and_metadata)
             return self.__display_data_and_metadata
 
+    def __calculate_display_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
+        data_and_metadata = self.__get_element_data_and_metadata()
+        if data_and_metadata is not None:
+            timestamp = data_and_metadata.timestamp
+            with Tracing.span("DisplayValues.display_data", "display"):
+                data_and_metadata, modified = Core.function_scalar_data_no_copy(data_and_metadata, self.__complex_display_type)
+            if data_and_metadata:
+                data_and_metadata.data_metadata.timestamp = timestamp
+        return data_and_metadata
+
     @property
     def data_range(self) -> typing.Optional[typing.Tuple[float, float]]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_data_range())
+
+    def __get_data_range(self) -> typing.Optional[typing.Tuple[float, float]]:
         with self.__lock:
             if self.__data_range_dirty:
+                self.__raise_if_superseded()
                 self.__data_range_dirty = False
-                display_data_and_metadata = self.display_data_and_metadata
-                display_data = display_data_and_metadata.data if display_data_and_metadata else None
-                if display_data is not None and display_data.shape and self.__data_and_metadata:
-                    data_shape = self.__data_and_metadata.data_shape
-                    data_dtype = self.__data_and_metadata.data_dtype
-                    if Image.is_shape_and_dtype_rgb_type(data_shape, data_dtype):
-                        self.__data_range = (0, 255)
-                    elif Image.is_shape_and_dtype_complex_type(data_shape, data_dtype):
-                        self.__data_range = (numpy.amin(display_data), numpy.amax(display_data))
-                    else:
-                        self.__data_range = (numpy.amin(display_data), numpy.amax(display_data))
-                else:
-                    self.__data_range = None
-                if self.__data_range is not None:
-                    if math.isnan(self.__data_range[0]) or math.isnan(self.__data_range[1]) or math.isinf(self.__data_range[0]) or math.isinf(self.__data_range[1]):
-                        self.__data_range = (0.0, 0.0)
-                    if numpy.issubdtype(type(self.__data_range[0]), numpy.bool_):
-                        self.__data_range = (int(self.__data_range[0]), self.__data_range[1])
-                    if numpy.issubdtype(type(self.__data_range[1]), numpy.bool_):
-                        self.__data_range = (self.__data_range[0], int(self.__data_range[1]))
+                self.__data_range = self.__get_shared_stage_value("data_range", self.__calculate_data_range)
             return self.__data_range
 
+    def __calculate_data_range(self) -> typing.Optional[typing.Tuple[float, float]]:
+        data_range: typing.Optional[typing.Tuple[float, float]]
+        display_data_and_metadata = self.__get_display_data_and_metadata()
+        display_data = display_data_and_metadata.data if display_data_and_metadata else None
+        if display_data is not None and display_data.shape and self.__data_and_metadata:
+            data_shape = self.__data_and_metadata.data_shape
+            data_dtype = self.__data_and_metadata.data_dtype
+            with Tracing.span("DisplayValues.data_range", "display"):
+                if Image.is_shape_and_dtype_rgb_type(data_shape, data_dtype):
+                    data_range = (0, 255)
+                elif Image.is_shape_and_dtype_complex_type(data_shape, data_dtype):
+                    data_range = (numpy.amin(display_data), numpy.amax(display_data))
+                else:
+                    data_range = (numpy.amin(display_data), numpy.amax(display_data))
+        else:
+            data_range = None
+        if data_range is not None:
+            if math.isnan(data_range[0]) or math.isnan(data_range[1]) or math.isinf(data_range[0]) or math.isinf(data_range[1]):
+                data_range = (0.0, 0.0)
+            if numpy.issubdtype(type(data_range[0]), numpy.bool_):
+                data_range = (int(data_range[0]), data_range[1])
+            if numpy.issubdtype(type(data_range[1]), numpy.bool_):
+                data_range = (data_range[0], int(data_range[1]))
+        return data_range
+
     @property
     def display_range(self) -> typing.Optional[typing.Tuple[float, float]]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_display_range())
+
+    def __get_display_range(self) -> typing.Optional[typing.Tuple[float, float]]:
         with self.__lock:
             if self.__display_range_dirty:
+                self.__raise_if_superseded()
                 self.__display_range_dirty = False
-                self.__display_range = calculate_display_range(self.__display_limits, self.data_range, self.data_sample, self.__data_and_metadata, self.__complex_display_type)
+                self.__display_range = calculate_display_range(self.__display_limits, self.__get_data_range(), self.__get_data_sample(), self.__data_and_metadata, self.__complex_display_type)
             return self.__display_range
 
     @property
     def data_sample(self) -> typing.Optional[_ImageDataType]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_data_sample())
+
+    def __get_data_sample(self) -> typing.Optional[_ImageDataType]:
         with self.__lock:
             if self.__data_sample_dirty:
+                self.__raise_if_superseded()
                 self.__data_sample_dirty = False
-                display_data_and_metadata = self.display_data_and_metadata
+                display_data_and_metadata = self.__get_display_data_and_metadata()
                 display_data = display_data_and_metadata.data if display_data_and_metadata else None
                 if display_data is not None and display_data.shape and self.__data_and_metadata:
                     data_shape = self.__data_and_metadata.data_shape
@@ -436,81 +585,144 @@ class DisplayValues:
 
     @property
     def display_rgba(self) -> typing.Optional[_ImageDataType]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_display_rgba())
+
+    def __get_display_rgba(self) -> typing.Optional[_ImageDataType]:
         with self.__lock:
             if self.__display_rgba_dirty:
+                self.__raise_if_superseded()
                 self.__display_rgba_dirty = False
-                display_data = self.adjusted_data_and_metadata
+                display_rgba_data = self.__calculate_display_rgba_by_lookup()
+                if display_rgba_data is not None:
+                    self.__display_rgba = display_rgba_data
+                    return self.__display_rgba
+                display_data = self.__get_adjusted_data_and_metadata()
                 if display_data is not None and self.__data_and_metadata is not None:
-                    if self.data_range is not None:  # workaround until validating and retrieving data stats is an atomic operation
+                    if self.__get_data_range() is not None:  # workaround until validating and retrieving data stats is an atomic operation
                         # display_range is just display_limits but calculated if display_limits is None
-                        display_range = self.transformed_display_range
-                        display_rgba = Core.function_display_rgba(display_data, display_range, self.__color_map_data)
+                        display_range = self.__get_transformed_display_range()
+                        with Tracing.span("DisplayValues.display_rgba", "display"):
+                            display_rgba = Core.function_display_rgba(display_data, display_range, self.__color_map_data)
                         self.__display_rgba = display_rgba.data if display_rgba else None
             return self.__display_rgba
 
+    def __calculate_display_rgba_by_lookup(self) -> typing.Optional[_ImageDataType]:
+        # for 2d integer data of at most 16 bits, calculate the rgba value of each possible value once, then look up the
+        # rgba value of each pixel in a single pass. returns None if the data is not suitable.
+        display_data_and_metadata = self.__get_display_data_and_metadata()
+        display_data = display_data_and_metadata.data if display_data_and_metadata else None
+        if display_data is None or display_data.ndim != 2 or display_data.dtype.kind not in "ui" or display_data.dtype.itemsize > 2:
+            return None
+        data_range = self.__get_data_range()
+        display_range = self.__get_display_range()
+        if data_range is None or display_range is None:
+            return None
+        # index the table by the unsigned view of the data. signed data needs a table covering the full range.
+        index_dtype = numpy.dtype(f"uint{display_data.dtype.itemsize * 8}")
+        table_size = int(data_range[1]) + 1 if display_data.dtype.kind == "u" else 1 << (display_data.dtype.itemsize * 8)
+        if display_data.size < table_size:
+            return None
+        index_data = display_data.view(index_dtype)
+        with Tracing.span("DisplayValues.display_rgba_lookup", "display"):
+            table: _ImageDataType = numpy.arange(table_size, dtype=index_dtype).view(display_data.dtype)
+            if self.__adjustments:
+                # normalize and adjust the table the same way as the data is normalized and adjusted.
+                display_limit_low, display_limit_high = display_range
+                m = 1 / (display_limit_high - display_limit_low) if display_limit_high != display_limit_low else 0.0
+                b = -display_limit_low
+                table = float(m) * (table + float(b))
+                counts: typing.Optional[_ImageDataType] = None
+                for adjustment_d in self.__adjustments:
+                    adjustment = adjustment_factory(adjustment_d)
+                    if adjustment:
+                        if counts is None:
+                            counts = numpy.bincount(index_data.ravel(), minlength=table_size)[:table_size]
+                        table = adjustment.transform_table(table, counts, display_range)
+            lookup = Image.create_rgba_image_from_array(table.reshape(1, -1), display_limits=self.__get_transformed_display_range(), lookup=self.__color_map_data)
+            return numpy.take(lookup.reshape(-1), index_data)
+
     @property
     def display_rgba_timestamp(self) -> typing.Optional[datetime.datetime]:
-        return self.__display_rgba_timestamp
+        return self.__get_latest_value(lambda display_values: display_values.__display_rgba_timestamp)
 
     @property
     def normalized_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_normalized_data_and_metadata())
+
+    def __get_normalized_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
         with self.__lock:
             if self.__normalized_data_and_metadata_dirty:
+                self.__raise_if_superseded()
                 self.__normalized_data_and_metadata_dirty = False
-                display_data_and_metadata = self.display_data_and_metadata
-                display_range = self.display_range
+                display_data_and_metadata = self.__get_display_data_and_metadata()
+                display_range = self.__get_display_range()
                 if display_range is not None and display_data_and_metadata:
                     display_limit_low, display_limit_high = display_range
                     # normalize the data to [0, 1].
                     m = 1 / (display_limit_high - display_limit_low) if display_limit_high != display_limit_low else 0.0
                     b = -display_limit_low
-                    self.__normalized_data_and_metadata = float(m) * (display_data_and_metadata + float(b))
+                    with Tracing.span("DisplayValues.normalized_data", "display"):
+                        self.__normalized_data_and_metadata = float(m) * (display_data_and_metadata + float(b))
             return self.__normalized_data_and_metadata
 
     @property
     def adjusted_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_adjusted_data_and_metadata())
+
+    def __get_adjusted_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
         with self.__lock:
             if self.__adjusted_data_and_metadata_dirty:
+                self.__raise_if_superseded()
                 self.__adjusted_data_and_metadata_dirty = False
                 if self.__adjustments:
-                    display_xdata = self.normalized_data_and_metadata
+                    display_xdata = self.__get_normalized_data_and_metadata()
                     for adjustment_d in self.__adjustments:
                         adjustment = adjustment_factory(adjustment_d)
                         if adjustment:
-                            display_range = self.display_range
+                            display_range = self.__get_display_range()
                             if display_xdata and display_range is not None:
                                 display_data = display_xdata.data
                                 if display_data is not None:
                                     display_xdata = DataAndMetadata.new_data_and_metadata(adjustment.transform(display_data, display_range))
                     self.__adjusted_data_and_metadata = display_xdata
                 else:
-                    self.__adjusted_data_and_metadata = self.display_data_and_metadata
+                    self.__adjusted_data_and_metadata = self.__get_display_data_and_metadata()
             return self.__adjusted_data_and_metadata
 
     @property
     def adjusted_display_range(self) -> typing.Optional[typing.Tuple[float, float]]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_adjusted_display_range())
+
+    def __get_adjusted_display_range(self) -> typing.Optional[typing.Tuple[float, float]]:
         if self.__adjustments:
             # transforms have already been applied and data is now in the range of 0.0, 1.0.
             # brightness and contrast will be applied on top of this transform.
             return 0.0, 1.0
         else:
-            return self.display_range
+            return self.__get_display_range()
 
     @property
     def transformed_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
+        return self.__get_latest_value(lambda display_values: display_values.__get_transformed_data_and_metadata())
+
+    def __get_transformed_data_and_metadata(self) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
         with self.__lock:
             if self.__transformed_data_and_metadata_dirty:
+                self.__raise_if_superseded()
                 self.__transformed_data_and_metadata_dirty = False
-                adjusted_xdata = self.adjusted_data_and_metadata
+                adjusted_xdata = self.__get_adjusted_data_and_metadata()
                 if adjusted_xdata:
-                    self.__transformed_data_and_metadata = Core.function_rescale(adjusted_xdata, data_range=(0.0, 1.0), in_range=self.transformed_display_range)
+                    self.__transformed_data_and_metadata = Core.function_rescale(adjusted_xdata, data_range=(0.0, 1.0), in_range=self.__get_transformed_display_range())
                 else:
                     self.__transformed_data_and_metadata = None
             return self.__transformed_data_and_metadata
 
     @property
     def transformed_display_range(self) -> typing.Tuple[float, float]:
-        adjusted_display_range = self.adjusted_display_range
+        return self.__get_latest_value(lambda display_values: display_values.__get_transformed_display_range())
+
+    def __get_transformed_display_range(self) -> typing.Tuple[float, float]:
+        adjusted_display_range = self.__get_adjusted_display_range()
         assert adjusted_display_range is not None
         display_limit_low, display_limit_high = adjusted_display_range
         brightness = self.__brightness
@@ -546,8 +758,10 @@ class DisplayDataChannel(Persistence.PersistentObject):
         # # the display_data_channel will listen for that event and update last display values.
         self.__last_display_values: typing.Optional[DisplayValues] = None
         self.__current_display_values: typing.Optional[DisplayValues] = None
+        self.__newest_display_values: typing.Optional[DisplayValues] = None
         self.__current_data_item: typing.Optional[DataItem.DataItem] = None
         self.__current_data_item_modified_count = 0
+        self.__slice_sum_cache = SliceSum.SliceSumCache()
         self.__is_master = True
         self.__display_ref_count = 0
 
@@ -612,6 +826,7 @@ class DisplayDataChannel(Persistence.PersistentObject):
 
     def close(self) -> None:
         self.__disconnect_data_item_events()
+        self.__slice_sum_cache.close()
         super().close()
 
     def about_to_be_inserted(self, container: Persistence.PersistentObject) -> None:
@@ -1166,7 +1381,13 @@ class DisplayDataChannel(Persistence.PersistentObject):
             if not self.__current_display_values and self.__data_item:
                 self.__current_data_item = self.__data_item
                 self.__current_data_item_modified_count = self.__data_item.modified_count if self.__data_item else 0
-                self.__current_display_values = DisplayValues(self.__data_item.xdata, self.sequence_index, self.collection_index, self.slice_center, self.slice_width, self.display_limits, self.complex_display_type, self.__color_map_data, self.brightness, self.contrast, self.adjustments)
+                self.__current_display_values = DisplayValues(self.__data_item.xdata, self.sequence_index, self.collection_index, self.slice_center, self.slice_width, self.display_limits, self.complex_display_type, self.__color_map_data, self.brightness, self.contrast, self.adjustments, slice_sum_cache=self.__slice_sum_cache, stage_cache=self.__data_item.display_stage_cache, data_key=self.__current_data_item_modified_count)
+
+                # latest wins. display values still being calculated for earlier properties are abandoned at their
+                # next stage in favor of these display values.
+                if self.__newest_display_values:
+                    self.__newest_display_values.supersede(self.__current_display_values)
+                self.__newest_display_values = self.__current_display_values
 
                 def finalize(display_values: DisplayValues) -> None:
                     self.__last_display_values = display_values
@@ -1341,6 +1562,7 @@ class DisplayItem(Persistence.PersistentObject):
         self.__display_item_change_count = 0
         self.__display_item_change_count_lock = threading.RLock()
         self.__display_ref_count = 0
+        self.__text_for_filter: typing.Optional[str] = None
         self.graphic_selection = GraphicSelection()
         self.graphic_selection_changed_event = Event.Event()
         self.graphics_changed_event = Event.Event()
@@ -1484,6 +1706,8 @@ class DisplayItem(Persistence.PersistentObject):
                 self.remove_item("display_layers", typing.cast(Persistence.PersistentObject, self.display_layers[-1]))
 
     def __property_changed(self, name: str, value: typing.Any) -> None:
+        if name in ("title", "caption", "description"):
+            self.__text_for_filter = None
         self.notify_property_changed(name)
         if name == "title":
             self.notify_property_changed("displayed_title")
@@ -1819,6 +2043,8 @@ class DisplayItem(Persistence.PersistentObject):
     def __item_changed(self) -> None:
         # this event is only triggered when the data item changed live state; everything else goes through
         # the data changed messages.
+        # the filter text is invalidated first so that list models refiltering on this event see the new text.
+        self.__text_for_filter = None
         self.item_changed_event.fire()
 
     def __display_channel_property_changed(self, name: str) -> None:
@@ -1836,6 +2062,7 @@ class DisplayItem(Persistence.PersistentObject):
         return None
 
     def __update_displays(self) -> None:
+        self.__text_for_filter = None
         for display_data_channel in self.display_data_channels:
             display_data_channel.update_display_data()
         xdata_list = [data_item.xdata if data_item else None for data_item in self.data_items]
@@ -1878,6 +2105,7 @@ class DisplayItem(Persistence.PersistentObject):
         self.graphics_changed_event.fire(self.graphic_selection)
 
     def _description_changed(self) -> None:
+        self.__text_for_filter = None
         self.notify_property_changed("title")
         self.notify_property_changed("caption")
         self.notify_property_changed("description")
@@ -1901,7 +2129,13 @@ class DisplayItem(Persistence.PersistentObject):
 
     @property
     def text_for_filter(self) -> str:
-        return " ".join([self.displayed_title, self.caption, self.description, self.size_and_data_format_as_string])
+        # cached until the title, caption, description or data changes. the same string object is returned while it
+        # is valid so that indexes can cheaply detect changes by identity.
+        text_for_filter = self.__text_for_filter
+        if text_for_filter is None:
+            text_for_filter = " ".join([self.displayed_title, self.caption, self.description, self.size_and_data_format_as_string])
+            self.__text_for_filter = text_for_filter
+        return text_for_filter
 
     @property
     def displayed_title(self) -> str:
@@ -1947,6 +2181,7 @@ class DisplayItem(Persistence.PersistentObject):
         self.__display_data_channel_data_item_changed_event_listeners.insert(before_index, display_data_channel.data_item_changed_event.listen(self.__item_changed))
         self.__display_data_channel_data_item_description_changed_event_listeners.insert(before_index, display_data_channel.data_item_description_changed_event.listen(self._description_changed))
         self.__display_data_channel_data_item_proxy_changed_event_listeners.insert(before_index, display_data_channel.data_item_proxy_changed_event.listen(self.__update_displays))
+        self.__text_for_filter = None
         self.notify_insert_item("display_data_channels", display_data_channel, before_index)
 
     def __remove_display_data_channel(self, name: str, index: int, display_data_channel: DisplayDataChannel) -> None:
@@ -1966,6 +2201,7 @@ class DisplayItem(Persistence.PersistentObject):
         del self.__display_data_channel_data_item_description_changed_event_listeners[index]
         self.__display_data_channel_data_item_proxy_changed_event_listeners[index].close()
         del self.__display_data_channel_data_item_proxy_changed_event_listeners[index]
+        self.__text_for_filter = None
         self.notify_remove_item("display_data_channels", display_data_channel, index)
 
     def append_display_data_channel(self, display_data_channel: DisplayDataChannel, display_layer: typing.Optional[DisplayLayer] = None) -> None:
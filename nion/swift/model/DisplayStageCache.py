@@ -0,0 +1,88 @@
+"""Share display calculation stages between display data channels showing the same data.
+
+When the same data item is shown in several places, each display data channel calculates its own display values. The
+early stages of the display calculation, such as extracting the element data, converting complex data to scalar data and
+finding the data range, depend only on the data and a few display properties, so channels with the same properties
+calculate the same results.
+
+Each data item has a display stage cache storing the results of those stages, keyed by the stage and its parameters.
+The first display values to need a stage calculate it; others use the stored result, waiting for it if it is being
+calculated. The results are discarded when the data or its version changes, and only a few recently used results are
+kept.
+"""
+
+from __future__ import annotations
+
+# standard libraries
+import collections
+import threading
+import typing
+import weakref
+
+# third party libraries
+# None
+
+# local libraries
+# None
+
+if typing.TYPE_CHECKING:
+    from nion.data import DataAndMetadata
+
+_T = typing.TypeVar("_T")
+
+
+class _Stage:
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.is_calculated = False
+        self.value: typing.Any = None
+
+
+class DisplayStageCache:
+    """Store the results of display calculation stages for one data item, keeping at most max_stage_count results."""
+
+    def __init__(self, max_stage_count: int = 16) -> None:
+        self.max_stage_count = max_stage_count
+        self.__lock = threading.RLock()
+        self.__data_and_metadata_ref: typing.Optional[weakref.ReferenceType[DataAndMetadata.DataAndMetadata]] = None
+        self.__data_key: typing.Any = None
+        self.__stages: typing.OrderedDict[typing.Hashable, _Stage] = collections.OrderedDict()
+        self.__calculation_count = 0
+
+    @property
+    def calculation_count(self) -> int:
+        """Return the number of stages calculated. Useful for testing."""
+        return self.__calculation_count
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__data_and_metadata_ref = None
+            self.__data_key = None
+            self.__stages.clear()
+
+    def get_stage_value(self, data_and_metadata: DataAndMetadata.DataAndMetadata, data_key: typing.Any, stage_key: typing.Hashable, calculate: typing.Callable[[], _T]) -> _T:
+        """Return the value of the stage for the data, calculating it if required.
+
+        The data key identifies the version of the data, since data may be modified in place. If calculate raises an
+        exception, the stage remains uncalculated and the exception is passed to the caller.
+        """
+        with self.__lock:
+            if not self.__data_and_metadata_ref or self.__data_and_metadata_ref() is not data_and_metadata or self.__data_key != data_key:
+                self.__data_and_metadata_ref = weakref.ref(data_and_metadata)
+                self.__data_key = data_key
+                self.__stages.clear()
+            stage = self.__stages.get(stage_key)
+            if stage is None:
+                stage = _Stage()
+                self.__stages[stage_key] = stage
+                while len(self.__stages) > self.max_stage_count:
+                    self.__stages.popitem(last=False)
+            else:
+                self.__stages.move_to_end(stage_key)
+        with stage.lock:
+            if not stage.is_calculated:
+                stage.value = calculate()
+                stage.is_calculated = True
+                with self.__lock:
+                    self.__calculation_count += 1
+            return typing.cast(_T, stage.value)
@@ -4,13 +4,17 @@ from __future__ import annotations
 import abc
 import asyncio
 import collections
+import concurrent.futures
 import contextlib
 import copy
 import datetime
 import functools
 import gettext
+import logging
+import os
 import threading
 import time
+import traceback
 import types
 import typing
 import uuid
@@ -44,6 +48,8 @@ from nion.utils import ThreadPool
 
 _ = gettext.gettext
 
+_T = typing.TypeVar("_T")
+
 Processing.init()
 
 
@@ -420,6 +426,12 @@ class UndeleteDisplayItem(Changes.UndeleteBase):
     def close(self) -> None:
         pass
 
+    def _get_spill_state(self) -> typing.Any:
+        return self.item_dict
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        self.item_dict = spill_state
+
     def undelete(self, document_model: DocumentModel) -> None:
         display_item = DisplayItem.DisplayItem()
         display_item.begin_reading()
@@ -621,6 +633,12 @@ class UndeleteItem(Changes.UndeleteBase):
             self.container_item_proxy.close()
             self.container_item_proxy = None
 
+    def _get_spill_state(self) -> typing.Any:
+        return self.item_dict
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        self.item_dict = spill_state
+
     def undelete(self, document_model: DocumentModel) -> None:
         container = typing.cast(Persistence.PersistentObject, self.container_item_proxy.item) if self.container_item_proxy else None
         container_properties = self.container_properties
@@ -715,6 +733,9 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
 
         self.__computation_thread_pool = ThreadPool.ThreadPool()
 
+        # writes lazy data to storage. each worker holds the data of one data item in memory.
+        self.__lazy_data_executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="lazy-data")
+
         self.__project = project
 
         self.uuid = self._project.uuid
@@ -852,6 +873,12 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
                 self.__pending_data_item_merge.close()
             self.__pending_data_item_merge = None
 
+        # finish writing lazy data while the project storage is open.
+        self.__lazy_data_executor.shutdown(wait=True)
+        self.__lazy_data_executor = typing.cast(typing.Any, None)
+        for data_item in self.__data_items:
+            self.__write_lazy_data(data_item)
+
         # r_vars
         MappedItemManager().unregister_document(self)
 
@@ -1091,6 +1118,20 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
         insert_item_order(uuid_order, index, data_item)
         self.__data_items = typing.cast(typing.List[DataItem.DataItem], restore_item_order(self._project, uuid_order))
 
+    def write_lazy_data(self, data_items: typing.Sequence[DataItem.DataItem]) -> None:
+        """Write the lazy data of the data items to storage on threads. See DataItem.set_lazy_xdata."""
+        for data_item in data_items:
+            if data_item.has_lazy_data:
+                self.__lazy_data_executor.submit(self.__write_lazy_data, data_item)
+
+    def __write_lazy_data(self, data_item: DataItem.DataItem) -> None:
+        try:
+            data_item.write_lazy_data()
+        except Exception as e:
+            # the data is read from its source again when used.
+            logging.debug(f"Could not write data of {data_item} / {e}")
+            traceback.print_exc()
+
     def remove_data_item(self, data_item: DataItem.DataItem, *, safe: bool = False) -> None:
         self.__cascade_delete(data_item, safe=safe).close()
 
@@ -1691,12 +1732,26 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
     def get_flat_data_group_generator(self) -> typing.Iterator[DataGroup.DataGroup]:
         return DataGroup.get_flat_data_group_generator_in_container(self)
 
-    def get_data_group_by_uuid(self, uuid: uuid.UUID) -> typing.Optional[DataGroup.DataGroup]:
-        for data_group in DataGroup.get_flat_data_group_generator_in_container(self):
-            if data_group.uuid == uuid:
-                return data_group
+    def __get_item_by_uuid(self, item_uuid: uuid.UUID, item_type: typing.Type[_T]) -> typing.Optional[_T]:
+        # items are registered with the persistent object context by uuid when inserted into the project and
+        # unregistered when removed, so the registry serves as a constant time index for all items in the project.
+        item = self.resolve_item_specifier(Persistence.PersistentObjectSpecifier(item_uuid))
+        if isinstance(item, item_type) and getattr(item, "project", None) == self._project:
+            return item
         return None
 
+    def get_data_group_by_uuid(self, uuid: uuid.UUID) -> typing.Optional[DataGroup.DataGroup]:
+        return self.__get_item_by_uuid(uuid, DataGroup.DataGroup)
+
+    def get_data_item_by_uuid(self, data_item_uuid: uuid.UUID) -> typing.Optional[DataItem.DataItem]:
+        return self.__get_item_by_uuid(data_item_uuid, DataItem.DataItem)
+
+    def get_display_item_by_uuid(self, display_item_uuid: uuid.UUID) -> typing.Optional[DisplayItem.DisplayItem]:
+        return self.__get_item_by_uuid(display_item_uuid, DisplayItem.DisplayItem)
+
+    def get_display_data_channel_by_uuid(self, display_data_channel_uuid: uuid.UUID) -> typing.Optional[DisplayItem.DisplayDataChannel]:
+        return self.__get_item_by_uuid(display_data_channel_uuid, DisplayItem.DisplayDataChannel)
+
     def get_display_items_for_data_item(self, data_item: typing.Optional[DataItem.DataItem]) -> typing.Set[DisplayItem.DisplayItem]:
         # return the set of display items for the data item
         display_items: typing.Set[DisplayItem.DisplayItem] = set()
@@ -1803,11 +1858,7 @@ class DocumentModel(Observable.Observable, ReferenceCounting.ReferenceCounted, D
         return DataStructure.get_object_specifier(object, object_type)
 
     def get_graphic_by_uuid(self, object_uuid: uuid.UUID) -> typing.Optional[Graphics.Graphic]:
-        for display_item in self.display_items:
-            for graphic in display_item.graphics:
-                if graphic.uuid == object_uuid:
-                    return graphic
-        return None
+        return self.__get_item_by_uuid(object_uuid, Graphics.Graphic)
 
     class DataItemReference:
         """A data item reference to coordinate data item access between acquisition and main thread.
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import abc
+import concurrent.futures
 import contextlib
 import copy
 import datetime
@@ -11,6 +12,7 @@ import numpy.typing
 import os.path
 import pathlib
 import shutil
+import sys
 import threading
 import typing
 import uuid
@@ -50,9 +52,12 @@ class ReaderInfo:
 class DataItemStorageAdapter:
     """Persistent storage for writing data item properties, relationships, and data to its storage handler."""
 
-    def __init__(self, storage_handler: StorageHandler.StorageHandler, properties: PersistentDictType) -> None:
+    def __init__(self, storage_handler: StorageHandler.StorageHandler, properties: PersistentDictType,
+                 written_data: typing.Optional[_NDArray] = None) -> None:
         self.__storage_handler = storage_handler
         self.__properties = properties
+        # data already written to the storage handler; the first update with the same data is skipped.
+        self.__written_data = written_data
 
     def close(self) -> None:
         if self.__storage_handler:
@@ -73,7 +78,8 @@ class DataItemStorageAdapter:
 
     def update_data(self, item: Persistence.PersistentObject, data: typing.Optional[_NDArray]) -> None:
         file_datetime = getattr(item, "created_local")
-        if data is not None:
+        written_data, self.__written_data = self.__written_data, None
+        if data is not None and data is not written_data:
             self.__storage_handler.write_data(data, file_datetime)
 
     def reserve_data(self, item: Persistence.PersistentObject, data_shape: typing.Tuple[int, ...], data_dtype: numpy.typing.DTypeLike) -> None:
@@ -85,10 +91,14 @@ class DataItemStorageAdapter:
 
 
 def migrate_to_latest(source_project_storage_system: ProjectStorageSystem,
-                      target_project_storage_system: typing.Optional[ProjectStorageSystem] = None) -> None:
+                      target_project_storage_system: typing.Optional[ProjectStorageSystem] = None, *,
+                      link_mode: str = "copy", max_workers: typing.Optional[int] = None) -> None:
     """Migrate the library data in source to target, upgrading them in the process.
 
     If target is None, then migration is done in place.
+
+    The link_mode determines how data files are transferred to the target; see copy_data_file. Reading properties and
+    transferring data files are done on up to max_workers threads.
     """
     library_properties = None
     data_item_uuids = set()
@@ -98,6 +108,35 @@ def migrate_to_latest(source_project_storage_system: ProjectStorageSystem,
 
     target_project_storage_system = target_project_storage_system or source_project_storage_system
 
+    def read_reader_info(storage_handler: StorageHandler.StorageHandler) -> typing.Optional[ReaderInfo]:
+        try:
+            large_format = source_project_storage_system._is_storage_handler_large_format(storage_handler)
+            storage_handler_properties = storage_handler.read_properties()
+            assert storage_handler_properties is not None
+            properties = Migration.transform_to_latest(storage_handler_properties)
+            return ReaderInfo(properties, [False], large_format, storage_handler, storage_handler.reference)
+        except Exception:
+            storage_handler.close()
+            logging.debug("Error reading %s", storage_handler.reference)
+            import traceback
+            traceback.print_exc()
+            traceback.print_stack()
+            return None
+        finally:
+            storage_handler.prepare_move()
+
+    def migrate_data_item(reader_info: ReaderInfo, index: int, count: int) -> typing.Optional[ReaderInfo]:
+        try:
+            return target_project_storage_system._migrate_data_item(reader_info, index, count, link_mode=link_mode)
+        except Exception:
+            logging.debug(f"Error reading {reader_info.storage_handler.reference}")
+            import traceback
+            traceback.print_exc()
+            traceback.print_stack()
+            return None
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="migration")
+
     # iterate through migration stages from newest to oldest, reading data items, updating them to the latest
     # version, and copying them to the new library. migration stages are the high level directories representing
     # different library versions up to 13. after version 13, files are stored in project files which have their own
@@ -111,23 +150,9 @@ def migrate_to_latest(source_project_storage_system: ProjectStorageSystem,
 
         # next, construct a list of ReaderInfo objects. ReaderInfo stores the properties portion of the data item,
         # whether it has been changed during migration, whether it is a large format file, its storage handler,
-        # and an identifier key. this loop skips files that cannot be read but prints an error message.
-        preliminary_reader_info_list: typing.List[ReaderInfo] = list()
-        for storage_handler in storage_handlers:
-            try:
-                large_format = source_project_storage_system._is_storage_handler_large_format(storage_handler)
-                storage_handler_properties = storage_handler.read_properties()
-                assert storage_handler_properties is not None
-                properties = Migration.transform_to_latest(storage_handler_properties)
-                reader_info = ReaderInfo(properties, [False], large_format, storage_handler, storage_handler.reference)
-                preliminary_reader_info_list.append(reader_info)
-            except Exception:
-                storage_handler.close()
-                logging.debug("Error reading %s", storage_handler.reference)
-                import traceback
-                traceback.print_exc()
-                traceback.print_stack()
-            storage_handler.prepare_move()
+        # and an identifier key. this loop skips files that cannot be read but prints an error message. the files
+        # are independent, so they are read in parallel; map keeps the original order.
+        preliminary_reader_info_list: typing.List[ReaderInfo] = [reader_info for reader_info in executor.map(read_reader_info, storage_handlers) if reader_info]
 
         # now read the library properties which contains the data item deletions. data item deletions exist to
         # facilitate switching between library versions. if the user deletes an item in a newer library, that item
@@ -153,30 +178,39 @@ def migrate_to_latest(source_project_storage_system: ProjectStorageSystem,
         # new location. if successful, mark the data item as having been added to the new library and add any
         # preliminary library updates to the library updates list to be applied later.
         count = len(preliminary_reader_info_list)
+        migrations: typing.List[typing.Tuple[uuid.UUID, concurrent.futures.Future[typing.Optional[ReaderInfo]]]] = list()
+        stage_data_item_uuids = set()
         for index, reader_info in enumerate(preliminary_reader_info_list):
             properties = reader_info.properties
             try:
                 version = properties.get("version", 0)
                 if version == DataItem.DataItem.writer_version:
                     data_item_uuid = uuid.UUID(properties["uuid"])
-                    if data_item_uuid not in data_item_uuids:
+                    if data_item_uuid not in data_item_uuids and data_item_uuid not in stage_data_item_uuids:
                         if not str(data_item_uuid) in deletions:
-                            new_reader_info = target_project_storage_system._migrate_data_item(reader_info, index, count)
-                            if new_reader_info:
-                                reader_info_list.append(new_reader_info)
-                                data_item_uuids.add(data_item_uuid)
-                                library_update = preliminary_library_updates.get(data_item_uuid)
-                                if library_update:
-                                    library_updates[data_item_uuid] = library_update
+                            stage_data_item_uuids.add(data_item_uuid)
+                            migrations.append((data_item_uuid, executor.submit(migrate_data_item, reader_info, index, count)))
             except Exception:
                 logging.debug(f"Error reading {reader_info.storage_handler.reference}")
                 import traceback
                 traceback.print_exc()
                 traceback.print_stack()
 
+        # collect the migrated data items in the original order.
+        for data_item_uuid, migration in migrations:
+            new_reader_info = migration.result()
+            if new_reader_info:
+                reader_info_list.append(new_reader_info)
+                data_item_uuids.add(data_item_uuid)
+                library_update = preliminary_library_updates.get(data_item_uuid)
+                if library_update:
+                    library_updates[data_item_uuid] = library_update
+
         for storage_handler in storage_handlers:
             storage_handler.close()
 
+    executor.shutdown()
+
     assert len(reader_info_list) == len(data_item_uuids)
 
     assert library_properties is not None
@@ -217,6 +251,45 @@ def migrate_to_latest(source_project_storage_system: ProjectStorageSystem,
     target_project_storage_system._migrate_library_properties(library_properties, reader_info_list)
 
 
+def get_migration_journal_path(project_path: pathlib.Path) -> pathlib.Path:
+    """Return the path of the journal recording progress of a migration into the project at project_path."""
+    return project_path.with_name(project_path.name + ".migration")
+
+
+def copy_data_file(source_path: pathlib.Path, target_path: pathlib.Path, link_mode: str = "copy") -> None:
+    """Transfer the data file at source_path to target_path for migration.
+
+    The link_mode may be "copy", "reflink", or "hardlink". A reflink shares the file contents copy-on-write and is
+    only available on some file systems (for instance Btrfs or XFS on Linux). A hard link shares the file itself; the
+    source file will see later changes to the target, so it is only suitable when the source library is discarded after
+    migration. If the link cannot be made, the file is copied.
+    """
+    if link_mode == "hardlink":
+        try:
+            os.link(source_path, target_path)
+            return
+        except OSError:
+            pass
+    if link_mode in ("reflink", "hardlink") and _reflink_file(source_path, target_path):
+        shutil.copystat(source_path, target_path)
+        return
+    shutil.copyfile(source_path, target_path)
+    shutil.copystat(source_path, target_path)
+
+
+def _reflink_file(source_path: pathlib.Path, target_path: pathlib.Path) -> bool:
+    if sys.platform.startswith("linux"):
+        import fcntl
+        FICLONE = 0x40049409
+        try:
+            with source_path.open("rb") as source_fp, target_path.open("wb") as target_fp:
+                fcntl.ioctl(target_fp.fileno(), FICLONE, source_fp.fileno())
+            return True
+        except OSError:
+            target_path.unlink(missing_ok=True)
+    return False
+
+
 class PersistentStorageSystem(Persistence.PersistentStorageInterface):
     """Abstract base class for persistent storage which implements the persistent storage interface.
 
@@ -440,11 +513,17 @@ class ProjectStorageSystem(PersistentStorageSystem):
     def __init__(self) -> None:
         super().__init__()
         self.__storage_adapter_map: typing.Dict[uuid.UUID, DataItemStorageAdapter] = dict()
+        self.__prepared_storage_map: typing.Dict[uuid.UUID, typing.Tuple[StorageHandler.StorageHandler, _NDArray]] = dict()
+        self.__prepared_storage_lock = threading.RLock()
 
     def close(self) -> None:
         for storage_adapter in self.__storage_adapter_map.values():
             storage_adapter.close()
         self.__storage_adapter_map.clear()
+        with self.__prepared_storage_lock:
+            data_item_uuids = list(self.__prepared_storage_map.keys())
+        for data_item_uuid in data_item_uuids:
+            self.__discard_prepared_storage(data_item_uuid)
 
     @abc.abstractmethod
     def _get_identifier(self) -> str: ...
@@ -461,7 +540,8 @@ class ProjectStorageSystem(PersistentStorageSystem):
     def _is_storage_handler_large_format(self, storage_handler: StorageHandler.StorageHandler) -> bool: ...
 
     @abc.abstractmethod
-    def _remove_storage_handler(self, storage_handler: StorageHandler.StorageHandler, *, safe: bool = False) -> None: ...
+    def _remove_storage_handler(self, storage_handler: StorageHandler.StorageHandler, *, safe: bool = False,
+                                properties: typing.Optional[PersistentDictType] = None) -> None: ...
 
     @abc.abstractmethod
     def _restore_item(self, data_item_uuid: uuid.UUID) -> typing.Optional[PersistentDictType]: ...
@@ -470,7 +550,7 @@ class ProjectStorageSystem(PersistentStorageSystem):
     def _prune(self) -> None: ...
 
     @abc.abstractmethod
-    def _migrate_data_item(self, reader_info: ReaderInfo, index: int, count: int) -> typing.Optional[ReaderInfo]: ...
+    def _migrate_data_item(self, reader_info: ReaderInfo, index: int, count: int, *, link_mode: str = "copy") -> typing.Optional[ReaderInfo]: ...
 
     @abc.abstractmethod
     def _migrate_library_properties(self, library_properties: PersistentDictType, reader_info_list: typing.List[ReaderInfo]) -> None: ...
@@ -487,6 +567,41 @@ class ProjectStorageSystem(PersistentStorageSystem):
     def get_identifier(self) -> str:
         return self._get_identifier()
 
+    def prepare_data_item_storage(self, data_item: DataItem.DataItem) -> None:
+        """Write the data and properties of a data item which is not inserted yet to its storage.
+
+        This may be called on a thread. When the data item is inserted, the prepared storage is used and the data is not
+        written again unless it has changed. Prepared storage which is not used by an insert must be discarded with
+        discard_data_item_storage.
+        """
+        data = data_item.data
+        if data is None:
+            return
+        storage_handler = self._make_storage_handler(data_item)
+        try:
+            file_datetime = data_item.created_local
+            storage_handler.write_data(data, file_datetime)
+            storage_handler.write_properties(Migration.transform_from_latest(copy.deepcopy(data_item.write_to_dict())), file_datetime)
+        except Exception:
+            storage_handler.remove()
+            storage_handler.close()
+            raise
+        with self.__prepared_storage_lock:
+            assert data_item.uuid not in self.__prepared_storage_map
+            self.__prepared_storage_map[data_item.uuid] = storage_handler, data
+
+    def discard_data_item_storage(self, data_item: DataItem.DataItem) -> None:
+        """Remove the storage prepared for the data item if it was not used by an insert."""
+        self.__discard_prepared_storage(data_item.uuid)
+
+    def __discard_prepared_storage(self, data_item_uuid: uuid.UUID) -> None:
+        with self.__prepared_storage_lock:
+            storage_handler_and_data = self.__prepared_storage_map.pop(data_item_uuid, None)
+        if storage_handler_and_data:
+            storage_handler = storage_handler_and_data[0]
+            self._remove_storage_handler(storage_handler)
+            storage_handler.close()
+
     @property
     def _data_properties_map(self) -> typing.Dict[uuid.UUID, DataItemStorageAdapter]:
         return self.__storage_adapter_map
@@ -574,10 +689,12 @@ class ProjectStorageSystem(PersistentStorageSystem):
     def _insert_item(self, parent: Persistence.PersistentObject, name: str, before_index: int, item: Persistence.PersistentObject) -> None:
         if isinstance(item, DataItem.DataItem):
             item_uuid = item.uuid
-            storage_handler = self._make_storage_handler(item)
+            with self.__prepared_storage_lock:
+                storage_handler_and_data = self.__prepared_storage_map.pop(item_uuid, None)
+            storage_handler, written_data = storage_handler_and_data or (self._make_storage_handler(item), None)
             assert item_uuid not in self.__storage_adapter_map
             assert item.persistent_dict is not None
-            storage_adapter = DataItemStorageAdapter(storage_handler, item.persistent_dict)
+            storage_adapter = DataItemStorageAdapter(storage_handler, item.persistent_dict, written_data)
             self.__storage_adapter_map[item_uuid] = storage_adapter
         else:
             super()._insert_item(parent, name, before_index, item)
@@ -588,7 +705,7 @@ class ProjectStorageSystem(PersistentStorageSystem):
             assert item.uuid in self.__storage_adapter_map
             storage = self.__storage_adapter_map.get(item.uuid)
             assert storage
-            self._remove_storage_handler(storage.storage_handler, safe=True)
+            self._remove_storage_handler(storage.storage_handler, safe=True, properties=storage.properties)
             self.__storage_adapter_map.pop(item.uuid).close()
         else:
             super()._remove_item(parent, name, index, item)
@@ -680,10 +797,18 @@ class FileProjectStorageSystem(ProjectStorageSystem):
 
     _file_handlers: typing.List[_CreateStorageHandlerFn] = [NDataHandler.NDataHandler, HDF5Handler.HDF5Handler]
 
+    _trash_manifest_name = "manifest.jsonl"
+
+    # items in the trash are deleted when the project is loaded once they are older than the retention period.
+    trash_retention_period = datetime.timedelta()
+
     def __init__(self, project_path: pathlib.Path, project_data_path: typing.Optional[pathlib.Path] = None) -> None:
         super().__init__()
         self.__project_path = project_path
         self.__project_data_path = project_data_path
+        self.__trash_manifest: typing.Optional[typing.Dict[str, PersistentDictType]] = None
+        self.__migrated_data_item_uuids: typing.Optional[typing.Set[str]] = None
+        self.__migration_journal_lock = threading.RLock()
 
     def load_properties(self) -> None:
         super().load_properties()
@@ -742,7 +867,8 @@ class FileProjectStorageSystem(ProjectStorageSystem):
     def _is_storage_handler_large_format(self, storage_handler: StorageHandler.StorageHandler) -> bool:
         return isinstance(storage_handler, HDF5Handler.HDF5Handler)
 
-    def _remove_storage_handler(self, storage_handler: StorageHandler.StorageHandler, *, safe: bool = False) -> None:
+    def _remove_storage_handler(self, storage_handler: StorageHandler.StorageHandler, *, safe: bool = False,
+                                properties: typing.Optional[PersistentDictType] = None) -> None:
         assert self.__project_data_path is not None
         file_path = pathlib.Path(storage_handler.reference)
         file_name = file_path.parts[-1]
@@ -753,57 +879,131 @@ class FileProjectStorageSystem(ProjectStorageSystem):
         if safe and not os.path.exists(new_file_path):
             trash_dir.mkdir(exist_ok=True)
             shutil.move(str(file_path), new_file_path)
+            if properties is not None and "uuid" in properties:
+                # record the file and its properties so restoring does not need to scan and read the trash.
+                self.__append_trash_manifest_entry({
+                    "uuid": properties["uuid"],
+                    "file_name": file_name,
+                    "trashed": datetime.datetime.utcnow().isoformat(),
+                    "properties": Utility.clean_dict(Migration.transform_from_latest(copy.deepcopy(properties))),
+                })
         storage_handler.remove()
 
     def _restore_item(self, data_item_uuid: uuid.UUID) -> typing.Optional[PersistentDictType]:
         assert self.__project_data_path is not None
         data_item_uuid_str = str(data_item_uuid)
         trash_dir = self.__project_data_path / "trash"
+        trash_entry = self.__get_trash_manifest().get(data_item_uuid_str)
+        if trash_entry:
+            file_path = trash_dir / trash_entry["file_name"]
+            file_handler = self.__get_file_handler_for_trashed_file(file_path)
+            if file_handler and file_path.exists():
+                properties = self.__restore_trashed_file(data_item_uuid, file_path, file_handler, trash_entry["properties"])
+                self.__append_trash_manifest_entry({"uuid": data_item_uuid_str})
+                return properties
+        # items trashed without a manifest entry are found by reading each file in the trash.
         storage_handlers = self.__find_storage_handlers(trash_dir, skip_trash=False)
         try:
             for storage_handler in storage_handlers:
                 storage_handler_properties = storage_handler.read_properties()
                 assert storage_handler_properties is not None
-                properties = Migration.transform_to_latest(storage_handler_properties)
-                if properties.get("uuid", None) == data_item_uuid_str:
-                    data_item = DataItem.DataItem(item_uuid=data_item_uuid)
-                    with contextlib.closing(data_item):
-                        data_item.begin_reading()
-                        data_item.read_from_dict(properties)
-                        data_item.finish_reading()
-                        old_file_path = storage_handler.reference
-                        new_file_path = storage_handler.make_path(self.__project_data_path / self.__get_base_path(data_item))
-                        if not os.path.exists(new_file_path):
-                            os.makedirs(os.path.dirname(new_file_path), exist_ok=True)
-                            shutil.move(old_file_path, new_file_path)
-                        self._make_storage_handler(data_item, file_handler=None).close()  # what's this line for?
-                        properties["__large_format"] = isinstance(storage_handler, HDF5Handler.HDF5Handler)
-                        return properties
+                if Migration.transform_to_latest(copy.deepcopy(storage_handler_properties)).get("uuid", None) == data_item_uuid_str:
+                    file_handler = HDF5Handler.HDF5Handler if isinstance(storage_handler, HDF5Handler.HDF5Handler) else NDataHandler.NDataHandler
+                    storage_handler.prepare_move()
+                    return self.__restore_trashed_file(data_item_uuid, pathlib.Path(storage_handler.reference), file_handler, storage_handler_properties)
         finally:
             for storage_handler in storage_handlers:
                 storage_handler.close()
         return None
 
+    def __restore_trashed_file(self, data_item_uuid: uuid.UUID, file_path: pathlib.Path, file_handler: _CreateStorageHandlerFn, file_properties: PersistentDictType) -> PersistentDictType:
+        assert self.__project_data_path is not None
+        properties = Migration.transform_to_latest(copy.deepcopy(file_properties))
+        data_item = DataItem.DataItem(item_uuid=data_item_uuid)
+        with contextlib.closing(data_item):
+            data_item.begin_reading()
+            data_item.read_from_dict(properties)
+            data_item.finish_reading()
+            new_file_path = file_handler.make_path(self.__project_data_path / self.__get_base_path(data_item))
+            if not os.path.exists(new_file_path):
+                os.makedirs(os.path.dirname(new_file_path), exist_ok=True)
+                shutil.move(str(file_path), new_file_path)
+            self._make_storage_handler(data_item, file_handler=None).close()  # what's this line for?
+        properties["__large_format"] = file_handler == HDF5Handler.HDF5Handler
+        return properties
+
     def _prune(self) -> None:
         if self.__project_data_path:
             trash_dir = self.__project_data_path / "trash"
+            # items in the manifest are kept for the trash retention period. the file date is not a reliable way of
+            # determining the age since a user may trash an old file, so files without a manifest entry are deleted.
+            retained_entries: typing.Dict[str, PersistentDictType] = dict()
+            if self.trash_retention_period:
+                oldest_retained = datetime.datetime.utcnow() - self.trash_retention_period
+                for data_item_uuid_str, trash_entry in self.__get_trash_manifest().items():
+                    if datetime.datetime.fromisoformat(trash_entry["trashed"]) >= oldest_retained:
+                        retained_entries[data_item_uuid_str] = trash_entry
+            retained_file_names = {trash_entry["file_name"] for trash_entry in retained_entries.values()}
             for file_path in trash_dir.rglob("*"):
-                # the date is not a reliable way of determining the age since a user may trash an old file. for now,
-                # we just delete anything in the trash at startup. future version may have an index file for
-                # tracking items in the trash. when items are again retained in the trash, update the disabled
-                # test_delete_and_undelete_from_file_storage_system_restores_data_item_after_reload
-                file_path.unlink()
+                if file_path.name != self._trash_manifest_name and file_path.name not in retained_file_names:
+                    file_path.unlink()
+            # rewrite the manifest without the pruned or restored entries.
+            manifest_path = trash_dir / self._trash_manifest_name
+            if retained_entries:
+                with Utility.AtomicFileWriter(manifest_path) as fp:
+                    for trash_entry in retained_entries.values():
+                        fp.write(json.dumps(trash_entry) + "\n")
+            elif manifest_path.exists():
+                manifest_path.unlink()
+            self.__trash_manifest = retained_entries
+
+    def __get_trash_manifest(self) -> typing.Dict[str, PersistentDictType]:
+        # the manifest is an append-only file of json lines. a line with a file name records an item moved to the
+        # trash; a line without a file name records an item restored from the trash.
+        if self.__trash_manifest is None:
+            trash_manifest: typing.Dict[str, PersistentDictType] = dict()
+            manifest_path = self._trash_dir / self._trash_manifest_name
+            if manifest_path.exists():
+                with manifest_path.open("r") as fp:
+                    for line in fp:
+                        try:
+                            trash_entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # a partially written line; the item will be found by scanning the trash.
+                        if trash_entry.get("file_name"):
+                            trash_manifest[trash_entry["uuid"]] = trash_entry
+                        else:
+                            trash_manifest.pop(trash_entry.get("uuid"), None)
+            self.__trash_manifest = trash_manifest
+        return self.__trash_manifest
+
+    def __append_trash_manifest_entry(self, trash_entry: PersistentDictType) -> None:
+        trash_manifest = self.__get_trash_manifest()
+        with (self._trash_dir / self._trash_manifest_name).open("a") as fp:
+            fp.write(json.dumps(trash_entry) + "\n")
+        if trash_entry.get("file_name"):
+            trash_manifest[trash_entry["uuid"]] = trash_entry
+        else:
+            trash_manifest.pop(trash_entry["uuid"], None)
+
+    def __get_file_handler_for_trashed_file(self, file_path: pathlib.Path) -> typing.Optional[_CreateStorageHandlerFn]:
+        # match by extension; the manifest records the properties so the file does not need to be opened.
+        for file_handler in self._file_handlers:
+            if file_handler.make_path(file_path) == str(file_path):
+                return file_handler
+        return None
 
     @property
     def _trash_dir(self) -> pathlib.Path:
         assert self.__project_data_path is not None
         return self.__project_data_path / "trash"
 
-    def _migrate_data_item(self, reader_info: ReaderInfo, index: int, count: int) -> typing.Optional[ReaderInfo]:
+    def _migrate_data_item(self, reader_info: ReaderInfo, index: int, count: int, *, link_mode: str = "copy") -> typing.Optional[ReaderInfo]:
         storage_handler = reader_info.storage_handler
         properties = reader_info.properties
         properties = Utility.clean_dict(copy.deepcopy(properties) if properties else dict())
         data_item_uuid = uuid.UUID(typing.cast(str, properties["uuid"]))
+        migrated_data_item_uuids = self.__get_migrated_data_item_uuids()
         old_data_item = DataItem.DataItem(item_uuid=data_item_uuid)
         with contextlib.closing(old_data_item):
             old_data_item.begin_reading()
@@ -816,12 +1016,16 @@ class FileProjectStorageSystem(ProjectStorageSystem):
             # this ensures that the storage handler (file format) is the same as before.
             with contextlib.closing(self._make_storage_handler(old_data_item, file_handler)) as target_storage_handler:
                 if target_storage_handler and storage_handler.reference != target_storage_handler.reference:
-                    os.makedirs(os.path.dirname(target_storage_handler.reference), exist_ok=True)
                     target_storage_handler.prepare_move()
-                    shutil.copyfile(storage_handler.reference, target_storage_handler.reference)
-                    shutil.copystat(storage_handler.reference, target_storage_handler.reference)
-                    target_storage_handler.write_properties(Migration.transform_from_latest(copy.deepcopy(properties)), datetime.datetime.now())
-                    logging.getLogger("migration").info(f"Copying data item ({index + 1}/{count}) {data_item_uuid} to new library.")
+                    if str(data_item_uuid) in migrated_data_item_uuids and os.path.exists(target_storage_handler.reference):
+                        # an earlier, interrupted migration already transferred this data item.
+                        logging.getLogger("migration").info(f"Skipping data item ({index + 1}/{count}) {data_item_uuid} already in new library.")
+                    else:
+                        os.makedirs(os.path.dirname(target_storage_handler.reference), exist_ok=True)
+                        copy_data_file(pathlib.Path(storage_handler.reference), pathlib.Path(target_storage_handler.reference), link_mode)
+                        target_storage_handler.write_properties(Migration.transform_from_latest(copy.deepcopy(properties)), datetime.datetime.now())
+                        self.__append_migrated_data_item_uuid(str(data_item_uuid))
+                        logging.getLogger("migration").info(f"Copying data item ({index + 1}/{count}) {data_item_uuid} to new library.")
                     return ReaderInfo(properties, [False], self._is_storage_handler_large_format(target_storage_handler),
                                       target_storage_handler, target_storage_handler.reference)
             logging.getLogger("migration").warning(f"Unable to copy data item {data_item_uuid} to new library.")
@@ -842,6 +1046,29 @@ class FileProjectStorageSystem(ProjectStorageSystem):
                 # TODO: storage handler open/close is bad design.
                 reader_info.storage_handler.write_properties(reader_info.properties, file_datetime)
                 reader_info.storage_handler.prepare_move()
+        # the migration is complete; it no longer needs to be resumed.
+        migration_journal_path = get_migration_journal_path(self.__project_path)
+        if migration_journal_path.exists():
+            migration_journal_path.unlink()
+        self.__migrated_data_item_uuids = None
+
+    def __get_migrated_data_item_uuids(self) -> typing.Set[str]:
+        # the journal lists the data items transferred by a migration which has not finished, one uuid per line.
+        with self.__migration_journal_lock:
+            if self.__migrated_data_item_uuids is None:
+                migration_journal_path = get_migration_journal_path(self.__project_path)
+                if migration_journal_path.exists():
+                    self.__migrated_data_item_uuids = set(migration_journal_path.read_text().split())
+                else:
+                    self.__migrated_data_item_uuids = set()
+            return self.__migrated_data_item_uuids
+
+    def __append_migrated_data_item_uuid(self, data_item_uuid_str: str) -> None:
+        with self.__migration_journal_lock:
+            with get_migration_journal_path(self.__project_path).open("a") as fp:
+                fp.write(data_item_uuid_str + "\n")
+            if self.__migrated_data_item_uuids is not None:
+                self.__migrated_data_item_uuids.add(data_item_uuid_str)
 
     @staticmethod
     def _get_migration_paths(library_path: pathlib.Path) -> typing.List[typing.Tuple[pathlib.Path, pathlib.Path]]:
@@ -1016,7 +1243,8 @@ class MemoryProjectStorageSystem(ProjectStorageSystem):
     def _is_storage_handler_large_format(self, storage_handler: StorageHandler.StorageHandler) -> bool:
         return False
 
-    def _remove_storage_handler(self, storage_handler: StorageHandler.StorageHandler, *, safe: bool = False) -> None:
+    def _remove_storage_handler(self, storage_handler: StorageHandler.StorageHandler, *, safe: bool = False,
+                                properties: typing.Optional[PersistentDictType] = None) -> None:
         storage_handler_reference = storage_handler.reference
         data = self.__data_map.pop(storage_handler_reference, None)
         properties = self.__data_properties_map.pop(storage_handler_reference)
@@ -1040,7 +1268,7 @@ class MemoryProjectStorageSystem(ProjectStorageSystem):
     def _prune(self) -> None:
         pass  # disabled for testing self.__trash_map = dict()
 
-    def _migrate_data_item(self, reader_info: ReaderInfo, index: int, count: int) -> typing.Optional[ReaderInfo]:
+    def _migrate_data_item(self, reader_info: ReaderInfo, index: int, count: int, *, link_mode: str = "copy") -> typing.Optional[ReaderInfo]:
         storage_handler = reader_info.storage_handler
         properties = reader_info.properties
         properties = Utility.clean_dict(copy.deepcopy(properties) if properties else dict())
@@ -597,6 +597,32 @@ def test_rectangle(p: Geometry.FloatPoint, radius: float, center: Geometry.Float
     return None, False
 
 
+def get_points_hit_bounds(points: typing.Sequence[Geometry.FloatPoint], radius: float) -> Geometry.FloatRect:
+    # return the bounds of the points extended by the radius plus a pixel so that the bounds contain any point that
+    # tests as close to one of the points.
+    top = min(p.y for p in points) - radius - 1
+    left = min(p.x for p in points) - radius - 1
+    bottom = max(p.y for p in points) + radius + 1
+    right = max(p.x for p in points) + radius + 1
+    return Geometry.FloatRect.from_tlbr(top, left, bottom, right)
+
+
+def get_rectangle_hit_bounds(radius: float, center: Geometry.FloatPoint, size: Geometry.FloatSize, rotation: float) -> Geometry.FloatRect:
+    # return the bounds containing any point for which test_rectangle returns a part.
+    rect_widget = Geometry.FloatRect.from_center_and_size(center, size)
+    top_middle = Geometry.FloatPoint(y=rect_widget.top, x=rect_widget.center.x)
+    points = [rect_widget.top_left, rect_widget.top_right, rect_widget.bottom_right, rect_widget.bottom_left]
+    if rotation:
+        points = [rotate(p, center, rotation) for p in points]
+        top_middle = rotate(top_middle, center, rotation)
+    points.append(extend_line(center, top_middle, 14))
+    return get_points_hit_bounds(points, radius)
+
+
+# the extent of hit bounds in a direction in which a graphic is not limited, such as the height of an interval.
+UNLIMITED_HIT_EXTENT = 1.0E9
+
+
 class NullModifiers(ModifiersLike):
     @property
     def alt(self) -> bool:
@@ -630,6 +656,8 @@ class Graphic(Persistence.PersistentObject):
         self.label_font = "normal 11px serif"
         self.__source_reference = self.create_item_reference()
         self._default_stroke_color = "#F80"
+        self.__change_count = 0
+        self.__mask_cache: typing.Dict[typing.Tuple[typing.Any, ...], DataAndMetadata._ImageDataType] = dict()
 
     @property
     def source_specifier(self) -> typing.Optional[Persistence._SpecifierType]:
@@ -766,6 +794,20 @@ class Graphic(Persistence.PersistentObject):
     def _property_changed(self, name: str, value: typing.Any) -> None:
         self.notify_property_changed(name)
 
+    @property
+    def change_count(self) -> int:
+        """Return a count that increases whenever a property of the graphic changes.
+
+        Unlike modified_count, the count is increased before listeners are notified, so listeners can use it to
+        detect changes cheaply.
+        """
+        return self.__change_count
+
+    # override to count changes before the property changed listeners are notified.
+    def _set_persistent_property_value(self, name: str, value: typing.Any) -> None:
+        self.__change_count += 1
+        super()._set_persistent_property_value(name, value)
+
     @property
     def used_role(self) -> typing.Optional[str]:
         return self.role
@@ -815,9 +857,44 @@ class Graphic(Persistence.PersistentObject):
     def test(self, mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings, p: Geometry.FloatPoint, move_only: bool) -> typing.Tuple[typing.Optional[str], bool]:
         raise NotImplementedError()
 
+    def get_hit_bounds(self, mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings) -> typing.Optional[Geometry.FloatRect]:
+        """Return the bounds in widget coordinates outside of which test never returns a part.
+
+        Return None if the graphic may be hit anywhere.
+        """
+        shape_bounds = self._get_shape_hit_bounds(mapping, ui_settings)
+        if shape_bounds and self.label:
+            label_bounds = self._get_label_bounds(ui_settings, mapping)
+            if label_bounds:
+                return shape_bounds.union(label_bounds)
+        return shape_bounds
+
+    def _get_shape_hit_bounds(self, mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings) -> typing.Optional[Geometry.FloatRect]:
+        # subclasses may return the bounds of the shape, not including the label, within which test may hit.
+        return None
+
     def get_mask(self, data_shape: DataAndMetadata.ShapeType, calibrated_origin: typing.Optional[Geometry.FloatPoint] = None) -> DataAndMetadata._ImageDataType:
         return numpy.zeros(data_shape)
 
+    def get_cached_mask(self, data_shape: DataAndMetadata.ShapeType, calibrated_origin: typing.Optional[Geometry.FloatPoint] = None) -> DataAndMetadata._ImageDataType:
+        """Return the mask from get_mask, reusing the mask already calculated for the same geometry and data shape.
+
+        The mask is shared by all callers, so it is returned read only. Thread safe.
+        """
+        # the change count is part of the key so that a mask calculated while the graphic changes is never reused.
+        change_count = self.change_count
+        key = (change_count, tuple(data_shape), calibrated_origin.as_tuple() if calibrated_origin else None)
+        mask = self.__mask_cache.get(key)
+        if mask is None:
+            mask = numpy.asarray(self.get_mask(data_shape, calibrated_origin))
+            mask.flags.writeable = False
+            # keep the few most recent masks for the current geometry. replace the dict rather than modifying it so
+            # that readers on other threads see either the old or the new dict.
+            mask_cache = {k: v for k, v in self.__mask_cache.items() if k[0] == change_count}
+            mask_cache[key] = mask
+            self.__mask_cache = dict(list(mask_cache.items())[-4:])
+        return mask
+
     def begin_drag(self) -> DragPartData:
         raise NotImplementedError()
 
@@ -833,15 +910,20 @@ class Graphic(Persistence.PersistentObject):
     def label_position(self, mapping: CoordinateMappingLike, font_metrics: UISettings.FontMetrics, padding: float) -> typing.Optional[Geometry.FloatPoint]:
         return None
 
-    def test_label(self, ui_settings: UISettings.UISettings, mapping: CoordinateMappingLike, test_point: Geometry.FloatPoint) -> bool:
+    def _get_label_bounds(self, ui_settings: UISettings.UISettings, mapping: CoordinateMappingLike) -> typing.Optional[Geometry.FloatRect]:
         if self.label:
             padding = self.label_padding
             font = self.label_font
             font_metrics = ui_settings.get_font_metrics(font, self.label)
             text_pos = self.label_position(mapping, font_metrics, padding)
             if text_pos is not None:
-                bounds = Geometry.FloatRect.from_center_and_size(text_pos, Geometry.FloatSize(width=font_metrics.width + padding * 2, height=font_metrics.height + padding * 2))
-                return test_inside_bounds(bounds, test_point, ui_settings.cursor_tolerance)
+                return Geometry.FloatRect.from_center_and_size(text_pos, Geometry.FloatSize(width=font_metrics.width + padding * 2, height=font_metrics.height + padding * 2))
+        return None
+
+    def test_label(self, ui_settings: UISettings.UISettings, mapping: CoordinateMappingLike, test_point: Geometry.FloatPoint) -> bool:
+        bounds = self._get_label_bounds(ui_settings, mapping)
+        if bounds:
+            return test_inside_bounds(bounds, test_point, ui_settings.cursor_tolerance)
         return False
 
     def draw_label(self, ctx: DrawingContextLike, ui_settings: UISettings.UISettings, mapping: CoordinateMappingLike) -> None:
@@ -1054,6 +1136,12 @@ class RectangleTypeGraphic(Graphic):
         # didn't find anything
         return None, False
 
+    def _get_shape_hit_bounds(self, mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings) -> typing.Optional[Geometry.FloatRect]:
+        bounds = Geometry.FloatRect.make(self.bounds)
+        center = mapping.map_point_image_norm_to_widget(bounds.center)
+        size = mapping.map_size_image_norm_to_widget(bounds.size)
+        return get_rectangle_hit_bounds(ui_settings.cursor_tolerance, center, size, self.rotation)
+
     def begin_drag(self) -> DragPartData:
         return (self.bounds, self.rotation)
 
@@ -1385,6 +1473,11 @@ class LineTypeGraphic(Graphic):
         # didn't find anything
         return None, False
 
+    def _get_shape_hit_bounds(self, mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings) -> typing.Optional[Geometry.FloatRect]:
+        p1 = mapping.map_point_image_norm_to_widget(self.start)
+        p2 = mapping.map_point_image_norm_to_widget(self.end)
+        return get_points_hit_bounds([p1, p2], ui_settings.cursor_tolerance)
+
     def begin_drag(self) -> DragPartData:
         return (self.start, self.end)
 
@@ -1631,6 +1724,11 @@ class PointTypeGraphic(Graphic):
         # didn't find anything
         return None, False
 
+    def _get_shape_hit_bounds(self, mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings) -> typing.Optional[Geometry.FloatRect]:
+        cross_hair_size = 12
+        pos = mapping.map_point_image_norm_to_widget(self.position)
+        return Geometry.FloatRect.from_center_and_size(pos, Geometry.FloatSize(width=cross_hair_size * 2 + 2, height=cross_hair_size * 2 + 2))
+
     def begin_drag(self) -> DragPartData:
         return (self.position,)
 
@@ -1798,6 +1896,14 @@ class IntervalGraphic(Graphic):
         # didn't find anything
         return None, False
 
+    def _get_shape_hit_bounds(self, mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings) -> typing.Optional[Geometry.FloatRect]:
+        # intervals are not limited vertically.
+        p1 = mapping.map_point_channel_norm_to_widget(self.start)
+        p2 = mapping.map_point_channel_norm_to_widget(self.end)
+        left = min(p1, p2) - ui_settings.cursor_tolerance - 1
+        right = max(p1, p2) + ui_settings.cursor_tolerance + 1
+        return Geometry.FloatRect.from_tlbr(-UNLIMITED_HIT_EXTENT, left, UNLIMITED_HIT_EXTENT, right)
+
     def begin_drag(self) -> DragPartData:
         return (self.start, self.end)
 
@@ -1861,6 +1967,13 @@ class ChannelGraphic(Graphic):
         # didn't find anything
         return None, False
 
+    def _get_shape_hit_bounds(self, mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings) -> typing.Optional[Geometry.FloatRect]:
+        # channels are not limited vertically.
+        pos = mapping.map_point_channel_norm_to_widget(self.position)
+        left = pos - ui_settings.cursor_tolerance - 1
+        right = pos + ui_settings.cursor_tolerance + 1
+        return Geometry.FloatRect.from_tlbr(-UNLIMITED_HIT_EXTENT, left, UNLIMITED_HIT_EXTENT, right)
+
     def begin_drag(self) -> DragPartData:
         return (self.position,)
 
@@ -2023,6 +2136,16 @@ class SpotGraphic(Graphic):
         # didn't find anything
         return None, False
 
+    def _get_shape_hit_bounds(self, mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings) -> typing.Optional[Geometry.FloatRect]:
+        # the spot is mirrored through the calibrated origin.
+        rotation = self.rotation
+        bounds = Geometry.FloatRect.make(self.bounds)
+        origin = mapping.calibrated_origin_widget
+        offset = mapping.map_size_image_norm_to_widget(bounds.center.as_size())
+        size = mapping.map_size_image_norm_to_widget(bounds.size)
+        hit_bounds = get_rectangle_hit_bounds(ui_settings.cursor_tolerance, origin + offset, size, rotation)
+        return hit_bounds.union(get_rectangle_hit_bounds(ui_settings.cursor_tolerance, origin - offset, size, rotation))
+
     def begin_drag(self) -> DragPartData:
         return (self.bounds, self.rotation)
 
@@ -2875,6 +2998,78 @@ class LatticeGraphic(Graphic):
         return Geometry.FloatPoint(y=p1.y, x=p1.x)
 
 
+class GraphicHitIndex:
+    """Index the hit bounds of graphics in widget coordinates for hit testing.
+
+    The bounds of each graphic are stored in a uniform grid of cells covering the widget area. The candidates for a
+    point are the graphics whose bounds are in the cell containing the point, plus any graphics without bounds, so hit
+    testing only needs to test the graphics near the point.
+
+    Call update before querying. The index is only rebuilt when the graphics, their change counts, the mapping key,
+    or the area changes. Callers pass a mapping key that changes whenever the mapping changes.
+    """
+
+    cell_size = 64
+
+    # graphics covering more cells than this are tested for every point rather than stored in each cell.
+    max_cell_count = 256
+
+    def __init__(self) -> None:
+        self.__key: typing.Any = None
+        self.__graphic_count = 0
+        self.__area = Geometry.FloatRect.empty_rect()
+        self.__cells: typing.Dict[typing.Tuple[int, int], typing.List[int]] = dict()
+        self.__unbounded_indexes: typing.List[int] = list()
+        self.__hit_bounds: typing.List[typing.Optional[Geometry.FloatRect]] = list()
+
+    def update(self, graphics: typing.Sequence[Graphic], mapping: CoordinateMappingLike, ui_settings: UISettings.UISettings, mapping_key: typing.Any, area: Geometry.FloatRect) -> None:
+        key = ([(graphic, graphic.change_count) for graphic in graphics], mapping_key, area, ui_settings.cursor_tolerance)
+        if key == self.__key:
+            return
+        self.__key = key
+        self.__graphic_count = len(graphics)
+        self.__area = area
+        self.__cells = dict()
+        self.__unbounded_indexes = list()
+        self.__hit_bounds = list()
+        cell_size = self.cell_size
+        for graphic_index, graphic in enumerate(graphics):
+            try:
+                hit_bounds = graphic.get_hit_bounds(mapping, ui_settings)
+            except Exception:
+                # let hit testing report the error.
+                hit_bounds = None
+            self.__hit_bounds.append(hit_bounds)
+            if hit_bounds is None:
+                self.__unbounded_indexes.append(graphic_index)
+                continue
+            top = max(hit_bounds.top, area.top)
+            left = max(hit_bounds.left, area.left)
+            bottom = min(hit_bounds.bottom, area.bottom)
+            right = min(hit_bounds.right, area.right)
+            if top > bottom or left > right:
+                continue  # outside of the area; only found when testing points outside of the area.
+            row_range = range(int((top - area.top) // cell_size), int((bottom - area.top) // cell_size) + 1)
+            column_range = range(int((left - area.left) // cell_size), int((right - area.left) // cell_size) + 1)
+            if len(row_range) * len(column_range) > self.max_cell_count:
+                self.__unbounded_indexes.append(graphic_index)
+                continue
+            for row in row_range:
+                for column in column_range:
+                    self.__cells.setdefault((row, column), list()).append(graphic_index)
+
+    def get_candidate_indexes(self, p: Geometry.FloatPoint) -> typing.Sequence[int]:
+        """Return the sorted indexes of the graphics which may be hit at the point p."""
+        area = self.__area
+        if not (area.top <= p.y <= area.bottom and area.left <= p.x <= area.right):
+            return range(self.__graphic_count)
+        cell_size = self.cell_size
+        cell_indexes = self.__cells.get((int((p.y - area.top) // cell_size), int((p.x - area.left) // cell_size)), list())
+        hit_bounds = self.__hit_bounds
+        candidate_indexes = [graphic_index for graphic_index in cell_indexes if typing.cast(Geometry.FloatRect, hit_bounds[graphic_index]).contains_point(p)]
+        return sorted(candidate_indexes + self.__unbounded_indexes)
+
+
 def factory(lookup_id: typing.Callable[[str], str]) -> Graphic:
     build_map: typing.Dict[str, typing.Callable[[], Graphic]] = {
         "line-graphic": LineGraphic,
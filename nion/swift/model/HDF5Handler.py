@@ -17,6 +17,7 @@ import numpy
 import numpy.typing
 
 from nion.swift.model import StorageHandler
+from nion.swift.model import Tracing
 from nion.swift.model import Utility
 from nion.utils import Geometry
 
@@ -163,6 +164,7 @@ class HDF5Handler(StorageHandler.StorageHandler):
                 else:
                     self.__dataset = self.__fp.create_dataset("data", data=numpy.empty((0,)))
 
+    @Tracing.traced("storage")
     def write_data(self, data: _NDArray, file_datetime: datetime.datetime) -> None:
         with self.__lock:
             assert data is not None
@@ -224,6 +226,7 @@ class HDF5Handler(StorageHandler.StorageHandler):
             self.__dataset[:] = data
             self._write_count += 1
 
+    @Tracing.traced("storage")
     def write_properties(self, properties: PersistentDictType, file_datetime: datetime.datetime) -> None:
         with self.__lock:
             self.__ensure_open()
@@ -231,6 +234,7 @@ class HDF5Handler(StorageHandler.StorageHandler):
             self.__write_properties_to_dataset(properties)
             self.__fp.flush()
 
+    @Tracing.traced("storage")
     def read_properties(self) -> PersistentDictType:
         with self.__lock:
             self.__ensure_open()
@@ -238,6 +242,7 @@ class HDF5Handler(StorageHandler.StorageHandler):
             json_properties = self.__dataset.attrs.get("properties", "")
             return typing.cast(PersistentDictType, json.loads(json_properties))
 
+    @Tracing.traced("storage")
     def read_data(self) -> typing.Optional[_NDArray]:
         with self.__lock:
             self.__ensure_open()
@@ -1,14 +1,22 @@
 # standard libraries
+import asyncio
+import concurrent.futures
 import copy
 import datetime
+import functools
 import io
 import json
+import logging
 import os
 import pathlib
+import queue
+import struct
+import threading
+import traceback
 import typing
 import uuid
+import warnings
 import zipfile
-import itertools
 
 # third party libraries
 import imageio
@@ -21,6 +29,7 @@ from nion.data import Image
 from nion.swift.model import DataItem
 from nion.swift.model import DisplayItem
 from nion.swift.model import Utility
+from nion.utils import Event
 
 
 DataElementType = typing.Dict[str, typing.Any]
@@ -59,9 +68,9 @@ class ImportExportHandler:
 
     def _read_data_items(self, extension: str, file_path: pathlib.Path) -> typing.Sequence[DataItem.DataItem]:
         data_items = list()
-        data_elements = self.read_data_elements(extension, file_path)
+        data_elements = self.read_lazy_data_elements(extension, file_path)
         for data_element in data_elements:
-            if "data" in data_element:
+            if "data" in data_element or "data_fn" in data_element:
                 if not "title" in data_element:
                     title = file_path.stem
                     data_element["title"] = title
@@ -74,6 +83,15 @@ class ImportExportHandler:
     def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.Sequence[DataElementType]:
         return list()
 
+    def read_lazy_data_elements(self, extension: str, path: pathlib.Path) -> typing.Sequence[DataElementType]:
+        """Return data elements which may defer reading their data.
+
+        A lazy data element has a data_shape_and_dtype tuple and a data_fn function reading the data from the path in
+        place of data. Data items created from it read the data when it is used. data_fn may be called on any thread and
+        more than once. This default implementation reads the data with read_data_elements.
+        """
+        return self.read_data_elements(extension, path)
+
     def can_write(self, data_metadata: DataAndMetadata.DataMetadata, extension: str) -> bool:
         return False
 
@@ -85,10 +103,84 @@ class ImportExportHandler:
             if data is not None:
                 self.write_data(data, extension, f)
 
+    def prepare_write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> typing.Optional[typing.Callable[[], None]]:
+        """Snapshot the display item for writing and return a function to write the snapshot to the path.
+
+        Used by ExportJob to write on a worker thread; write_display_item writes directly without a snapshot. The
+        returned function must not access the display item. Handlers that cannot separate the snapshot from the writing
+        write the display item immediately, on the calling thread, and return None, which is what this default
+        implementation does.
+        """
+        self.write_display_item(display_item, path, extension)
+        return None
+
     def write_data(self, data: _DataArrayType, extension: str, file: typing.BinaryIO) -> None:
         pass
 
 
+class LazyImportExportHandler(ImportExportHandler):
+    """A placeholder for an import/export handler which is registered by calling load_fn when it is first used.
+
+    Once loaded, the placeholder unregisters itself and forwards to the loaded handler with the same io_handler_id.
+    """
+
+    def __init__(self, load_fn: typing.Callable[[], typing.Any], io_handler_id: str, name: str,
+                 extensions: typing.Sequence[str], *, can_write: bool = True,
+                 supports_composite_data: bool = False) -> None:
+        super().__init__(io_handler_id, name, extensions)
+        self.supports_composite_data = supports_composite_data
+        self.__load_fn = load_fn
+        self.__can_write = can_write
+        self.__io_handler: typing.Optional[ImportExportHandler] = None
+        self.__is_loaded = False
+        self.__lock = threading.RLock()
+
+    def __get_io_handler(self) -> typing.Optional[ImportExportHandler]:
+        with self.__lock:
+            if not self.__is_loaded:
+                self.__is_loaded = True
+                self.__load_fn()
+                import_export_manager = ImportExportManager()
+                self.__io_handler = import_export_manager.get_io_handler_by_id(self.io_handler_id)
+                if self.__io_handler:
+                    import_export_manager.unregister_io_handler(self)
+                else:
+                    logging.warning("I/O handler '%s' was not registered when loaded.", self.io_handler_id)
+            return self.__io_handler
+
+    def read_data_items(self, extension: str, file_path: pathlib.Path) -> typing.Sequence[DataItem.DataItem]:
+        io_handler = self.__get_io_handler()
+        return io_handler.read_data_items(extension, file_path) if io_handler else list()
+
+    def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.Sequence[DataElementType]:
+        io_handler = self.__get_io_handler()
+        return io_handler.read_data_elements(extension, path) if io_handler else list()
+
+    def read_lazy_data_elements(self, extension: str, path: pathlib.Path) -> typing.Sequence[DataElementType]:
+        io_handler = self.__get_io_handler()
+        return io_handler.read_lazy_data_elements(extension, path) if io_handler else list()
+
+    def can_write(self, data_metadata: DataAndMetadata.DataMetadata, extension: str) -> bool:
+        if not self.__can_write:
+            return False
+        io_handler = self.__get_io_handler()
+        return io_handler.can_write(data_metadata, extension) if io_handler else False
+
+    def write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> None:
+        io_handler = self.__get_io_handler()
+        if io_handler:
+            io_handler.write_display_item(display_item, path, extension)
+
+    def prepare_write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> typing.Optional[typing.Callable[[], None]]:
+        io_handler = self.__get_io_handler()
+        return io_handler.prepare_write_display_item(display_item, path, extension) if io_handler else None
+
+    def write_data(self, data: _DataArrayType, extension: str, file: typing.BinaryIO) -> None:
+        io_handler = self.__get_io_handler()
+        if io_handler:
+            io_handler.write_data(data, extension, file)
+
+
 class ImportExportManager(metaclass=Utility.Singleton):
     """
         Tracks import/export plugins.
@@ -124,6 +216,13 @@ class ImportExportManager(metaclass=Utility.Singleton):
                 return io_handler
         return None
 
+    def get_io_handler_by_id(self, io_handler_id: str) -> typing.Optional[ImportExportHandler]:
+        """Return the handler with io_handler_id, skipping placeholders for handlers which are not loaded yet."""
+        for io_handler in self.__io_handlers:
+            if io_handler.io_handler_id == io_handler_id and not isinstance(io_handler, LazyImportExportHandler):
+                return io_handler
+        return None
+
     def get_writers_for_data_item(self, data_item: DataItem.DataItem) -> typing.Sequence[ImportExportHandler]:
         writers = []
         data_metadata = data_item.data_metadata
@@ -167,13 +266,25 @@ class ImportExportManager(metaclass=Utility.Singleton):
         return list()
 
     def write_display_item_with_writer(self, writer: ImportExportHandler, display_item: DisplayItem.DisplayItem, path: pathlib.Path) -> None:
+        extension = self.__get_writer_extension(writer, display_item, path)
+        if extension:
+            writer.write_display_item(display_item, path, extension)
+
+    def prepare_write_display_item_with_writer(self, writer: ImportExportHandler, display_item: DisplayItem.DisplayItem, path: pathlib.Path) -> typing.Optional[typing.Callable[[], None]]:
+        extension = self.__get_writer_extension(writer, display_item, path)
+        if extension:
+            return writer.prepare_write_display_item(display_item, path, extension)
+        return None
+
+    def __get_writer_extension(self, writer: ImportExportHandler, display_item: DisplayItem.DisplayItem, path: pathlib.Path) -> typing.Optional[str]:
         extension = path.suffix
         if extension:
             extension = extension[1:]  # remove the leading "."
             extension = extension.lower()
             data_metadata = display_item.data_items[0].data_metadata if display_item.data_items else None
             if extension in writer.extensions and data_metadata and writer.can_write(data_metadata, extension):
-                writer.write_display_item(display_item, path, extension)
+                return extension
+        return None
 
     def write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path) -> None:
         extension = path.suffix
@@ -188,6 +299,139 @@ class ImportExportManager(metaclass=Utility.Singleton):
                     io_handler.write_display_item(display_item, path, extension)
 
 
+class ExportJob:
+    """Export a list of display items with a writer, writing on a bounded pool of worker threads.
+
+    Each display item is snapshot using the writer's prepare_write_display_item on the thread driving the job, which is
+    the UI thread when started from an event loop, so edits to the display item after its snapshot do not affect the
+    exported file. The snapshot is then written on a worker thread. Writers which cannot separate the snapshot from the
+    writing write during the snapshot, on the driving thread.
+
+    Snapshots are taken as long as the data of the snapshots waiting to be written fits within budget_bytes, with at
+    least one snapshot always taken; the remaining items are snapshot as writes complete. Writes are counted as they
+    complete, in any order. The progress changed and finished events are fired on the driving thread.
+
+    Call start to export from an event loop or run to export on the calling thread. Call cancel to stop taking
+    snapshots; writes in progress finish, queued writes are skipped.
+    """
+
+    def __init__(self, writer: ImportExportHandler, display_items_and_paths: typing.Sequence[typing.Tuple[DisplayItem.DisplayItem, pathlib.Path]], *, max_workers: typing.Optional[int] = None, budget_bytes: int = 256 * 1024 * 1024) -> None:
+        self.writer = writer
+        self.budget_bytes = budget_bytes
+        self.__display_items_and_paths = list(display_items_and_paths)
+        self.__max_workers = max_workers or os.cpu_count() or 1
+        self.__cancel_event = threading.Event()
+        self.__executor: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.__call_soon: typing.Callable[[typing.Callable[[], None]], typing.Any] = lambda fn: None
+        self.__next_index = 0
+        self.__pending_count = 0
+        self.__pending_bytes = 0
+        self.__completed_count = 0
+        self.__is_finished = False
+        self.errors: typing.List[typing.Tuple[DisplayItem.DisplayItem, Exception]] = list()
+        # progress_changed_event is fired with (completed count, total count) on the driving thread.
+        self.progress_changed_event = Event.Event()
+        self.finished_event = Event.Event()
+
+    @property
+    def count(self) -> int:
+        return len(self.__display_items_and_paths)
+
+    @property
+    def completed_count(self) -> int:
+        return self.__completed_count
+
+    @property
+    def is_finished(self) -> bool:
+        return self.__is_finished
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.__cancel_event.is_set()
+
+    def cancel(self) -> None:
+        self.__cancel_event.set()
+
+    def start(self, event_loop: asyncio.AbstractEventLoop) -> None:
+        """Start the export. Snapshots are taken and events fired on the event loop, which must be the current one."""
+        assert not self.__executor
+        self.__call_soon = event_loop.call_soon_threadsafe
+        self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="export")
+        self.__prepare_writes()
+
+    def run(self) -> None:
+        """Export on the calling thread, returning when all writes are complete."""
+        assert not self.__executor
+        finished_queue: queue.SimpleQueue[typing.Callable[[], None]] = queue.SimpleQueue()
+        self.__call_soon = finished_queue.put
+        self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="export")
+        self.__prepare_writes()
+        while not self.__is_finished:
+            finished_queue.get()()
+
+    def __prepare_writes(self) -> None:
+        assert self.__executor
+        while self.__next_index < len(self.__display_items_and_paths) and not self.__cancel_event.is_set():
+            display_item, path = self.__display_items_and_paths[self.__next_index]
+            nbytes = _get_display_item_nbytes(display_item)
+            if self.__pending_count > 0 and self.__pending_bytes + nbytes > self.budget_bytes:
+                break
+            self.__next_index += 1
+            try:
+                write_fn = ImportExportManager().prepare_write_display_item_with_writer(self.writer, display_item, path)
+            except Exception as e:
+                self.__item_finished(display_item, e)
+                continue
+            if write_fn:
+                self.__pending_count += 1
+                self.__pending_bytes += nbytes
+                self.__executor.submit(self.__write, display_item, nbytes, write_fn)
+            else:
+                self.__item_finished(display_item, None)
+        if self.__pending_count == 0:
+            self.__executor.shutdown(wait=False)
+            self.__is_finished = True
+            self.finished_event.fire()
+
+    def __write(self, display_item: DisplayItem.DisplayItem, nbytes: int, write_fn: typing.Callable[[], None]) -> None:
+        # called on a worker thread. the result is passed back to the driving thread.
+        is_written = False
+        exception: typing.Optional[Exception] = None
+        if not self.__cancel_event.is_set():
+            try:
+                write_fn()
+            except Exception as e:
+                exception = e
+            is_written = True
+        self.__call_soon(functools.partial(self.__write_finished, display_item, nbytes, is_written, exception))
+
+    def __write_finished(self, display_item: DisplayItem.DisplayItem, nbytes: int, is_written: bool, exception: typing.Optional[Exception]) -> None:
+        self.__pending_count -= 1
+        self.__pending_bytes -= nbytes
+        if is_written:
+            self.__item_finished(display_item, exception)
+        self.__prepare_writes()
+
+    def __item_finished(self, display_item: DisplayItem.DisplayItem, exception: typing.Optional[Exception]) -> None:
+        if exception:
+            logging.debug("Could not export image %s / %s", str(display_item), str(exception))
+            traceback.print_exception(type(exception), exception, exception.__traceback__)
+            self.errors.append((display_item, exception))
+        else:
+            self.__completed_count += 1
+        self.progress_changed_event.fire(self.__completed_count, self.count)
+
+
+def _get_display_item_nbytes(display_item: DisplayItem.DisplayItem) -> int:
+    # estimate the size of the snapshot of the display item from the size of its data.
+    nbytes = 0
+    for data_item in display_item.data_items:
+        data_metadata = data_item.data_metadata if data_item else None
+        if data_metadata and data_metadata.data_dtype is not None:
+            nbytes += int(numpy.prod(data_metadata.data_shape, dtype=numpy.int64)) * numpy.dtype(data_metadata.data_dtype).itemsize
+    return nbytes
+
+
 # create a new data item with a data element.
 # data element is a dict which can be processed into a data item
 # when this method returns, the data item has not been added to a document. therefore, the
@@ -199,7 +443,8 @@ def create_data_item_from_data_element(data_element: DataElementType,
     large_format = data_element.get("large_format")
     if large_format is None:
         data = data_element.get("data")
-        large_format = len(data.shape) > 2 and data.dtype != numpy.uint8 if data is not None else False
+        data_shape_and_dtype = (data.shape, data.dtype) if data is not None else data_element.get("data_shape_and_dtype")
+        large_format = len(data_shape_and_dtype[0]) > 2 and numpy.dtype(data_shape_and_dtype[1]) != numpy.uint8 if data_shape_and_dtype else False
     data_item = DataItem.DataItem(item_uuid=uuid_, large_format=large_format)
     update_data_item_from_data_element(data_item, data_element, data_file_path)
     return data_item
@@ -257,6 +502,8 @@ def update_data_item_from_data_element_1(data_item: DataItem.DataItem, data_elem
             if intensity_calibration:
                 data_item.set_intensity_calibration(intensity_calibration)
             data_item.metadata = data_and_metadata.metadata
+        elif not data_and_metadata.is_data_valid:
+            data_item.set_lazy_xdata(data_and_metadata)
         else:
             data_item.set_xdata(data_and_metadata)
         # title
@@ -304,7 +551,7 @@ def convert_data_element_to_data_and_metadata_1(data_element: DataElementType) -
     """Convert a data element to xdata. No data copying occurs.
 
     The data element can have the following keys:
-        data (required)
+        data (required unless data_shape_and_dtype and data_fn are given, see read_lazy_data_elements)
         is_sequence, collection_dimension_count, datum_dimension_count (optional description of the data)
         spatial_calibrations (optional list of spatial calibration dicts, scale, offset, units)
         intensity_calibration (optional intensity calibration dict, scale, offset, units)
@@ -315,8 +562,9 @@ def convert_data_element_to_data_and_metadata_1(data_element: DataElementType) -
             then timezone gets stored into metadata.description.timezone.
     """
     # data. takes ownership.
-    data = data_element["data"]
-    dimensional_shape = Image.dimensional_shape_from_data(data)
+    data = data_element.get("data")
+    data_shape_and_dtype = (data.shape, data.dtype) if data is not None else data_element["data_shape_and_dtype"]
+    dimensional_shape = Image.dimensional_shape_from_shape_and_dtype(*data_shape_and_dtype)
     is_sequence = data_element.get("is_sequence", False)
     dimension_count = len(dimensional_shape) if dimensional_shape else 0
     adjusted_dimension_count = dimension_count - (1 if is_sequence else 0)
@@ -382,6 +630,17 @@ def convert_data_element_to_data_and_metadata_1(data_element: DataElementType) -
     utc_datetime = local_datetime - datetime.timedelta(minutes=tz_adjust)  # tz_adjust already contains dst_adjust
     timestamp = utc_datetime
 
+    if data is None:
+        # the data is read when it is used.
+        return DataAndMetadata.DataAndMetadata(data_element["data_fn"], data_shape_and_dtype,
+                                               intensity_calibration=intensity_calibration,
+                                               dimensional_calibrations=dimensional_calibrations,
+                                               metadata=metadata,
+                                               timestamp=timestamp,
+                                               data_descriptor=data_descriptor,
+                                               timezone=timezone,
+                                               timezone_offset=tz_value)
+
     return DataAndMetadata.new_data_and_metadata(data,
                                                  intensity_calibration=intensity_calibration,
                                                  dimensional_calibrations=dimensional_calibrations,
@@ -548,13 +807,94 @@ class StandardImportExportHandler(ImportExportHandler):
         return len(data_metadata.dimensional_shape) == 2
 
     def write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> None:
+        imageio.imwrite(path, self.__get_display_rgba(display_item), extension)
+
+    def prepare_write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> typing.Callable[[], None]:
+        return functools.partial(imageio.imwrite, path, numpy.copy(self.__get_display_rgba(display_item)), extension)
+
+    def __get_display_rgba(self, display_item: DisplayItem.DisplayItem) -> _DataArrayType:
         display_data_channel = display_item.display_data_channel
         assert display_data_channel
         display_values = display_data_channel.get_calculated_display_values()
         assert display_values
         data = display_values.display_rgba  # export the display rather than the data for these types
         assert data is not None
-        imageio.imwrite(path, data, extension)
+        return data
+
+
+# the approximate number of values to format or parse at once when writing or reading csv files.
+CSV_BLOCK_VALUE_COUNT = 1 << 16
+
+
+def iter_csv_blocks(path: pathlib.Path, delimiter: str = ",", comments: str = "#") -> typing.Iterator[_DataArrayType]:
+    """Read a numeric csv file, yielding 2d float blocks of consecutive rows.
+
+    Each block of lines is parsed with a single call into numpy rather than value by value. Comments and blank lines
+    are skipped. Raises ValueError, with the line number, if a row does not have the same number of values as the first
+    row or if a value cannot be parsed.
+    """
+    column_count = 0
+    line_number = 0
+    with open(path, "r") as f:
+        while True:
+            raw_lines = f.readlines(CSV_BLOCK_VALUE_COUNT * 8)  # size hint in characters
+            if not raw_lines:
+                break
+            lines = list()
+            for raw_line in raw_lines:
+                line_number += 1
+                line = raw_line.split(comments, 1)[0].strip()
+                if line:
+                    field_count = line.count(delimiter) + 1
+                    if not column_count:
+                        column_count = field_count
+                    elif field_count != column_count:
+                        raise ValueError(f"Unable to parse csv file {path}: line {line_number} has {field_count} values, expected {column_count}")
+                    lines.append(line)
+            if not lines:
+                continue
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)  # raised on partial parse; checked below
+                values = numpy.fromstring(delimiter.join(lines), sep=delimiter)
+            if values.shape[0] != len(lines) * column_count:
+                raise ValueError(f"Unable to parse csv file {path}")
+            yield values.reshape(len(lines), column_count)
+
+
+def read_csv_array(path: pathlib.Path, delimiter: str = ",", comments: str = "#") -> _DataArrayType:
+    """Read a numeric csv file into a float array, squeezing unit dimensions like numpy.loadtxt."""
+    blocks = list(iter_csv_blocks(path, delimiter, comments))
+    if not blocks:
+        return numpy.empty((0,))
+    return numpy.squeeze(numpy.concatenate(blocks) if len(blocks) > 1 else blocks[0])
+
+
+def write_csv_array(path: pathlib.Path, data: _DataArrayType, delimiter: str = ", ") -> None:
+    """Write a 1d or 2d real array to a csv file with the same output as numpy.savetxt.
+
+    Rows are formatted in blocks using a single string format operation per block.
+    """
+    if data.ndim not in (1, 2) or numpy.iscomplexobj(data):
+        numpy.savetxt(path, data, delimiter=delimiter)  # type: ignore
+        return
+    data = data.reshape(data.shape[0], -1)
+    row_count, column_count = data.shape
+    block_row_count = max(1, CSV_BLOCK_VALUE_COUNT // max(column_count, 1))
+    row_template = delimiter.join(["%.18e"] * column_count) + "\n"
+    with open(path, "w") as f:
+        for start in range(0, row_count, block_row_count):
+            block = data[start:start + block_row_count]
+            f.write((row_template * block.shape[0]) % tuple(block.ravel().tolist()))
+
+
+def format_csv_values(values: _DataArrayType) -> typing.List[str]:
+    """Format the values of a 1d array as strings, the same as str.format with an empty format spec."""
+    if values.dtype.kind == "f" and values.dtype.itemsize <= 8:
+        # str.format converts numpy floats to python floats before formatting.
+        return typing.cast(typing.List[str], values.astype(numpy.float64).astype(str).tolist())
+    if values.dtype.kind in "biu":
+        return typing.cast(typing.List[str], values.astype(str).tolist())
+    return ["{}".format(value) for value in values]
 
 
 class CSVImportExportHandler(ImportExportHandler):
@@ -563,7 +903,7 @@ class CSVImportExportHandler(ImportExportHandler):
         super().__init__(io_handler_id, name, extensions)
 
     def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
-        data = numpy.loadtxt(str(path), delimiter=',')  # type: ignore
+        data = read_csv_array(path, delimiter=',')
         if data is not None:
             data_element: DataElementType = dict()
             data_element["data"] = data
@@ -578,7 +918,15 @@ class CSVImportExportHandler(ImportExportHandler):
         assert data_item
         data = data_item.data
         if data is not None:
-            numpy.savetxt(path, data, delimiter=', ')  # type: ignore
+            write_csv_array(path, data, delimiter=', ')
+
+    def prepare_write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> typing.Optional[typing.Callable[[], None]]:
+        data_item = display_item.data_item
+        assert data_item
+        data = data_item.data
+        if data is not None:
+            return functools.partial(write_csv_array, path, numpy.copy(data), delimiter=', ')
+        return None
 
 
 def build_table(display_item: DisplayItem.DisplayItem) -> typing.Tuple[typing.List[str], typing.List[_DataArrayType]]:
@@ -644,19 +992,76 @@ class CSV1ImportExportHandler(ImportExportHandler):
 
     def write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> None:
         headers, data_list = build_table(display_item)
+        self.__write_table(path, headers, data_list)
+
+    def prepare_write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> typing.Callable[[], None]:
+        headers, data_list = build_table(display_item)
+        return functools.partial(self.__write_table, path, headers, [numpy.copy(data) for data in data_list])
 
+    def __write_table(self, path: pathlib.Path, headers: typing.Sequence[str], data_list: typing.Sequence[_DataArrayType]) -> None:
         newline = "\n"
         delimiter = ", "
-        format_ = "{}" # We need to stick with an empty format string here, otherwise we will have problems with the
-                       # fill value of zip_longest
-        row_template = delimiter.join([format_] * len(data_list))
-        row_template += newline
-        header_template = "# " + row_template
+        row_count = max([len(data) for data in data_list], default=0)
+        block_row_count = max(1, CSV_BLOCK_VALUE_COUNT // max(len(data_list), 1))
 
         with open(path, "w+") as f:
-            f.write(header_template.format(*headers))
-            for row in itertools.zip_longest(*data_list, fillvalue=""):
-                f.write(row_template.format(*row))
+            f.write("# " + delimiter.join(headers) + newline)
+            for start in range(0, row_count, block_row_count):
+                stop = min(start + block_row_count, row_count)
+                columns = list()
+                for data in data_list:
+                    column = format_csv_values(data[start:stop])
+                    # shorter columns are filled with empty values
+                    column.extend([""] * (stop - start - len(column)))
+                    columns.append(column)
+                f.write(newline.join(map(delimiter.join, zip(*columns))) + newline)
+
+
+def read_npy_header(fp: typing.BinaryIO) -> typing.Optional[typing.Tuple[DataAndMetadata.ShapeType, numpy.dtype[typing.Any]]]:
+    """Read the shape and dtype from the header of npy data without reading the data.
+
+    Return None for data which cannot be read lazily, such as object arrays or unsupported format versions.
+    """
+    version = numpy.lib.format.read_magic(fp)
+    if version == (1, 0):
+        shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(fp)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(fp)
+    else:
+        return None
+    if dtype.hasobject:
+        return None
+    return tuple(shape), dtype
+
+
+def read_zip_member_array(zip_file: zipfile.ZipFile, path: pathlib.Path, name: str) -> _DataArrayType:
+    """Read a numpy array from the zip file member without buffering the member in memory.
+
+    Uncompressed members are read directly from the archive by seeking to the member data. Compressed members are
+    streamed through the decompressor.
+    """
+    zip_info = zip_file.getinfo(name)
+    if zip_info.compress_type == zipfile.ZIP_STORED:
+        with open(path, "rb") as fp:
+            fp.seek(zip_info.header_offset)
+            # local file header: signature, 22 bytes of fixed fields, name length, extra length
+            signature, name_len, extra_len = struct.unpack("<I22xHH", fp.read(30))
+            if signature == 0x04034b50:
+                fp.seek(zip_info.header_offset + 30 + name_len + extra_len)
+                return numpy.lib.format.read_array(fp)
+    with zip_file.open(name) as fp:
+        return numpy.lib.format.read_array(fp)
+
+
+def write_zip_member_array(zip_file: zipfile.ZipFile, name: str, data: _DataArrayType) -> None:
+    """Write a numpy array to a new uncompressed zip file member, streaming the npy header and data.
+
+    The member will use ZIP64 extensions if the data is large enough to require them.
+    """
+    data = numpy.asanyarray(data)
+    force_zip64 = data.nbytes + 65536 >= zipfile.ZIP64_LIMIT  # allow for the npy header
+    with zip_file.open(name, "w", force_zip64=force_zip64) as fp:
+        numpy.lib.format.write_array(fp, data, allow_pickle=False)
 
 
 class NDataImportExportHandler(ImportExportHandler):
@@ -665,18 +1070,34 @@ class NDataImportExportHandler(ImportExportHandler):
         super().__init__(io_handler_id, name, extensions)
 
     def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
-        zip_file = zipfile.ZipFile(path, 'r')
-        namelist = zip_file.namelist()
-        if "metadata.json" in namelist and "data.npy" in namelist:
-            metadata = json.loads(zip_file.read("metadata.json").decode("utf-8"))
-            data_bytes = zip_file.read("data.npy")
-            data = numpy.load(io.BytesIO(data_bytes))  # type: ignore
-            if data is not None:
-                data_element = metadata
-                data_element["data"] = data
-                return [data_element]
+        with zipfile.ZipFile(path, 'r') as zip_file:
+            namelist = zip_file.namelist()
+            if "metadata.json" in namelist and "data.npy" in namelist:
+                metadata = json.loads(zip_file.read("metadata.json").decode("utf-8"))
+                data = read_zip_member_array(zip_file, path, "data.npy")
+                if data is not None:
+                    data_element = metadata
+                    data_element["data"] = data
+                    return [data_element]
         return list()
 
+    def read_lazy_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
+        with zipfile.ZipFile(path, 'r') as zip_file:
+            namelist = zip_file.namelist()
+            if "metadata.json" in namelist and "data.npy" in namelist:
+                with zip_file.open("data.npy") as fp:
+                    data_shape_and_dtype = read_npy_header(fp)
+                if data_shape_and_dtype is not None:
+                    data_element = json.loads(zip_file.read("metadata.json").decode("utf-8"))
+                    data_element["data_shape_and_dtype"] = data_shape_and_dtype
+                    data_element["data_fn"] = functools.partial(self.__read_data, path)
+                    return [data_element]
+        return self.read_data_elements(extension, path)
+
+    def __read_data(self, path: pathlib.Path) -> _DataArrayType:
+        with zipfile.ZipFile(path, 'r') as zip_file:
+            return read_zip_member_array(zip_file, path, "data.npy")
+
     def can_write(self, data_metadata: DataAndMetadata.DataMetadata, extension: str) -> bool:
         return True
 
@@ -686,19 +1107,26 @@ class NDataImportExportHandler(ImportExportHandler):
         data_element = create_data_element_from_data_item(data_item, include_data=False)
         data = data_item.data
         if data is not None:
-            root = str(path.parent)
-            metadata_path = root + "_metadata.json"
-            data_path = root + "_data.npy"
-            try:
-                with open(metadata_path, "w") as fp:
-                    json.dump(data_element, fp)
-                numpy.save(data_path, data)  # type: ignore
-                zip_file = zipfile.ZipFile(path, 'w')
-                zip_file.write(metadata_path, "metadata.json")
-                zip_file.write(data_path, "data.npy")
-            finally:
-                os.remove(metadata_path)
-                os.remove(data_path)
+            self.__write_data_element(path, data_element, data)
+
+    def prepare_write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> typing.Optional[typing.Callable[[], None]]:
+        data_item = display_item.data_item
+        assert data_item
+        data_element = create_data_element_from_data_item(data_item, include_data=False)
+        data = data_item.data
+        if data is not None:
+            return functools.partial(self.__write_data_element, path, data_element, numpy.copy(data))
+        return None
+
+    def __write_data_element(self, path: pathlib.Path, data_element: DataElementType, data: _DataArrayType) -> None:
+        try:
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED, allowZip64=True) as zip_file:
+                zip_file.writestr("metadata.json", json.dumps(data_element))
+                write_zip_member_array(zip_file, "data.npy", data)
+        except Exception:
+            if path.exists():
+                os.remove(path)
+            raise
 
 
 class NumPyImportExportHandler(ImportExportHandler):
@@ -718,37 +1146,59 @@ class NumPyImportExportHandler(ImportExportHandler):
 
     def read_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
         data = numpy.load(str(path))  # type: ignore
-        metadata_path = path.with_suffix(".json")
-        if metadata_path.exists():
-            with open(metadata_path) as f:
-                metadata = json.load(f)
-        else:
-            metadata = dict()
         if data is not None:
-            data_element = metadata
+            data_element = self.__read_metadata(path)
             data_element["data"] = data
             return [data_element]
         return list()
 
+    def read_lazy_data_elements(self, extension: str, path: pathlib.Path) -> typing.List[DataElementType]:
+        with open(path, "rb") as fp:
+            data_shape_and_dtype = read_npy_header(fp)
+        if data_shape_and_dtype is not None:
+            data_element = self.__read_metadata(path)
+            data_element["data_shape_and_dtype"] = data_shape_and_dtype
+            data_element["data_fn"] = functools.partial(numpy.load, str(path))
+            return [data_element]
+        return self.read_data_elements(extension, path)
+
+    def __read_metadata(self, path: pathlib.Path) -> DataElementType:
+        metadata_path = path.with_suffix(".json")
+        if metadata_path.exists():
+            with open(metadata_path) as f:
+                return typing.cast(DataElementType, json.load(f))
+        return dict()
+
     def can_write(self, data_metadata: DataAndMetadata.DataMetadata, extension: str) -> bool:
         return True
 
     def write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> None:
         data_item = display_item.data_item
         assert data_item
-        data_path = path
-        metadata_path = data_path.with_suffix(".json")
         data_element = create_data_element_from_data_item(data_item, include_data=False)
         data = data_item.data
         if data is not None:
-            try:
-                with open(str(metadata_path), "w") as fp:
-                    json.dump(data_element, fp)
-                numpy.save(str(data_path), data)  # type: ignore
-            except Exception:
-                os.remove(str(metadata_path))
-                os.remove(str(data_path))
-                raise
+            self.__write_data_element(path, data_element, data)
+
+    def prepare_write_display_item(self, display_item: DisplayItem.DisplayItem, path: pathlib.Path, extension: str) -> typing.Optional[typing.Callable[[], None]]:
+        data_item = display_item.data_item
+        assert data_item
+        data_element = create_data_element_from_data_item(data_item, include_data=False)
+        data = data_item.data
+        if data is not None:
+            return functools.partial(self.__write_data_element, path, data_element, numpy.copy(data))
+        return None
+
+    def __write_data_element(self, data_path: pathlib.Path, data_element: DataElementType, data: _DataArrayType) -> None:
+        metadata_path = data_path.with_suffix(".json")
+        try:
+            with open(str(metadata_path), "w") as fp:
+                json.dump(data_element, fp)
+            numpy.save(str(data_path), data)  # type: ignore
+        except Exception:
+            os.remove(str(metadata_path))
+            os.remove(str(data_path))
+            raise
 
 
 # Register the intrinsic I/O handlers.
@@ -20,6 +20,7 @@ import typing
 
 # local libraries
 from nion.swift.model import StorageHandler
+from nion.swift.model import Tracing
 from nion.swift.model import Utility
 from nion.utils import Geometry
 
@@ -437,6 +438,7 @@ class NDataHandler(StorageHandler.StorageHandler):
     def get_extension(self) -> str:
         return ".ndata"
 
+    @Tracing.traced("storage")
     def write_data(self, data: _NDArray, file_datetime: datetime.datetime) -> None:
         """
             Write data to the ndata file specified by reference.
@@ -460,6 +462,7 @@ class NDataHandler(StorageHandler.StorageHandler):
     def reserve_data(self, data_shape: typing.Tuple[int, ...], data_dtype: numpy.typing.DTypeLike, file_datetime: datetime.datetime) -> None:
         self.write_data(numpy.zeros(data_shape, data_dtype), file_datetime)
 
+    @Tracing.traced("storage")
     def write_properties(self, properties: PersistentDictType, file_datetime: datetime.datetime) -> None:
         """
             Write properties to the ndata file specified by reference.
@@ -485,6 +488,7 @@ class NDataHandler(StorageHandler.StorageHandler):
             timestamp = calendar.timegm(file_datetime.timetuple()) - tz_minutes * 60
             os.utime(absolute_file_path, (time.time(), timestamp))
 
+    @Tracing.traced("storage")
     def read_properties(self) -> PersistentDictType:
         """
             Read properties from the ndata file reference
@@ -499,6 +503,7 @@ class NDataHandler(StorageHandler.StorageHandler):
                 properties = read_json(fp, local_files, dir_files, b"metadata.json")
             return properties
 
+    @Tracing.traced("storage")
     def read_data(self) -> typing.Optional[_NDArray]:
         """
             Read data from the ndata file reference
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 # standard libraries
 import collections
-import copy
 import importlib
 import importlib.util
 import inspect
@@ -12,6 +11,8 @@ import os
 import pkgutil
 import re
 import sys
+import threading
+import time
 import traceback
 import types
 import typing
@@ -25,6 +26,8 @@ _ModuleInfoType = typing.Any
 
 __modules: typing.List[types.ModuleType] = list()
 __test_suites: typing.List[unittest.suite.TestSuite] = list()
+__lazy_plug_ins: typing.List[LazyPlugIn] = list()
+__load_times: typing.List[typing.Tuple[str, float]] = list()
 
 
 class RequirementsException(Exception):
@@ -151,6 +154,71 @@ class PlugInAdapter:
         return load_plug_in(self.module_path, self.module_name)
 
 
+class LazyPlugIn:
+    """A plug-in which is imported when one of its contributions is first used.
+
+    The contributions are declared in the 'contributes' section of the manifest, for instance::
+
+        "contributes": {
+            "panels": [{"panel_id": "my-panel", "panel_name": "My Panel", "panel_positions": ["left", "right"], "panel_position": "right"}],
+            "menu_items": [{"menu_id": "processing_menu", "menu_item_name": "My Processing"}],
+            "io_handlers": [{"io_handler_id": "my-io-handler", "name": "My Format", "extensions": ["myf"]}],
+            "computations": [{"computation_type_id": "my-computation"}]
+        }
+
+    The application registers placeholders for the contributions. When one is used, the plug-in is loaded and registers
+    its contributions as usual, replacing the placeholders. A plug-in declaring contributions must not need to do
+    anything else at startup.
+    """
+
+    def __init__(self, plugin_adapter: typing.Union[ModuleAdapter, PlugInAdapter]) -> None:
+        self.module_name = plugin_adapter.module_name
+        self.module_path = plugin_adapter.module_path
+        self.manifest = plugin_adapter.manifest
+        self.__plugin_adapter = plugin_adapter
+        self.__module: typing.Optional[types.ModuleType] = None
+        self.__is_loaded = False
+        # contributions may be used from threads, for instance when reading files.
+        self.__lock = threading.RLock()
+
+    @property
+    def contributions(self) -> PersistentDictType:
+        return typing.cast(PersistentDictType, self.manifest.get("contributes", dict()))
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__is_loaded
+
+    def load(self) -> typing.Optional[types.ModuleType]:
+        """Load the plug-in if it has not been loaded yet and return its module or None if it failed to load."""
+        with self.__lock:
+            if not self.__is_loaded:
+                self.__is_loaded = True
+                self.__module = _load_plug_in_module(self.__plugin_adapter)
+                if self.__module:
+                    _notify_module(self.__module, "run")
+            return self.__module
+
+
+def _load_plug_in_module(plugin_adapter: typing.Union[ModuleAdapter, PlugInAdapter]) -> typing.Optional[types.ModuleType]:
+    start = time.perf_counter()
+    module = plugin_adapter.load()
+    __load_times.append((plugin_adapter.module_name, time.perf_counter() - start))
+    if module:
+        __modules.append(module)
+    return module
+
+
+def get_lazy_plug_ins() -> typing.Sequence[LazyPlugIn]:
+    """Return the plug-ins which declared their contributions and are loaded on first use."""
+    return list(__lazy_plug_ins)
+
+
+def get_load_times() -> typing.Sequence[typing.Tuple[str, float]]:
+    """Return the module name and import time, in seconds, of each plug-in loaded so far, in loading order."""
+    return list(__load_times)
+
+
 class ApplicationLike(typing.Protocol):
     pass
 
@@ -223,7 +291,7 @@ def load_plug_ins(document_location: str, data_location: str, root_dir: typing.O
     progress = True
     while progress:
         progress = False
-        plugin_adapters_copy = copy.deepcopy(plugin_adapters)
+        plugin_adapters_copy = list(plugin_adapters)
         plugin_adapters = list()
         for plugin_adapter in plugin_adapters_copy:
             manifest_path = plugin_adapter.manifest_path
@@ -245,6 +313,9 @@ def load_plug_ins(document_location: str, data_location: str, root_dir: typing.O
                 if "requires" in manifest and not isinstance(manifest["requires"], list):
                     logging.info("Invalid manifest ('requires' not a list): %s", manifest_path)
                     manifest_valid = False
+                if "contributes" in manifest and not isinstance(manifest["contributes"], dict):
+                    logging.info("Invalid manifest ('contributes' not a dict): %s", manifest_path)
+                    manifest_valid = False
                 if not manifest_valid:
                     continue
                 for module in manifest.get("modules", list()):
@@ -281,15 +352,19 @@ def load_plug_ins(document_location: str, data_location: str, root_dir: typing.O
                 if not manifest_valid:
                     continue
                 version_map[manifest["identifier"]] = manifest["version"]
+                if "contributes" in manifest:
+                    # defer importing the plug-in until one of its contributions is used.
+                    logging.info("Plug-in '" + plugin_adapter.module_name + "' deferred (" + plugin_adapter.module_path + ").")
+                    __lazy_plug_ins.append(LazyPlugIn(plugin_adapter))
+                    progress = True
+                    continue
             # read the manifests, if any
             # repeat loop of plug-ins until no plug-ins left in the list
             #   if all dependencies satisfied for a plug-in, load it
             #   otherwise defer until next round
             #   stop if no plug-ins loaded in the round
             #   count on the user to have correct dependencies
-            module = plugin_adapter.load()
-            if module:
-                __modules.append(module)
+            _load_plug_in_module(plugin_adapter)
             progress = True
     for plugin_adapter in plugin_adapters:
         logging.info("Plug-in '" + plugin_adapter.module_name + "' NOT loaded (requirements) (" + plugin_adapter.module_path + ").")
@@ -305,17 +380,22 @@ def unload_plug_ins() -> None:
             logging.info(traceback.format_exc())
 
     extensions = []
+    __lazy_plug_ins.clear()
 
 def notify_modules(method_name: str, *args: typing.Any, **kwargs: typing.Any) -> None:
     for module in __modules:
-        for member in inspect.getmembers(module):
-            if inspect.isfunction(member[1]) and member[0] == method_name:
-                try:
-                    member[1](*args, **kwargs)
-                except Exception as e:
-                    logging.info("Plug-in '" + str(module) + "' exception during '" + method_name + "'.")
-                    logging.info(traceback.format_exc())
-                    logging.info("--------")
+        _notify_module(module, method_name, *args, **kwargs)
+
+
+def _notify_module(module: types.ModuleType, method_name: str, *args: typing.Any, **kwargs: typing.Any) -> None:
+    for member in inspect.getmembers(module):
+        if inspect.isfunction(member[1]) and member[0] == method_name:
+            try:
+                member[1](*args, **kwargs)
+            except Exception as e:
+                logging.info("Plug-in '" + str(module) + "' exception during '" + method_name + "'.")
+                logging.info(traceback.format_exc())
+                logging.info("--------")
 
 
 def append_test_suites(suites: typing.Sequence[unittest.suite.TestSuite]) -> None:
@@ -0,0 +1,116 @@
+"""Prefetch data and display values for display items near the current item.
+
+When stepping through a list of items, the data of the next item is usually read from disk and its display values
+calculated only once it is shown. The prefetcher does this work ahead of time on a thread for the items around the
+current item, so that stepping to a neighbor can use the data and display values already calculated.
+
+Prefetched data stays resident through the data residency manager, which limits the memory used. The prefetcher itself
+stops at the first neighbor whose data does not fit within its own budget. A new request replaces whatever remains of
+the previous request, so jumping to another item does not wait for stale prefetches.
+"""
+
+from __future__ import annotations
+
+# standard libraries
+import concurrent.futures
+import threading
+import typing
+
+# third party libraries
+import numpy
+
+# local libraries
+from nion.utils import ThreadPool
+
+if typing.TYPE_CHECKING:
+    from nion.swift.model import DisplayItem
+
+
+class DisplayItemPrefetcher:
+    """Prefetch the data and display values of the items before and after the current item.
+
+    Call prefetch with the display items in their displayed order and the index of the current item. The count nearest
+    neighbors on each side are prefetched, nearest first, stopping at the first neighbor whose data does not fit within
+    the remaining budget_bytes.
+    """
+
+    def __init__(self, count: int = 2, budget_bytes: int = 512 * 1024 * 1024) -> None:
+        self.count = count
+        self.budget_bytes = budget_bytes
+        self.__lock = threading.RLock()
+        self.__pending_display_values: typing.List[typing.Tuple[DisplayItem.DisplayDataChannel, DisplayItem.DisplayValues]] = list()
+        self.__dispatcher = ThreadPool.SingleItemDispatcher()
+        self.__dispatch_future: typing.Optional[concurrent.futures.Future[typing.Any]] = None
+        self.__prefetched_count = 0
+
+    def close(self) -> None:
+        self.cancel()
+        if self.__dispatch_future:
+            concurrent.futures.wait([self.__dispatch_future])
+            self.__dispatch_future = None
+        self.__dispatcher.close()
+        self.__dispatcher = typing.cast(typing.Any, None)
+
+    @property
+    def prefetched_count(self) -> int:
+        """Return the number of display data channels prefetched so far. Useful for testing."""
+        return self.__prefetched_count
+
+    def cancel(self) -> None:
+        """Cancel any pending prefetch."""
+        with self.__lock:
+            self.__pending_display_values = list()
+
+    def prefetch(self, display_items: typing.Sequence[DisplayItem.DisplayItem], index: int) -> None:
+        """Prefetch the neighbors of the display item at index, replacing any pending prefetch. Call on the main thread.
+
+        The display values are created on the calling thread since they capture the display properties. The data is
+        loaded and the display values calculated on a thread.
+        """
+        display_data_channels: typing.List[DisplayItem.DisplayDataChannel] = list()
+        for offset in range(1, self.count + 1):
+            for neighbor_index in (index + offset, index - offset):
+                if 0 <= neighbor_index < len(display_items):
+                    display_data_channels.extend(display_items[neighbor_index].display_data_channels)
+        with self.__lock:
+            pending_display_values = list()
+            remaining_bytes = self.budget_bytes
+            for display_data_channel in display_data_channels:
+                data_item = display_data_channel.data_item
+                data_metadata = data_item.data_metadata if data_item else None
+                if data_metadata is None:
+                    continue
+                data_dtype = data_metadata.data_dtype
+                assert data_dtype is not None
+                nbytes = int(numpy.prod(data_metadata.data_shape, dtype=numpy.int64)) * numpy.dtype(data_dtype).itemsize
+                if nbytes > remaining_bytes:
+                    # stop at the nearest neighbor that does not fit rather than skipping ahead to farther neighbors.
+                    break
+                remaining_bytes -= nbytes
+                display_values = display_data_channel.get_calculated_display_values()
+                if display_values:
+                    pending_display_values.append((display_data_channel, display_values))
+            self.__pending_display_values = pending_display_values
+        if pending_display_values:
+            self.__dispatch_future = self.__dispatcher.dispatch(self.__prefetch_pending)
+
+    def __prefetch_pending(self) -> None:
+        while True:
+            with self.__lock:
+                if not self.__pending_display_values:
+                    break
+                display_data_channel, display_values = self.__pending_display_values.pop(0)
+                data_item = display_data_channel.data_item
+            if data_item:
+                # hold a data reference while calculating so the data is loaded once. when released, the data stays
+                # resident in the data residency manager if it fits in its budget.
+                data_item.increment_data_ref_count()
+                try:
+                    display_data_and_metadata = display_values.display_data_and_metadata
+                    display_values.display_range
+                    if display_data_and_metadata and len(display_data_and_metadata.data_shape) == 2:
+                        display_values.display_rgba
+                finally:
+                    data_item.decrement_data_ref_count()
+                with self.__lock:
+                    self.__prefetched_count += 1
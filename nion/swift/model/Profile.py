@@ -237,6 +237,9 @@ class IndexProjectReference(ProjectReference):
 class FolderProjectReference(ProjectReference):
     type = "project_folder"
 
+    # how data files are transferred when upgrading a legacy library; see FileStorageSystem.copy_data_file.
+    migration_link_mode = "reflink"
+
     def __init__(self) -> None:
         super().__init__(self.__class__.type)
         self.define_property("project_folder_path", converter=Converter.PathToStringConverter(), hidden=True)
@@ -273,17 +276,24 @@ class FolderProjectReference(ProjectReference):
         legacy_path = pathlib.Path(project_storage_system.get_identifier())
         target_project_path = legacy_path.parent.with_suffix(".nsproj")
         target_data_path = target_project_path.with_name(target_project_path.stem + " Data")
-        if target_project_path.exists() or target_data_path.exists():
-            raise FileExistsError()
-        logging.getLogger("loader").info(f"Created new project {target_project_path} {target_data_path}")
-        target_project_uuid = uuid.uuid4()
-        target_project_data_json = json.dumps(
-            {"version": FileStorageSystem.PROJECT_VERSION, "uuid": str(target_project_uuid),
-             "project_data_folders": [str(target_data_path.stem)]})
-        target_project_path.write_text(target_project_data_json, "utf-8")
+        # a migration journal indicates an interrupted upgrade into the target; resume it.
+        migration_journal_path = FileStorageSystem.get_migration_journal_path(target_project_path)
+        if migration_journal_path.exists() and target_project_path.exists():
+            logging.getLogger("loader").info(f"Resuming upgrade to project {target_project_path} {target_data_path}")
+            target_project_uuid = uuid.UUID(json.loads(target_project_path.read_text("utf-8"))["uuid"])
+        else:
+            if target_project_path.exists() or target_data_path.exists():
+                raise FileExistsError()
+            logging.getLogger("loader").info(f"Created new project {target_project_path} {target_data_path}")
+            migration_journal_path.touch()
+            target_project_uuid = uuid.uuid4()
+            target_project_data_json = json.dumps(
+                {"version": FileStorageSystem.PROJECT_VERSION, "uuid": str(target_project_uuid),
+                 "project_data_folders": [str(target_data_path.stem)]})
+            target_project_path.write_text(target_project_data_json, "utf-8")
         with contextlib.closing(FileStorageSystem.FileProjectStorageSystem(target_project_path)) as new_storage_system:
             new_storage_system.load_properties()
-            FileStorageSystem.migrate_to_latest(project_storage_system, new_storage_system)
+            FileStorageSystem.migrate_to_latest(project_storage_system, new_storage_system, link_mode=self.migration_link_mode)
         new_project_reference = IndexProjectReference()
         new_project_reference.project_path = target_project_path
         new_project_reference.project_uuid = target_project_uuid
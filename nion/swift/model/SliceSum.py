@@ -0,0 +1,187 @@
+"""Calculate slice sums of 2d collections of 1d data from cached cumulative sums.
+
+Displaying a spectrum image sums the selected slice of each spectrum. Summing the slice directly costs time proportional
+to the slice width for every change to the slice. The slice sum cache keeps cumulative sums along the datum axis at
+regular checkpoints so that the sum of any slice is the difference of two checkpoint planes plus direct sums of the
+channels between the slice ends and the nearest checkpoints.
+
+The cumulative sums are built on the second slice sum of the same data, so data that is only displayed once does not pay
+for them. The checkpoint spacing is chosen so that the cumulative sums of all caches fit within a process wide budget. A
+budget of zero disables the cumulative sums.
+"""
+
+from __future__ import annotations
+
+# standard libraries
+import dataclasses
+import threading
+import typing
+import weakref
+
+# third party libraries
+import numpy
+import numpy.typing
+
+# local libraries
+from nion.data import DataAndMetadata
+
+_ImageDataType = numpy.typing.NDArray[typing.Any]
+
+
+@dataclasses.dataclass
+class _CumulativeSums:
+    data_and_metadata_ref: weakref.ReferenceType[DataAndMetadata.DataAndMetadata]
+    data_key: typing.Any
+    stride: int
+    planes: typing.Optional[_ImageDataType]
+    nbytes: int
+
+
+class SliceSumCache:
+    """Calculate slice sums of one data item, caching the cumulative sums of its data.
+
+    The data_key passed with the data identifies the version of the data, since data may be modified in place. The
+    cumulative sums are discarded when the data or data key changes.
+    """
+
+    def __init__(self, max_stride: int = 64) -> None:
+        self.max_stride = max_stride
+        self.__lock = threading.RLock()
+        self.__cumulative_sums: typing.Optional[_CumulativeSums] = None
+
+    def close(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__discard()
+
+    @property
+    def stride(self) -> typing.Optional[int]:
+        """Return the checkpoint stride of the cumulative sums, if any. Useful for testing."""
+        with self.__lock:
+            cumulative_sums = self.__cumulative_sums
+            return cumulative_sums.stride if cumulative_sums and cumulative_sums.planes is not None else None
+
+    def get_slice_sum(self, data_and_metadata: DataAndMetadata.DataAndMetadata, data_key: typing.Any, slice_center: int, slice_width: int) -> typing.Optional[DataAndMetadata.DataAndMetadata]:
+        """Return the slice sum of the data, equivalent to Core.function_slice_sum, or None if not applicable.
+
+        Only non-sequence 2d collections of 1d numeric data are handled.
+        """
+        if data_and_metadata.is_sequence or data_and_metadata.collection_dimension_count != 2 or data_and_metadata.datum_dimension_count != 1:
+            return None
+        data = data_and_metadata._data_ex
+        if data is None or data.ndim != 3 or data.size == 0 or not numpy.issubdtype(data.dtype, numpy.number):
+            return None
+        slice_start = int(slice_center - slice_width * 0.5 + 0.5)
+        slice_start = max(slice_start, 0)
+        slice_end = slice_start + slice_width
+        slice_end = min(data.shape[-1], slice_end)
+        with self.__lock:
+            cumulative_sums = self.__get_cumulative_sums(data_and_metadata, data_key)
+            result = _sum_slice(data, cumulative_sums.stride, cumulative_sums.planes, slice_start, slice_end)
+        dimensional_calibrations = data_and_metadata.dimensional_calibrations[0:-1]
+        return DataAndMetadata.new_data_and_metadata(result, intensity_calibration=data_and_metadata.intensity_calibration, dimensional_calibrations=dimensional_calibrations)
+
+    def __get_cumulative_sums(self, data_and_metadata: DataAndMetadata.DataAndMetadata, data_key: typing.Any) -> _CumulativeSums:
+        cumulative_sums = self.__cumulative_sums
+        if cumulative_sums and cumulative_sums.data_and_metadata_ref() is data_and_metadata and cumulative_sums.data_key == data_key:
+            if cumulative_sums.planes is None and cumulative_sums.stride == 0:
+                # second slice sum of the same data. build the cumulative sums, if they fit.
+                self.__discard()
+                cumulative_sums = self.__build(data_and_metadata, data_key)
+                self.__cumulative_sums = cumulative_sums
+            return cumulative_sums
+        # first slice sum of this data. only note the data.
+        self.__discard()
+        cumulative_sums = _CumulativeSums(weakref.ref(data_and_metadata), data_key, 0, None, 0)
+        self.__cumulative_sums = cumulative_sums
+        return cumulative_sums
+
+    def __build(self, data_and_metadata: DataAndMetadata.DataAndMetadata, data_key: typing.Any) -> _CumulativeSums:
+        data = data_and_metadata._data_ex
+        accumulate_dtype = _get_accumulate_dtype(data.dtype)
+        plane_nbytes = data.shape[0] * data.shape[1] * accumulate_dtype.itemsize
+        stride = 1
+        while stride <= self.max_stride:
+            plane_count = data.shape[-1] // stride + 1
+            nbytes = plane_count * plane_nbytes
+            if _reserve(nbytes):
+                planes = numpy.empty((plane_count,) + data.shape[:-1], accumulate_dtype)
+                planes[0] = 0
+                # accumulate one row at a time to limit the size of the intermediate cumulative sums.
+                for row in range(data.shape[0]):
+                    row_cumulative_sums = numpy.cumsum(data[row], -1, dtype=accumulate_dtype)
+                    planes[1:, row, :] = row_cumulative_sums[:, stride - 1::stride][:, :plane_count - 1].T
+                return _CumulativeSums(weakref.ref(data_and_metadata), data_key, stride, planes, nbytes)
+            stride *= 2
+        # does not fit. a stride of -1 marks the data as seen so the build is not attempted again.
+        return _CumulativeSums(weakref.ref(data_and_metadata), data_key, -1, None, 0)
+
+    def __discard(self) -> None:
+        cumulative_sums = self.__cumulative_sums
+        if cumulative_sums:
+            _release(cumulative_sums.nbytes)
+            self.__cumulative_sums = None
+
+
+def _get_accumulate_dtype(dtype: numpy.dtype[typing.Any]) -> numpy.dtype[typing.Any]:
+    # integers accumulate exactly in the same type as numpy.sum. floats accumulate in double precision to limit the
+    # error when subtracting cumulative sums.
+    if numpy.issubdtype(dtype, numpy.complexfloating):
+        return numpy.dtype(numpy.complex128)
+    if numpy.issubdtype(dtype, numpy.floating):
+        return numpy.dtype(numpy.float64)
+    return numpy.sum(numpy.zeros((1,), dtype)).dtype
+
+
+def _sum_slice(data: _ImageDataType, stride: int, planes: typing.Optional[_ImageDataType], slice_start: int, slice_end: int) -> _ImageDataType:
+    result_dtype = numpy.sum(numpy.zeros((1,), data.dtype)).dtype
+    if planes is None or slice_end <= slice_start:
+        return typing.cast(_ImageDataType, numpy.sum(data[..., slice_start:slice_end], -1))
+    first_plane = -(-slice_start // stride)
+    last_plane = slice_end // stride
+    if first_plane >= last_plane:
+        # the slice does not span a checkpoint interval.
+        return typing.cast(_ImageDataType, numpy.sum(data[..., slice_start:slice_end], -1))
+    result = planes[last_plane] - planes[first_plane]
+    if slice_start < first_plane * stride:
+        result += numpy.sum(data[..., slice_start:first_plane * stride], -1, dtype=result.dtype)
+    if last_plane * stride < slice_end:
+        result += numpy.sum(data[..., last_plane * stride:slice_end], -1, dtype=result.dtype)
+    return result.astype(result_dtype, copy=False)
+
+
+_lock = threading.RLock()
+_budget_bytes = 512 * 1024 * 1024
+_reserved_bytes = 0
+
+
+def _reserve(nbytes: int) -> bool:
+    global _reserved_bytes
+    with _lock:
+        if _reserved_bytes + nbytes > _budget_bytes:
+            return False
+        _reserved_bytes += nbytes
+        return True
+
+
+def _release(nbytes: int) -> None:
+    global _reserved_bytes
+    with _lock:
+        _reserved_bytes -= nbytes
+
+
+def set_budget(budget_bytes: int) -> None:
+    """Set the process wide memory budget for cumulative sums. A budget of zero disables them.
+
+    Cumulative sums already built are kept until their data changes.
+    """
+    global _budget_bytes
+    with _lock:
+        _budget_bytes = max(0, budget_bytes)
+
+
+def get_reserved_bytes() -> int:
+    with _lock:
+        return _reserved_bytes
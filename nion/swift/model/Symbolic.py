@@ -26,6 +26,7 @@ from nion.swift.model import DataStructure
 from nion.swift.model import DisplayItem
 from nion.swift.model import Graphics
 from nion.swift.model import Persistence
+from nion.swift.model import Tracing
 from nion.utils import Converter
 from nion.utils import Event
 from nion.utils import Geometry
@@ -37,6 +38,15 @@ if typing.TYPE_CHECKING:
 
 _APIComputation = typing.Any
 
+# marks the threads executing a computation expression. the api returns shared read-only data, such as graphic masks,
+# to expressions instead of copies.
+_expression_thread_state = threading.local()
+
+
+def is_executing_expression() -> bool:
+    """Return whether a computation expression is executing on the current thread."""
+    return typing.cast(bool, getattr(_expression_thread_state, "is_executing_expression", False))
+
 
 class ComputationHandlerLike(typing.Protocol):
     def execute(self, **kwargs: typing.Any) -> None: ...
@@ -1785,7 +1795,8 @@ class Computation(Persistence.PersistentObject):
                         api_computation = api._new_api_object(self)
                         api_computation.api = api
                         compute_obj = compute_class(api_computation)
-                        compute_obj.execute(**kwargs)
+                        with Tracing.span("Computation.execute", "computation", {"processing_id": processing_id}):
+                            compute_obj.execute(**kwargs)
                     except Exception as e:
                         # import sys, traceback
                         # traceback.print_exc()
@@ -1820,7 +1831,8 @@ class Computation(Persistence.PersistentObject):
 
             expression = self.original_expression
             if expression:
-                error_text = self.__execute_code(api, expression, target, variables)
+                with Tracing.span("Computation.execute_code", "computation"):
+                    error_text = self.__execute_code(api, expression, target, variables)
 
             self._evaluation_count_for_test += 1
             self.last_evaluate_data_time = time.perf_counter()
@@ -1835,6 +1847,8 @@ class Computation(Persistence.PersistentObject):
         expression_lines = expression.split("\n")
         code_lines.extend(expression_lines)
         code = "\n".join(code_lines)
+        was_executing_expression = is_executing_expression()
+        _expression_thread_state.is_executing_expression = True
         try:
             compiled = compile(code, "expr", "exec")
             exec(compiled, g, l)
@@ -1844,6 +1858,8 @@ class Computation(Persistence.PersistentObject):
             # traceback.print_exc()
             # traceback.format_exception(*sys.exc_info())
             return str(e) or "Unable to evaluate script."  # a stack trace would be too much information right now
+        finally:
+            _expression_thread_state.is_executing_expression = was_executing_expression
         return None
 
     @property
@@ -2006,6 +2022,37 @@ def register_computation_type(computation_type_id: str, compute_class: typing.Ca
     _computation_types[computation_type_id] = compute_class
 
 
+class _LazyComputationType:
+    """Stand in for a compute class which is registered by calling load_fn when it is first used."""
+
+    def __init__(self, computation_type_id: str, load_fn: typing.Callable[[], typing.Any]) -> None:
+        self.__computation_type_id = computation_type_id
+        self.__load_fn = load_fn
+
+    def __get_compute_class(self) -> typing.Optional[typing.Callable[[_APIComputation], ComputationHandlerLike]]:
+        self.__load_fn()
+        compute_class = _computation_types.get(self.__computation_type_id)
+        return compute_class if compute_class is not self else None
+
+    def __call__(self, api_computation: _APIComputation) -> ComputationHandlerLike:
+        compute_class = self.__get_compute_class()
+        if not compute_class:
+            raise ValueError(f"Computation type '{self.__computation_type_id}' was not registered when loaded.")
+        return compute_class(api_computation)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        compute_class = self.__get_compute_class()
+        if not compute_class:
+            raise AttributeError(name)
+        return getattr(compute_class, name)
+
+
+def register_lazy_computation_type(computation_type_id: str, load_fn: typing.Callable[[], typing.Any]) -> None:
+    """Register a placeholder for a computation type which is registered by calling load_fn when first used."""
+    if computation_type_id not in _computation_types:
+        _computation_types[computation_type_id] = _LazyComputationType(computation_type_id, load_fn)
+
+
 # for testing
 
 def xdata_expression(expression: str) -> str:
@@ -0,0 +1,138 @@
+"""Low overhead tracing of spans of work.
+
+Spans are recorded into a ring buffer while tracing is enabled and can be exported as Chrome trace event JSON, which
+can be viewed with chrome://tracing or https://ui.perfetto.dev. When tracing is disabled, a span costs a function call
+and a test.
+
+    with Tracing.span("read data", "storage"):
+        ...
+
+    @Tracing.traced("storage")
+    def read_data(self): ...
+"""
+
+from __future__ import annotations
+
+# standard libraries
+import collections
+import contextlib
+import functools
+import json
+import os
+import pathlib
+import threading
+import time
+import typing
+
+# third party libraries
+# None
+
+# local libraries
+# None
+
+_F = typing.TypeVar("_F", bound=typing.Callable[..., typing.Any])
+
+# name, category, start time (ns), duration (ns), thread id, args.
+_SpanRecord = typing.Tuple[str, str, int, int, int, typing.Optional[typing.Mapping[str, typing.Any]]]
+
+DEFAULT_CAPACITY = 100000
+
+_enabled = False
+_records: typing.Deque[_SpanRecord] = collections.deque(maxlen=DEFAULT_CAPACITY)
+_thread_names: typing.Dict[int, str] = dict()
+_null_span = contextlib.nullcontext()
+
+
+def enable(capacity: int = DEFAULT_CAPACITY) -> None:
+    """Start recording spans, keeping the most recent capacity spans. Previously recorded spans are discarded."""
+    global _enabled, _records
+    _records = collections.deque(maxlen=capacity)
+    _thread_names.clear()
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording spans. Spans recorded so far are kept for export."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear() -> None:
+    _records.clear()
+    _thread_names.clear()
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start_ns")
+
+    def __init__(self, name: str, category: str, args: typing.Optional[typing.Mapping[str, typing.Any]]) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self) -> _Span:
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: typing.Any, exc_val: typing.Any, exc_tb: typing.Any) -> None:
+        if _enabled:
+            thread = threading.current_thread()
+            thread_id = thread.ident or 0
+            if thread_id not in _thread_names:
+                _thread_names[thread_id] = thread.name
+            # deque append is atomic, so spans may be recorded from any thread without a lock.
+            _records.append((self.name, self.category, self.start_ns, time.perf_counter_ns() - self.start_ns, thread_id, self.args))
+
+
+def span(name: str, category: str = "swift", args: typing.Optional[typing.Mapping[str, typing.Any]] = None) -> typing.ContextManager[typing.Any]:
+    """Return a context manager recording the time spent within it as a span named name.
+
+    The args are included in the exported trace event and must be JSON serializable.
+    """
+    if not _enabled:
+        return _null_span
+    return _Span(name, category, args)
+
+
+def traced(category: str = "swift", name: typing.Optional[str] = None) -> typing.Callable[[_F], _F]:
+    """Return a decorator recording each call of the function as a span, named by its qualified name by default."""
+    def decorator(fn: _F) -> _F:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(span_name, category, None):
+                return fn(*args, **kwargs)
+
+        return typing.cast(_F, wrapper)
+
+    return decorator
+
+
+def get_chrome_trace_events() -> typing.List[typing.Dict[str, typing.Any]]:
+    """Return the recorded spans as a list of Chrome trace events, oldest first."""
+    process_id = os.getpid()
+    events: typing.List[typing.Dict[str, typing.Any]] = list()
+    for thread_id, thread_name in list(_thread_names.items()):
+        events.append({"name": "thread_name", "ph": "M", "pid": process_id, "tid": thread_id, "args": {"name": thread_name}})
+    for name, category, start_ns, duration_ns, thread_id, args in list(_records):
+        event = {"name": name, "cat": category, "ph": "X", "ts": start_ns / 1000, "dur": duration_ns / 1000,
+                 "pid": process_id, "tid": thread_id}
+        if args:
+            event["args"] = dict(args)
+        events.append(event)
+    return events
+
+
+def export_chrome_trace(path: pathlib.Path) -> None:
+    """Write the recorded spans to path in the Chrome trace event JSON format."""
+    trace = {"traceEvents": get_chrome_trace_events(), "displayTimeUnit": "ms"}
+    with path.open("w") as fp:
+        json.dump(trace, fp, default=str)
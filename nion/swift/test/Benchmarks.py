@@ -0,0 +1,446 @@
+"""Headless performance benchmarks for storage, display and computation.
+
+The benchmarks use synthetic data at realistic sizes and report the time of each timed operation. Results are written
+as JSON so that they can be kept as a baseline and compared against later runs.
+
+    python -m nion.swift.test.Benchmarks run --output baseline.json
+    python -m nion.swift.test.Benchmarks run --output current.json
+    python -m nion.swift.test.Benchmarks compare baseline.json current.json
+
+The compare command exits with a non-zero status if any benchmark is slower than the baseline by more than the
+threshold. Use --scale quick for a smaller run and --filter to run a subset of benchmarks by name.
+"""
+
+from __future__ import annotations
+
+# standard libraries
+import argparse
+import contextlib
+import dataclasses
+import datetime
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import typing
+import uuid
+
+# third party libraries
+import numpy
+
+# local libraries
+from nion.data import DataAndMetadata
+from nion.swift import Application
+from nion.swift import Facade
+from nion.swift import HistogramPanel
+from nion.swift import Thumbnails
+from nion.swift.model import Cache
+from nion.swift.model import DataItem
+from nion.swift.model import DisplayItem
+from nion.swift.model import DocumentModel
+from nion.swift.model import FileStorageSystem
+from nion.swift.model import HDF5Handler
+from nion.swift.model import NDataHandler
+from nion.swift.model import Profile
+from nion.swift.test import TestContext
+from nion.ui import TestUI
+
+
+Facade.initialize()
+
+RESULTS_VERSION = 1
+
+_TimedFn = typing.Callable[[], None]
+_BenchmarkFn = typing.Callable[["BenchmarkSizes", pathlib.Path], typing.ContextManager[_TimedFn]]
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchmarkSizes:
+    image_shape: typing.Tuple[int, int]
+    spectrum_length: int
+    four_d_shape: typing.Tuple[int, int, int, int]
+    project_item_count: int
+
+
+SCALES = {
+    "full": BenchmarkSizes((4096, 4096), 2048, (256, 256, 128, 128), 200),
+    "quick": BenchmarkSizes((1024, 1024), 2048, (32, 32, 128, 128), 40),
+}
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    name: str
+    times: typing.List[float]
+
+    @property
+    def minimum(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return {"min": self.minimum, "median": self.median, "mean": statistics.mean(self.times), "times": list(self.times)}
+
+
+@dataclasses.dataclass
+class BenchmarkComparison:
+    name: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline > 0 else 1.0
+
+    @property
+    def is_regression(self) -> bool:
+        return self.ratio > 1.0 + self.threshold
+
+
+_benchmarks: typing.Dict[str, _BenchmarkFn] = dict()
+
+
+def benchmark(name: str) -> typing.Callable[[typing.Callable[..., typing.Iterator[_TimedFn]]], _BenchmarkFn]:
+    """Register a benchmark.
+
+    The decorated function is passed the sizes and a temporary directory. It sets up, yields the operation to be timed,
+    and cleans up after the yield.
+    """
+    def decorator(fn: typing.Callable[..., typing.Iterator[_TimedFn]]) -> _BenchmarkFn:
+        benchmark_fn = typing.cast(_BenchmarkFn, contextlib.contextmanager(fn))
+        _benchmarks[name] = benchmark_fn
+        return benchmark_fn
+    return decorator
+
+
+def get_benchmark_names() -> typing.List[str]:
+    return list(_benchmarks.keys())
+
+
+def _random_data(shape: typing.Sequence[int]) -> numpy.typing.NDArray[numpy.float32]:
+    return numpy.random.default_rng(0).random(shape, dtype=numpy.float32)
+
+
+def _open_profile(directory: pathlib.Path) -> Profile.Profile:
+    profile_path = directory / "Profile.nsprof"
+    is_new = not profile_path.exists()
+    if is_new:
+        profile_path.write_text(json.dumps({"version": FileStorageSystem.PROFILE_VERSION, "uuid": str(uuid.uuid4())}), "utf-8")
+    storage_system = FileStorageSystem.FilePersistentStorageSystem(profile_path)
+    storage_system.load_properties()
+    storage_cache = Cache.DbStorageCache(directory / "Profile Cache.nscache")
+    profile = Profile.Profile(storage_system=storage_system, storage_cache=storage_cache)
+    profile.read_profile()
+    if is_new:
+        profile.create_project(directory, "Benchmark")
+    return profile
+
+
+@contextlib.contextmanager
+def _open_document_model(directory: pathlib.Path) -> typing.Iterator[DocumentModel.DocumentModel]:
+    profile = _open_profile(directory)
+    try:
+        project_reference = profile.project_references[0]
+        profile.read_project(project_reference)
+        document_model = project_reference.document_model
+        assert document_model
+        with document_model.ref():
+            yield document_model
+    finally:
+        profile.close()
+
+
+def _display_values(xdata: DataAndMetadata.DataAndMetadata, collection_index: typing.Optional[DataAndMetadata.PositionType] = None) -> DisplayItem.DisplayValues:
+    return DisplayItem.DisplayValues(xdata, 0, collection_index, 0, 1, None, None, None, 0.0, 1.0, list())
+
+
+@benchmark("storage.ndata.write_image")
+def _ndata_write_image(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+    data = _random_data(sizes.image_shape)
+    handler = NDataHandler.NDataHandler(directory / "image.ndata")
+    try:
+        yield lambda: handler.write_data(data, datetime.datetime.utcnow())
+    finally:
+        handler.close()
+
+
+@benchmark("storage.ndata.read_image")
+def _ndata_read_image(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+    handler = NDataHandler.NDataHandler(directory / "image.ndata")
+    try:
+        handler.write_data(_random_data(sizes.image_shape), datetime.datetime.utcnow())
+        yield lambda: numpy.array(handler.read_data())
+    finally:
+        handler.close()
+
+
+@benchmark("storage.hdf5.write_image")
+def _hdf5_write_image(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+    data = _random_data(sizes.image_shape)
+    handler = HDF5Handler.HDF5Handler(directory / "image.h5")
+    try:
+        yield lambda: handler.write_data(data, datetime.datetime.utcnow())
+    finally:
+        handler.close()
+
+
+@benchmark("storage.hdf5.read_image")
+def _hdf5_read_image(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+    handler = HDF5Handler.HDF5Handler(directory / "image.h5")
+    try:
+        handler.write_data(_random_data(sizes.image_shape), datetime.datetime.utcnow())
+        yield lambda: numpy.array(handler.read_data())  # h5py datasets are read lazily
+    finally:
+        handler.close()
+
+
+@benchmark("storage.partial_update_4d_row")
+def _partial_update_4d_row(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+    # write one scan row of frames into a reserved 4d data item per iteration, as during an acquisition.
+    with _open_document_model(directory) as document_model:
+        data_item = DataItem.DataItem(large_format=True)
+        document_model.append_data_item(data_item)
+        data_item.reserve_data(data_shape=sizes.four_d_shape, data_dtype=numpy.float32, data_descriptor=DataAndMetadata.DataDescriptor(False, 2, 2))
+        data_metadata = data_item.data_and_metadata.data_metadata
+        row_xdata = DataAndMetadata.new_data_and_metadata(_random_data((1,) + sizes.four_d_shape[1:]))
+        rows = sizes.four_d_shape[0]
+        row_index = 0
+        data_item.increment_data_ref_count()
+        document_model.begin_data_item_live(data_item)
+        try:
+            def update_row() -> None:
+                nonlocal row_index
+                document_model.update_data_item_partial(data_item, data_metadata, row_xdata, [slice(0, 1)], [slice(row_index, row_index + 1)])
+                document_model.perform_data_item_updates()
+                row_index = (row_index + 1) % rows
+
+            yield update_row
+        finally:
+            document_model.end_data_item_live(data_item)
+            data_item.decrement_data_ref_count()
+
+
+@benchmark("project.open")
+def _project_open(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+    # a project of mostly spectra with one image in ten.
+    with _open_document_model(directory) as document_model:
+        for i in range(sizes.project_item_count):
+            shape = sizes.image_shape if i % 10 == 0 else (sizes.spectrum_length,)
+            document_model.append_data_item(DataItem.DataItem(_random_data(shape)))
+
+    def open_project() -> None:
+        with _open_document_model(directory) as document_model:
+            assert len(document_model.data_items) == sizes.project_item_count
+
+    yield open_project
+
+
+def _display_stage_benchmark(name: str, stage: str, shape_fn: typing.Callable[[BenchmarkSizes], typing.Sequence[int]]) -> None:
+    # each iteration uses new display values so that the stage and the stages before it are calculated.
+    def display_stage(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+        xdata = DataAndMetadata.new_data_and_metadata(_random_data(shape_fn(sizes)))
+
+        def calculate() -> None:
+            display_values = _display_values(xdata)
+            getattr(display_values, stage)
+            display_values.finalize()
+
+        yield calculate
+
+    benchmark(name)(display_stage)
+
+
+for _stage in ("element_data_and_metadata", "display_data_and_metadata", "data_range", "display_rgba"):
+    _display_stage_benchmark(f"display.image.{_stage}", _stage, lambda sizes: sizes.image_shape)
+_display_stage_benchmark("display.spectrum.display_data_and_metadata", "display_data_and_metadata", lambda sizes: (sizes.spectrum_length,))
+
+
+@benchmark("display.4d.element_data_and_metadata")
+def _display_4d_element(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+    # extract the frame at a collection index from a 4d data item stored in hdf5, as when browsing a 4d data set.
+    with _open_document_model(directory) as document_model:
+        data_item = DataItem.DataItem(large_format=True)
+        document_model.append_data_item(data_item)
+        data_item.reserve_data(data_shape=sizes.four_d_shape, data_dtype=numpy.float32, data_descriptor=DataAndMetadata.DataDescriptor(False, 2, 2))
+        with data_item.data_ref():
+            xdata = data_item.xdata
+            assert xdata
+            index = 0
+
+            def calculate() -> None:
+                nonlocal index
+                position = (index % sizes.four_d_shape[0], index % sizes.four_d_shape[1])
+                display_values = _display_values(xdata, position)
+                display_values.element_data_and_metadata
+                display_values.finalize()
+                index += 1
+
+            yield calculate
+
+
+@benchmark("display.histogram.image")
+def _histogram_image(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+    with TestContext.create_memory_context() as test_context:
+        document_controller = test_context.create_document_controller_with_application()
+        document_model = document_controller.document_model
+        data_list = [_random_data(sizes.image_shape), _random_data(sizes.image_shape) * 2]
+        data_item = DataItem.DataItem(data_list[0])
+        document_model.append_data_item(data_item)
+        display_item = document_model.get_display_item_for_data_item(data_item)
+        histogram_panel = HistogramPanel.HistogramPanel(document_controller, "histogram-panel", None, debounce=False, sample=False)
+        with contextlib.closing(histogram_panel):
+            document_controller.show_display_item(display_item)
+            index = 0
+
+            def update_histogram() -> None:
+                nonlocal index
+                index += 1
+                data_item.set_data(data_list[index % 2])
+                histogram_panel._histogram_widget._histogram_data_func_value_model._run_until_complete()
+
+            yield update_histogram
+
+
+@benchmark("display.thumbnail.image")
+def _thumbnail_image(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+    with TestContext.create_memory_context() as test_context:
+        document_model = test_context.create_document_model()
+        data_item = DataItem.DataItem(_random_data(sizes.image_shape))
+        document_model.append_data_item(data_item)
+        display_item = document_model.get_display_item_for_data_item(data_item)
+        assert display_item
+        display_item.display_data_channels[0].get_calculated_display_values(True)
+        ui = TestUI.UserInterface()
+        thumbnail_processor = Thumbnails.ThumbnailProcessor(display_item)
+        with contextlib.closing(thumbnail_processor):
+            yield lambda: thumbnail_processor.recompute_data(ui)
+
+
+def _computation_benchmark(name: str, processing_fn_name: str) -> None:
+    def computation(sizes: BenchmarkSizes, directory: pathlib.Path) -> typing.Iterator[_TimedFn]:
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data_list = [_random_data(sizes.image_shape), _random_data(sizes.image_shape) * 2]
+            data_item = DataItem.DataItem(data_list[0])
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            getattr(document_model, processing_fn_name)(display_item, data_item)
+            document_model.recompute_all()
+            index = 0
+
+            def recompute() -> None:
+                nonlocal index
+                index += 1
+                data_item.set_data(data_list[index % 2])
+                document_model.recompute_all()
+
+            yield recompute
+
+    benchmark(name)(computation)
+
+
+_computation_benchmark("compute.image.gaussian_blur", "get_gaussian_blur_new")
+_computation_benchmark("compute.image.fft", "get_fft_new")
+
+
+def run_benchmark(name: str, sizes: BenchmarkSizes, repeat: int = 5, warmup: int = 1) -> BenchmarkResult:
+    """Run the named benchmark, returning the times of each timed repetition after warming up."""
+    benchmark_fn = _benchmarks[name]
+    times: typing.List[float] = list()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with benchmark_fn(sizes, pathlib.Path(temp_dir)) as timed_fn:
+            for i in range(warmup):
+                timed_fn()
+            for i in range(repeat):
+                start = time.perf_counter()
+                timed_fn()
+                times.append(time.perf_counter() - start)
+    return BenchmarkResult(name, times)
+
+
+def run_benchmarks(sizes: BenchmarkSizes, *, names: typing.Optional[typing.Sequence[str]] = None, repeat: int = 5,
+                   warmup: int = 1, on_result: typing.Optional[typing.Callable[[BenchmarkResult], None]] = None) -> typing.List[BenchmarkResult]:
+    results = list()
+    for name in (names if names is not None else get_benchmark_names()):
+        result = run_benchmark(name, sizes, repeat, warmup)
+        if callable(on_result):
+            on_result(result)
+        results.append(result)
+    return results
+
+
+def make_results_dict(results: typing.Sequence[BenchmarkResult], sizes: BenchmarkSizes, scale: typing.Optional[str] = None) -> typing.Dict[str, typing.Any]:
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.datetime.utcnow().isoformat(),
+        "machine": {"platform": platform.platform(), "processor": platform.processor(), "python": platform.python_version(), "numpy": numpy.__version__},
+        "scale": scale,
+        "sizes": dataclasses.asdict(sizes),
+        "results": {result.name: result.to_dict() for result in results},
+    }
+
+
+def compare_results(baseline: typing.Mapping[str, typing.Any], current: typing.Mapping[str, typing.Any], threshold: float = 0.1) -> typing.List[BenchmarkComparison]:
+    """Compare the median times of the benchmarks present in both results dicts."""
+    if baseline.get("sizes") != current.get("sizes"):
+        raise ValueError("Benchmark results were run with different sizes.")
+    comparisons = list()
+    baseline_results = baseline.get("results", dict())
+    current_results = current.get("results", dict())
+    for name, current_result in current_results.items():
+        baseline_result = baseline_results.get(name)
+        if baseline_result:
+            comparisons.append(BenchmarkComparison(name, baseline_result["median"], current_result["median"], threshold))
+    return comparisons
+
+
+def _format_result(result: BenchmarkResult) -> str:
+    return f"{result.name:<48} median {result.median * 1000:10.2f} ms  min {result.minimum * 1000:10.2f} ms"
+
+
+def _format_comparison(comparison: BenchmarkComparison) -> str:
+    flag = "  REGRESSION" if comparison.is_regression else ""
+    return f"{comparison.name:<48} {comparison.baseline * 1000:10.2f} ms -> {comparison.current * 1000:10.2f} ms  x{comparison.ratio:5.2f}{flag}"
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m nion.swift.test.Benchmarks", description="Run or compare Nion Swift performance benchmarks.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--scale", choices=list(SCALES.keys()), default="full")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this text")
+    run_parser.add_argument("--output", type=pathlib.Path, default=None, help="write results to this JSON file")
+    compare_parser = subparsers.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline", type=pathlib.Path)
+    compare_parser.add_argument("current", type=pathlib.Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="fractional slow down reported as a regression")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        # an application is required for the ui related benchmarks.
+        app = Application.Application(TestUI.UserInterface(), set_global=False)
+        sizes = SCALES[args.scale]
+        names = [name for name in get_benchmark_names() if not args.filter or args.filter in name]
+        results = run_benchmarks(sizes, names=names, repeat=args.repeat, on_result=lambda result: print(_format_result(result), flush=True))
+        if args.output:
+            args.output.write_text(json.dumps(make_results_dict(results, sizes, args.scale), indent=2), "utf-8")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text("utf-8"))
+    current = json.loads(args.current.read_text("utf-8"))
+    comparisons = compare_results(baseline, current, args.threshold)
+    for comparison in comparisons:
+        print(_format_comparison(comparison))
+    return 1 if any(comparison.is_regression for comparison in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# standard libraries
+import json
+import logging
+import pathlib
+import tempfile
+import unittest
+
+# third party libraries
+# None
+
+# local libraries
+from nion.swift import Application
+from nion.swift.test import Benchmarks
+from nion.swift.test import TestContext
+from nion.ui import TestUI
+
+
+class TestBenchmarksClass(unittest.TestCase):
+
+    def setUp(self):
+        TestContext.begin_leaks()
+        self.app = Application.Application(TestUI.UserInterface(), set_global=False)
+        self.sizes = Benchmarks.BenchmarkSizes((16, 16), 32, (2, 2, 4, 4), 4)
+
+    def tearDown(self):
+        TestContext.end_leaks(self)
+
+    def test_each_benchmark_runs_at_small_sizes_and_cleans_up(self):
+        results = Benchmarks.run_benchmarks(self.sizes, repeat=2)
+        self.assertEqual(Benchmarks.get_benchmark_names(), [result.name for result in results])
+        for result in results:
+            self.assertEqual(2, len(result.times))
+            self.assertLessEqual(result.minimum, result.median)
+
+    def test_compare_reports_regressions_beyond_threshold(self):
+        baseline_results = [Benchmarks.BenchmarkResult("a", [1.0]), Benchmarks.BenchmarkResult("b", [1.0])]
+        current_results = [Benchmarks.BenchmarkResult("a", [1.05]), Benchmarks.BenchmarkResult("b", [1.5]), Benchmarks.BenchmarkResult("c", [1.0])]
+        baseline = Benchmarks.make_results_dict(baseline_results, self.sizes)
+        current = Benchmarks.make_results_dict(current_results, self.sizes)
+        comparisons = {comparison.name: comparison for comparison in Benchmarks.compare_results(baseline, current, 0.1)}
+        self.assertEqual({"a", "b"}, set(comparisons.keys()))
+        self.assertFalse(comparisons["a"].is_regression)
+        self.assertTrue(comparisons["b"].is_regression)
+        self.assertAlmostEqual(1.5, comparisons["b"].ratio)
+
+    def test_compare_refuses_results_with_different_sizes(self):
+        baseline = Benchmarks.make_results_dict([Benchmarks.BenchmarkResult("a", [1.0])], self.sizes)
+        current = Benchmarks.make_results_dict([Benchmarks.BenchmarkResult("a", [1.0])], Benchmarks.SCALES["quick"])
+        with self.assertRaises(ValueError):
+            Benchmarks.compare_results(baseline, current)
+
+    def test_compare_command_returns_failure_on_regression(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            baseline_path = pathlib.Path(temp_dir) / "baseline.json"
+            current_path = pathlib.Path(temp_dir) / "current.json"
+            baseline_path.write_text(json.dumps(Benchmarks.make_results_dict([Benchmarks.BenchmarkResult("a", [1.0])], self.sizes)))
+            current_path.write_text(json.dumps(Benchmarks.make_results_dict([Benchmarks.BenchmarkResult("a", [0.9])], self.sizes)))
+            self.assertEqual(0, Benchmarks.main(["compare", str(baseline_path), str(current_path)]))
+            self.assertEqual(1, Benchmarks.main(["compare", str(current_path), str(baseline_path)]))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -1182,6 +1182,52 @@ class TestDataItemClass(unittest.TestCase):
             # data_item.set_data(numpy.zeros((2, 2)))
             self.assertGreater(data_item.modified, modified)
 
+    def test_queued_partial_updates_are_applied_with_one_data_change(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data_item = DataItem.DataItem(numpy.zeros((8, 4), numpy.float32))
+            document_model.append_data_item(data_item)
+            source_xdata = DataAndMetadata.new_data_and_metadata(numpy.arange(32, dtype=numpy.float32).reshape(8, 4))
+            other_xdata = DataAndMetadata.new_data_and_metadata(numpy.full((1, 4), -1, numpy.float32))
+            data_metadata = data_item.xdata.data_metadata
+            for row in range(6):
+                data_item.queue_partial_update(source_xdata, src_slice=[slice(row, row + 1)], dst_slice=[slice(row, row + 1)], metadata=data_metadata)
+            data_item.queue_partial_update(other_xdata, src_slice=[slice(0, 1)], dst_slice=[slice(7, 8)], metadata=data_metadata)
+            data_changed_count = 0
+
+            def data_changed() -> None:
+                nonlocal data_changed_count
+                data_changed_count += 1
+
+            with contextlib.closing(data_item.data_changed_event.listen(data_changed)):
+                data_item.update_to_pending_xdata()
+            self.assertEqual(1, data_changed_count)
+            expected = numpy.zeros((8, 4), numpy.float32)
+            expected[0:6] = source_xdata.data[0:6]
+            expected[7] = -1
+            self.assertTrue(numpy.array_equal(expected, data_item.data))
+
+    def test_coalesce_partial_updates_merges_adjacent_rows_and_drops_overwritten_updates(self):
+        xdata = DataAndMetadata.new_data_and_metadata(numpy.zeros((8, 4)))
+        other_xdata = DataAndMetadata.new_data_and_metadata(numpy.zeros((8, 4)))
+        # adjacent and overlapping rows from the same source merge into one update
+        partial_updates = [(xdata, [slice(i, i + 2)], [slice(i, i + 2)]) for i in range(4)]
+        coalesced = DataItem.coalesce_partial_updates(partial_updates, (8, 4))
+        self.assertEqual(1, len(coalesced))
+        self.assertEqual([slice(0, 5), slice(0, 4)], list(coalesced[0][1]))
+        self.assertEqual([slice(0, 5), slice(0, 4)], list(coalesced[0][2]))
+        # rows with a different source to destination offset or from another source do not merge
+        partial_updates = [(xdata, [slice(0, 1)], [slice(0, 1)]), (xdata, [slice(1, 2)], [slice(2, 3)]), (other_xdata, [slice(2, 3)], [slice(3, 4)])]
+        self.assertEqual(3, len(DataItem.coalesce_partial_updates(partial_updates, (8, 4))))
+        # an update completely overwritten by a later update is dropped
+        partial_updates = [(xdata, [slice(2, 3)], [slice(2, 3)]), (other_xdata, [slice(0, 8)], [slice(0, 8)])]
+        coalesced = DataItem.coalesce_partial_updates(partial_updates, (8, 4))
+        self.assertEqual(1, len(coalesced))
+        self.assertIs(other_xdata, coalesced[0][0])
+        # strided slices are left alone
+        partial_updates = [(xdata, [slice(0, 8, 2)], [slice(0, 8, 2)]), (xdata, [slice(1, 8, 2)], [slice(1, 8, 2)])]
+        self.assertEqual(partial_updates, DataItem.coalesce_partial_updates(partial_updates, (8, 4)))
+
     def test_changing_data_updates_xdata_timestamp(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()
@@ -17,6 +17,7 @@ from nion.swift.model import DataGroup
 from nion.swift.model import DataItem
 from nion.swift.model import DocumentModel
 from nion.swift.test import TestContext
+from nion.ui import DrawingContext
 from nion.ui import TestUI
 from nion.utils import Geometry
 from nion.utils import ListModel
@@ -635,6 +636,54 @@ class TestDataPanelClass(unittest.TestCase):
             data_panel.data_list_controller.scroll_bar_canvas_item.simulate_drag((8, 8), (24, 8))
             self.assertEqual(data_panel.data_list_controller.scroll_area_canvas_item.content.canvas_rect, Geometry.IntRect((-80, 0), (800, 304)))
 
+    def test_data_panel_releases_thumbnails_far_from_visible_items(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            for _ in range(60):
+                document_model.append_data_item(DataItem.DataItem(numpy.zeros((8, 8), numpy.uint32)))
+            document_controller.periodic()
+            data_panel = document_controller.find_dock_panel("data-panel")
+            data_list_controller = data_panel.data_list_controller
+            data_list_controller.thumbnail_margin = 4
+            canvas_item = data_panel._data_list_widget.content_widget.children[0].canvas_item
+            canvas_size = Geometry.IntSize(width=320, height=160)
+            canvas_item.layout_immediate(canvas_size)
+            canvas_item.repaint_immediate(DrawingContext.DrawingContext(), canvas_size)
+            document_controller.periodic()
+            display_item_adapters = data_list_controller.display_item_adapters
+            self.assertTrue(display_item_adapters[0].has_thumbnail)
+            self.assertFalse(display_item_adapters[30].has_thumbnail)
+            # scroll to the end; the thumbnails at the start are released.
+            content = data_list_controller.scroll_area_canvas_item.content
+            content.update_layout(Geometry.IntPoint(y=-(60 * 80 - 160), x=0), content.canvas_size)
+            canvas_item.repaint_immediate(DrawingContext.DrawingContext(), canvas_size)
+            document_controller.periodic()
+            self.assertFalse(display_item_adapters[0].has_thumbnail)
+            self.assertTrue(display_item_adapters[59].has_thumbnail)
+            self.assertLessEqual(sum(display_item_adapter.has_thumbnail for display_item_adapter in display_item_adapters), 12)
+
+    def test_data_panel_item_drawing_is_cached_until_item_changes(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            data_item = DataItem.DataItem(numpy.zeros((8, 8), numpy.uint32))
+            data_item.title = "one"
+            document_model.append_data_item(data_item)
+            document_controller.periodic()
+            data_panel = document_controller.find_dock_panel("data-panel")
+            display_item_adapter = data_panel.data_list_controller.display_item_adapters[0]
+            rect = Geometry.IntRect.from_tlhw(0, 0, 80, 300)
+            drawing_context1 = DrawingContext.DrawingContext()
+            display_item_adapter.draw_list_item(drawing_context1, rect)
+            drawing_context2 = DrawingContext.DrawingContext()
+            display_item_adapter.draw_list_item(drawing_context2, rect)
+            self.assertEqual(drawing_context1.commands, drawing_context2.commands)
+            data_item.title = "two"
+            drawing_context3 = DrawingContext.DrawingContext()
+            display_item_adapter.draw_list_item(drawing_context3, rect)
+            self.assertTrue(any("two" in str(command) for command in drawing_context3.commands))
+
     def test_data_panel_grid_contents_resize_properly(self):
         with TestContext.create_memory_context() as test_context:
             document_controller = test_context.create_document_controller()
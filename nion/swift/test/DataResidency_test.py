@@ -0,0 +1,85 @@
+# standard libraries
+import logging
+import unittest
+
+# third party libraries
+import numpy
+
+# local libraries
+from nion.swift import Application
+from nion.swift.model import DataItem
+from nion.swift.model import DataResidency
+from nion.swift.test import TestContext
+from nion.ui import TestUI
+
+
+class TestDataResidencyClass(unittest.TestCase):
+
+    def setUp(self):
+        TestContext.begin_leaks()
+        self.app = Application.Application(TestUI.UserInterface(), set_global=False)
+        # each data item below is 8 x 8 x 8 bytes = 512 bytes
+        DataResidency.set_budget(1024)
+        DataResidency.get_residency_manager().reset_statistics()
+
+    def tearDown(self):
+        DataResidency.set_budget(0)
+        DataResidency.get_residency_manager().reset_statistics()
+        TestContext.end_leaks(self)
+
+    def test_released_data_stays_resident_and_is_reused(self):
+        with TestContext.MemoryProfileContext() as profile_context:
+            document_model = profile_context.create_document_model()
+            data_item = DataItem.DataItem(numpy.ones((8, 8)))
+            document_model.append_data_item(data_item)
+            self.assertTrue(data_item.is_data_loaded)
+            self.assertEqual(512, DataResidency.get_statistics().resident_bytes)
+            with data_item.data_ref() as data_ref:
+                self.assertTrue(numpy.array_equal(numpy.ones((8, 8)), data_ref.data))
+            statistics = DataResidency.get_statistics()
+            self.assertEqual(1, statistics.hits)
+            self.assertEqual(0, statistics.misses)
+            self.assertEqual(1, statistics.resident_count)
+
+    def test_least_recently_used_data_is_evicted_when_over_budget(self):
+        with TestContext.MemoryProfileContext() as profile_context:
+            document_model = profile_context.create_document_model()
+            data_items = [DataItem.DataItem(numpy.full((8, 8), i, numpy.float64)) for i in range(3)]
+            for data_item in data_items:
+                document_model.append_data_item(data_item)
+            self.assertEqual([False, True, True], [data_item.is_data_loaded for data_item in data_items])
+            statistics = DataResidency.get_statistics()
+            self.assertEqual(2, statistics.resident_count)
+            self.assertEqual(1024, statistics.resident_bytes)
+            self.assertEqual(1, statistics.evictions)
+            # loading the evicted item is a miss and evicts the next least recently used item when released
+            with data_items[0].data_ref() as data_ref:
+                self.assertEqual(0, data_ref.data[0, 0])
+            self.assertEqual([True, False, True], [data_item.is_data_loaded for data_item in data_items])
+            self.assertEqual(1, DataResidency.get_statistics().misses)
+
+    def test_data_is_unloaded_when_budget_is_zero(self):
+        with TestContext.MemoryProfileContext() as profile_context:
+            document_model = profile_context.create_document_model()
+            data_item = DataItem.DataItem(numpy.ones((8, 8)))
+            document_model.append_data_item(data_item)
+            self.assertTrue(data_item.is_data_loaded)
+            DataResidency.set_budget(0)
+            self.assertFalse(data_item.is_data_loaded)
+            self.assertEqual(0, DataResidency.get_statistics().resident_bytes)
+
+    def test_replacing_data_releases_previous_resident_data(self):
+        with TestContext.MemoryProfileContext() as profile_context:
+            document_model = profile_context.create_document_model()
+            data_item = DataItem.DataItem(numpy.ones((8, 8)))
+            document_model.append_data_item(data_item)
+            data_item.set_data(numpy.zeros((4, 4)))
+            statistics = DataResidency.get_statistics()
+            self.assertEqual(1, statistics.resident_count)
+            self.assertEqual(128, statistics.resident_bytes)
+            self.assertTrue(numpy.array_equal(numpy.zeros((4, 4)), data_item.data))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
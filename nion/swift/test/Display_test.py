@@ -461,6 +461,83 @@ class TestDisplayClass(unittest.TestCase):
                     display_rgba = display_data_channel.get_calculated_display_values(True).display_rgba
                     self.assertTrue(display_rgba.dtype == numpy.uint32)
 
+    def test_display_rgba_of_integer_data_matches_display_rgba_of_float_data(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            rng = numpy.random.default_rng(0)
+            for dtype, high in ((numpy.uint8, 256), (numpy.uint16, 1000)):
+                data = rng.integers(0, high, (64, 64)).astype(dtype)
+                display_data_channels = list()
+                for d in (data, data.astype(float)):
+                    data_item = DataItem.DataItem(d)
+                    document_model.append_data_item(data_item)
+                    display_item = document_model.get_display_item_for_data_item(data_item)
+                    display_data_channels.append(display_item.display_data_channels[0])
+                for adjustments in ([], [{"type": "gamma", "gamma": 0.6}], [{"type": "log"}], [{"type": "equalized"}]):
+                    for display_data_channel in display_data_channels:
+                        display_data_channel.adjustments = [dict(adjustment, uuid=str(uuid.uuid4())) for adjustment in adjustments]
+                        display_data_channel.color_map_id = "magma"
+                        display_data_channel.brightness = 0.2
+                        display_data_channel.contrast = 1.5
+                    display_rgba = display_data_channels[0].get_calculated_display_values(True).display_rgba
+                    expected_display_rgba = display_data_channels[1].get_calculated_display_values(True).display_rgba
+                    self.assertTrue(numpy.array_equal(expected_display_rgba, display_rgba))
+
+    def test_superseded_display_values_are_abandoned_in_favor_of_latest_display_values(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data = numpy.arange(5 * 8 * 8, dtype=numpy.float32).reshape(5, 8, 8)
+            data_item = DataItem.new_data_item(DataAndMetadata.new_data_and_metadata(data, data_descriptor=DataAndMetadata.DataDescriptor(True, 0, 2)))
+            document_model.append_data_item(data_item)
+            display_data_channel = document_model.get_display_item_for_data_item(data_item).display_data_channels[0]
+            display_data_channel.sequence_index = 1
+            calculated_display_values = display_data_channel.get_calculated_display_values()
+            calculated_data_range = calculated_display_values.data_range
+            intermediate_display_values = list()
+            for sequence_index in (2, 3, 4):
+                display_data_channel.sequence_index = sequence_index
+                intermediate_display_values.append(display_data_channel.get_calculated_display_values())
+            latest_display_values = intermediate_display_values[-1]
+            # values already calculated are kept
+            self.assertEqual(calculated_data_range, calculated_display_values.data_range)
+            self.assertFalse(calculated_display_values.is_abandoned)
+            # values not yet calculated come from the latest display values
+            self.assertTrue(numpy.array_equal(data[4], intermediate_display_values[0].display_data_and_metadata.data))
+            self.assertTrue(intermediate_display_values[0].is_abandoned)
+            self.assertIs(latest_display_values.display_rgba, calculated_display_values.display_rgba)
+            self.assertTrue(calculated_display_values.is_abandoned)
+            # once abandoned, all values come from the latest display values
+            self.assertIs(latest_display_values.display_data_and_metadata, calculated_display_values.display_data_and_metadata)
+            self.assertEqual(latest_display_values.data_range, calculated_display_values.data_range)
+            self.assertFalse(latest_display_values.is_abandoned)
+
+    def test_display_stages_are_shared_between_display_items_of_same_data_item(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data = numpy.arange(4 * 8 * 8, dtype=numpy.float32).reshape(4, 8, 8)
+            data_item = DataItem.new_data_item(DataAndMetadata.new_data_and_metadata(data, data_descriptor=DataAndMetadata.DataDescriptor(True, 0, 2)))
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            display_item_copy = document_model.get_display_item_copy_new(display_item)
+            display_data_channel = display_item.display_data_channels[0]
+            display_data_channel_copy = display_item_copy.display_data_channels[0]
+            display_stage_cache = data_item.display_stage_cache
+            calculation_count = display_stage_cache.calculation_count
+            display_values = display_data_channel.get_calculated_display_values()
+            display_values_copy = display_data_channel_copy.get_calculated_display_values()
+            self.assertIsNot(display_values, display_values_copy)
+            self.assertEqual(display_values.data_range, display_values_copy.data_range)
+            self.assertIs(display_values.display_data_and_metadata, display_values_copy.display_data_and_metadata)
+            # element data, display data and data range are calculated once for both display items
+            self.assertEqual(calculation_count + 3, display_stage_cache.calculation_count)
+            # a different sequence index is calculated separately
+            display_data_channel_copy.sequence_index = 2
+            self.assertTrue(numpy.array_equal(data[2], display_data_channel_copy.get_calculated_display_values().display_data_and_metadata.data))
+            self.assertEqual(calculation_count + 5, display_stage_cache.calculation_count)
+            # changing the data discards the shared stages
+            data_item.set_xdata(DataAndMetadata.new_data_and_metadata(data + 1, data_descriptor=DataAndMetadata.DataDescriptor(True, 0, 2)))
+            self.assertEqual((1, 64), display_data_channel.get_calculated_display_values().data_range)
+
     def test_reset_display_limits_on_various_value_types_write_to_clean_json(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()
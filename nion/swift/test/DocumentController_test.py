@@ -2,6 +2,9 @@
 import contextlib
 import gc
 import logging
+import pathlib
+import tempfile
+import time
 import unittest
 import weakref
 
@@ -221,6 +224,30 @@ class TestDocumentControllerClass(unittest.TestCase):
             self.assertEqual(document_model.data_items.index(new_data_items[0]), 3)
             self.assertEqual(data_group.display_items.index(document_model.get_display_item_for_data_item(new_data_items[0])), 2)
 
+    def test_receive_files_reads_multiple_files_in_order_and_skips_unreadable_files(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_paths = list()
+                for i in range(6):
+                    file_path = pathlib.Path(temp_dir) / f"data{i}.npy"
+                    numpy.save(str(file_path), numpy.full((4, 4), i, numpy.float32))
+                    file_paths.append(str(file_path))
+                bad_file_path = pathlib.Path(temp_dir) / "bad.npy"
+                bad_file_path.write_bytes(b"not numpy")
+                file_paths.insert(3, str(bad_file_path))
+                new_data_items = document_controller.receive_files(file_paths, threaded=False)
+                self.assertEqual(6, len(new_data_items))
+                self.assertEqual(new_data_items, list(document_model.data_items))
+                for i, data_item in enumerate(new_data_items):
+                    self.assertTrue(numpy.array_equal(numpy.full((4, 4), i, numpy.float32), data_item.data))
+                # the data is written to storage in the background, before the files are removed.
+                start_time = time.perf_counter()
+                while any(data_item.has_lazy_data for data_item in new_data_items) and time.perf_counter() - start_time < 10.0:
+                    time.sleep(0.01)
+                self.assertFalse(any(data_item.has_lazy_data for data_item in new_data_items))
+
     def test_remove_graphic_removes_it_from_data_item(self):
         with TestContext.create_memory_context() as test_context:
             document_controller = test_context.create_document_controller()
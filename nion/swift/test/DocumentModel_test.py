@@ -82,6 +82,32 @@ class TestDocumentModelClass(unittest.TestCase):
             self.assertEqual(data_group.counted_display_items[display_item1], 0)
             self.assertEqual(data_group.counted_display_items[display_item2], 1)
 
+    def test_items_are_found_by_uuid_until_removed(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            data_item = DataItem.DataItem(numpy.zeros((8, 8)))
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            graphic = Graphics.PointGraphic()
+            display_item.add_graphic(graphic)
+            data_group = DataGroup.DataGroup()
+            document_model.append_data_group(data_group)
+            child_data_group = DataGroup.DataGroup()
+            data_group.append_data_group(child_data_group)
+            self.assertEqual(data_item, document_model.get_data_item_by_uuid(data_item.uuid))
+            self.assertEqual(display_item, document_model.get_display_item_by_uuid(display_item.uuid))
+            self.assertEqual(display_item.display_data_channels[0], document_model.get_display_data_channel_by_uuid(display_item.display_data_channels[0].uuid))
+            self.assertEqual(graphic, document_model.get_graphic_by_uuid(graphic.uuid))
+            self.assertEqual(child_data_group, document_model.get_data_group_by_uuid(child_data_group.uuid))
+            self.assertIsNone(document_model.get_graphic_by_uuid(data_item.uuid))
+            display_item.remove_graphic(graphic).close()
+            self.assertIsNone(document_model.get_graphic_by_uuid(graphic.uuid))
+            data_group.remove_data_group(child_data_group)
+            self.assertIsNone(document_model.get_data_group_by_uuid(child_data_group.uuid))
+            document_model.remove_data_item(data_item)
+            self.assertIsNone(document_model.get_data_item_by_uuid(data_item.uuid))
+            self.assertIsNone(document_model.get_display_item_by_uuid(display_item.uuid))
+
     def test_loading_document_with_duplicated_data_items_ignores_earlier_ones(self):
         with create_memory_profile_context() as profile_context:
             document_model = profile_context.create_document_model(auto_close=False)
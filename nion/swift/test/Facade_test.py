@@ -13,6 +13,7 @@ from nion.swift import Facade
 from nion.swift.model import DocumentModel
 from nion.swift.model import DataItem
 from nion.swift.model import Graphics
+from nion.swift.model import Symbolic
 from nion.swift.test import TestContext
 from nion.ui import TestUI
 from nion.utils import Geometry
@@ -93,6 +94,36 @@ class TestFacadeClass(unittest.TestCase):
             graphic = None
             self.assertEqual(len(Facade.Graphic.instances), 0)
 
+    def test_graphic_mask_xdata_is_writable(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller_with_application()
+            api = Facade.get_api("~1.0", "~1.0")
+            library = api.library
+            data_item = library.create_data_item_from_data(numpy.zeros((16, 16)))
+            graphic = data_item.add_rectangle_region(0.5, 0.5, 0.5, 0.5)
+            mask_xdata = graphic.mask_xdata_with_shape((16, 16))
+            mask_xdata.data[0, 0] = 1
+            self.assertEqual(1, mask_xdata.data[0, 0])
+            self.assertEqual(0, graphic.mask_xdata_with_shape((16, 16)).data[0, 0])
+
+    def test_graphic_mask_xdata_in_computation_expression_is_shared(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller_with_application()
+            document_model = document_controller.document_model
+            data_item = DataItem.DataItem(numpy.zeros((16, 16)))
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            graphic = Graphics.RectangleGraphic()
+            display_item.add_graphic(graphic)
+            result_data_item = DataItem.DataItem(numpy.zeros((1, )))
+            document_model.append_data_item(result_data_item)
+            computation = document_model.create_computation("import numpy\nmask = region.mask_xdata_with_shape((16, 16)).data\ntarget.xdata = api.create_data_and_metadata(numpy.array([mask.flags.writeable]))")
+            computation.create_input_item("region", Symbolic.make_item(graphic))
+            document_model.set_data_item_computation(result_data_item, computation)
+            document_model.recompute_all()
+            self.assertIsNone(computation.error_text)
+            self.assertFalse(result_data_item.data[0])
+
     def test_create_data_item_from_data_as_sequence(self):
         with TestContext.create_memory_context() as test_context:
             document_controller = test_context.create_document_controller_with_application()
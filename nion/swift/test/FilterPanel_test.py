@@ -53,6 +53,40 @@ class TestFilterPanelClass(unittest.TestCase):
         self.assertEqual(self.t.count, 6)
         self.assertEqual(self.t.children[0].key, "1969")
 
+    def test_insert_values_inserts_values_with_same_keys_together(self):
+        self.t.insert_values(["2000", "06"], ["Leia", "Luke"])
+        self.assertEqual(self.t.count, 9)
+        self.assertEqual(self.t.children[3].count, 6)
+        self.assertEqual(self.t.children[3].children[1].count, 5)
+        self.t.remove_values(None, ["Leia", "Luke", "Hans"])
+        self.assertEqual(self.t.count, 6)
+        self.assertEqual(self.t.children[0].key, "1969")
+        self.assertEqual(self.t.children[2].children[1].count, 3)
+
+    def test_date_browser_applies_inserted_and_removed_items_in_batches(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            filter_controller = document_controller.filter_controller
+            root = filter_controller.item_model_controller.root
+            for i in range(3):
+                document_model.append_data_item(DataItem.DataItem(numpy.zeros((4, 4))))
+            self.assertEqual(0, len(root.children))
+            filter_controller.update_all_nodes()
+            self.assertEqual(1, len(root.children))
+            year_item = root.children[0]
+            self.assertTrue(year_item.data["display"].endswith("(3)"))
+            self.assertTrue(year_item.children[0].children[0].data["display"].endswith("(3)"))
+            document_model.remove_data_item(document_model.data_items[0])
+            document_model.append_data_item(DataItem.DataItem(numpy.zeros((4, 4))))
+            document_model.append_data_item(DataItem.DataItem(numpy.zeros((4, 4))))
+            filter_controller.update_all_nodes()
+            self.assertTrue(year_item.data["display"].endswith("(4)"))
+            for data_item in list(document_model.data_items):
+                document_model.remove_data_item(data_item)
+            filter_controller.update_all_nodes()
+            self.assertEqual(0, len(root.children))
+
     def test_setting_text_filter_updates_filter_display_items(self):
         with TestContext.create_memory_context() as test_context:
             document_controller = test_context.create_document_controller()
@@ -68,6 +102,68 @@ class TestFilterPanelClass(unittest.TestCase):
             self.assertEqual(1, len(display_items))
             self.assertEqual(data_item1, display_items[0].data_item)
 
+    def test_text_filter_tracks_title_changes_after_filter_is_set(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            data_item1 = DataItem.DataItem(numpy.random.randn(4, 4))
+            data_item1.title = "abc"
+            document_model.append_data_item(data_item1)
+            data_item2 = DataItem.DataItem(numpy.random.randn(4, 4))
+            data_item2.title = "def"
+            document_model.append_data_item(data_item2)
+            document_controller.filter_controller.text_filter_changed("abc")
+            self.assertEqual(1, len(document_controller.filtered_display_items_model.items))
+            data_item2.title = "xabcx"
+            self.assertEqual(2, len(document_controller.filtered_display_items_model.items))
+            data_item1.title = "ab"
+            display_items = document_controller.filtered_display_items_model.items
+            self.assertEqual(1, len(display_items))
+            self.assertEqual(data_item2, display_items[0].data_item)
+            data_item3 = DataItem.DataItem(numpy.random.randn(4, 4))
+            data_item3.title = "ABC"
+            document_model.append_data_item(data_item3)
+            self.assertEqual(2, len(document_controller.filtered_display_items_model.items))
+
+    def test_refined_text_filter_narrows_previous_results(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            for title in ("apple", "apricot", "banana", "grape"):
+                data_item = DataItem.DataItem(numpy.random.randn(4, 4))
+                data_item.title = title
+                document_model.append_data_item(data_item)
+            filter_controller = document_controller.filter_controller
+            titles = lambda: sorted(display_item.displayed_title for display_item in document_controller.filtered_display_items_model.items)
+            filter_controller.text_filter_changed("a")
+            self.assertEqual(["apple", "apricot", "banana", "grape"], titles())
+            filter_controller.text_filter_changed("ap")
+            self.assertEqual(["apple", "apricot", "grape"], titles())
+            filter_controller.text_filter_changed("apr")
+            self.assertEqual(["apricot"], titles())
+            filter_controller.text_filter_changed("ap")
+            self.assertEqual(["apple", "apricot", "grape"], titles())
+            filter_controller.text_filter_changed("")
+            self.assertEqual(4, len(titles()))
+
+    def test_text_filter_index_search_matches_substrings_ignoring_case(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            for title in ("Spectrum One", "Image Two", "spectrum three"):
+                data_item = DataItem.DataItem(numpy.random.randn(4, 4))
+                data_item.title = title
+                document_model.append_data_item(data_item)
+            text_index = FilterPanel.TextFilterIndex()
+            for display_item in document_model.display_items:
+                text_index.insert(display_item)
+            self.assertEqual({"Spectrum One", "spectrum three"}, {display_item.displayed_title for display_item in text_index.search("SPECTRUM")})
+            self.assertEqual({"Image Two"}, {display_item.displayed_title for display_item in text_index.search("e tw")})
+            self.assertEqual(3, len(text_index.search("e")))
+            self.assertEqual(0, len(text_index.search("spectrum two")))
+            text_index.remove(document_model.display_items[0])
+            self.assertEqual(2, len(text_index.search("e")))
+            text_index.clear()
+
 
 if __name__ == '__main__':
     logging.getLogger().setLevel(logging.DEBUG)
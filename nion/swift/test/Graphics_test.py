@@ -105,6 +105,80 @@ class TestGraphicsClass(unittest.TestCase):
         self.assertIsNone(spot_graphic.test(mapping, ui_settings, Geometry.FloatPoint(), move_only=False)[0])
         spot_graphic.close()
 
+    def test_hit_index_candidates_include_every_graphic_hit(self):
+        mapping = self.__get_mapping()
+        ui_settings = DisplayPanel.FixedUISettings()
+        graphics = list()
+        for i in range(10):
+            for j in range(10):
+                point_graphic = Graphics.PointGraphic()
+                point_graphic.position = (0.05 + i * 0.1, 0.05 + j * 0.1)
+                graphics.append(point_graphic)
+        rect_graphic = Graphics.RectangleGraphic()
+        rect_graphic.bounds = (0.3, 0.3), (0.2, 0.1)
+        rect_graphic.rotation = 0.5
+        rect_graphic.label = "Rectangle"
+        graphics.append(rect_graphic)
+        line_graphic = Graphics.LineGraphic()
+        line_graphic.start = (0.1, 0.9)
+        line_graphic.end = (0.8, 0.2)
+        graphics.append(line_graphic)
+        spot_graphic = Graphics.SpotGraphic()
+        spot_graphic.bounds = (0.2 - 0.5, 0.2 - 0.5), (0.1, 0.1)
+        graphics.append(spot_graphic)
+        wedge_graphic = Graphics.WedgeGraphic()
+        graphics.append(wedge_graphic)
+        hit_index = Graphics.GraphicHitIndex()
+        hit_index.update(graphics, mapping, ui_settings, None, Geometry.FloatRect.from_tlbr(0, 0, 1000, 1000))
+        max_candidate_count = 0
+        for y in range(-20, 1020, 13):
+            for x in range(-20, 1020, 13):
+                p = Geometry.FloatPoint(y=y, x=x)
+                hit_indexes = [i for i, graphic in enumerate(graphics) if graphic.test(mapping, ui_settings, p, False)[0]]
+                candidate_indexes = hit_index.get_candidate_indexes(p)
+                self.assertEqual(sorted(candidate_indexes), list(candidate_indexes))
+                self.assertTrue(set(hit_indexes).issubset(set(candidate_indexes)))
+                if 0 <= y < 1000 and 0 <= x < 1000:
+                    max_candidate_count = max(max_candidate_count, len(candidate_indexes))
+        # only the graphics near a point are candidates.
+        self.assertLess(max_candidate_count, 10)
+        for graphic in graphics:
+            graphic.close()
+
+    def test_hit_index_follows_changes_to_graphics(self):
+        mapping = self.__get_mapping()
+        ui_settings = DisplayPanel.FixedUISettings()
+        area = Geometry.FloatRect.from_tlbr(0, 0, 1000, 1000)
+        point_graphic = Graphics.PointGraphic()
+        point_graphic.position = (0.25, 0.25)
+        hit_index = Graphics.GraphicHitIndex()
+        hit_index.update([point_graphic], mapping, ui_settings, None, area)
+        self.assertEqual([0], list(hit_index.get_candidate_indexes(Geometry.FloatPoint(250, 250))))
+        self.assertEqual([], list(hit_index.get_candidate_indexes(Geometry.FloatPoint(750, 750))))
+        point_graphic.position = (0.75, 0.75)
+        hit_index.update([point_graphic], mapping, ui_settings, None, area)
+        self.assertEqual([], list(hit_index.get_candidate_indexes(Geometry.FloatPoint(250, 250))))
+        self.assertEqual([0], list(hit_index.get_candidate_indexes(Geometry.FloatPoint(750, 750))))
+        point_graphic.close()
+
+    def test_cached_mask_is_reused_until_graphic_changes(self):
+        graphics = [Graphics.RectangleGraphic(), Graphics.EllipseGraphic(), Graphics.WedgeGraphic(), Graphics.RingGraphic()]
+        for graphic in graphics:
+            mask = graphic.get_cached_mask((32, 32))
+            self.assertTrue(numpy.array_equal(graphic.get_mask((32, 32)), mask))
+            self.assertFalse(mask.flags.writeable)
+            self.assertIs(mask, graphic.get_cached_mask((32, 32)))
+            self.assertEqual((16, 16), graphic.get_cached_mask((16, 16)).shape)
+            self.assertIsNot(mask, graphic.get_cached_mask((32, 32), Geometry.FloatPoint(y=8.5, x=8.5)))
+        graphics[0].bounds = ((0.5, 0.5), (0.25, 0.25))
+        graphics[1].rotation = 0.5
+        graphics[2].start_angle = 1.0
+        graphics[3].radius_1 = 0.4
+        for graphic in graphics:
+            mask = graphic.get_cached_mask((32, 32))
+            self.assertTrue(numpy.array_equal(graphic.get_mask((32, 32)), mask))
+            graphic.close()
+
     def test_create_all_graphic_by_dragging(self):
         with TestContext.create_memory_context() as test_context:
             document_controller = test_context.create_document_controller()
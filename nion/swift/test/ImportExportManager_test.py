@@ -1,12 +1,17 @@
 # standard libraries
+import asyncio
 import contextlib
 import datetime
 import json
 import logging
 import os
 import pathlib
+import tempfile
+import threading
+import time
 import unittest
 import uuid
+import zipfile
 
 # third party libraries
 import numpy
@@ -94,6 +99,172 @@ class TestImportExportManagerClass(unittest.TestCase):
             finally:
                 os.remove(file_path)
 
+    def test_ndata_write_streams_into_archive_and_reads_back_same_data(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_path = pathlib.Path(temp_dir) / "export" / "__file.ndata"
+                file_path.parent.mkdir()
+                handler = ImportExportManager.NDataImportExportHandler("ndata1-io-handler", "ndata", ["ndata"])
+                data = numpy.random.randn(8, 12).astype(numpy.float32)
+                data_item = DataItem.DataItem(data)
+                document_model.append_data_item(data_item)
+                display_item = document_model.get_display_item_for_data_item(data_item)
+                handler.write_display_item(display_item, file_path, "ndata")
+                self.assertEqual(["__file.ndata"], os.listdir(file_path.parent))
+                self.assertEqual(["export"], os.listdir(temp_dir))
+                with zipfile.ZipFile(file_path) as zip_file:
+                    self.assertEqual({"metadata.json", "data.npy"}, set(zip_file.namelist()))
+                    self.assertIsNone(zip_file.testzip())
+                data_elements = handler.read_data_elements("ndata", file_path)
+                self.assertEqual(1, len(data_elements))
+                self.assertTrue(numpy.array_equal(data, data_elements[0]["data"]))
+                self.assertEqual(data.dtype, data_elements[0]["data"].dtype)
+
+    def test_npy_and_ndata_data_items_read_data_when_used(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                data = numpy.random.randn(4, 8, 8).astype(numpy.float32)
+                data_item = DataItem.DataItem(data)
+                document_model.append_data_item(data_item)
+                display_item = document_model.get_display_item_for_data_item(data_item)
+                for extension, handler in (("npy", ImportExportManager.NumPyImportExportHandler("numpy-io-handler", "npy", ["npy"])),
+                                           ("ndata", ImportExportManager.NDataImportExportHandler("ndata1-io-handler", "ndata", ["ndata"]))):
+                    file_path = pathlib.Path(temp_dir) / f"__file.{extension}"
+                    handler.write_display_item(display_item, file_path, extension)
+                    data_elements = handler.read_lazy_data_elements(extension, file_path)
+                    self.assertEqual(1, len(data_elements))
+                    self.assertNotIn("data", data_elements[0])
+                    self.assertEqual(((4, 8, 8), numpy.dtype(numpy.float32)), data_elements[0]["data_shape_and_dtype"])
+                    read_data_items = handler.read_data_items(extension, file_path)
+                    self.assertEqual(1, len(read_data_items))
+                    read_data_item = read_data_items[0]
+                    self.assertTrue(read_data_item.has_lazy_data)
+                    self.assertFalse(read_data_item.is_data_loaded)
+                    self.assertEqual((4, 8, 8), read_data_item.data_shape)
+                    self.assertEqual(2, read_data_item.collection_dimension_count)
+                    self.assertTrue(numpy.array_equal(data, read_data_item.data))
+                    read_data_item.close()
+
+    def test_prepared_write_uses_snapshot_of_data(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_path = pathlib.Path(temp_dir) / "__file.ndata"
+                handler = ImportExportManager.NDataImportExportHandler("ndata1-io-handler", "ndata", ["ndata"])
+                data_item = DataItem.DataItem(numpy.zeros((8, 8)))
+                document_model.append_data_item(data_item)
+                display_item = document_model.get_display_item_for_data_item(data_item)
+                write_fn = handler.prepare_write_display_item(display_item, file_path, "ndata")
+                with data_item.data_ref() as data_ref:
+                    data_ref.data[:] = 1
+                    data_ref.data_updated()
+                write_fn()
+                data_elements = handler.read_data_elements("ndata", file_path)
+                self.assertTrue(numpy.array_equal(numpy.zeros((8, 8)), data_elements[0]["data"]))
+
+    def test_write_display_item_writes_without_snapshot(self):
+
+        class Handler(ImportExportManager.NDataImportExportHandler):
+            def prepare_write_display_item(self, display_item, path, extension):
+                raise Exception("synchronous writes must not snapshot")
+
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                file_path = pathlib.Path(temp_dir) / "__file.ndata"
+                handler = Handler("ndata1-io-handler", "ndata", ["ndata"])
+                data_item = DataItem.DataItem(numpy.ones((8, 8)))
+                document_model.append_data_item(data_item)
+                display_item = document_model.get_display_item_for_data_item(data_item)
+                handler.write_display_item(display_item, file_path, "ndata")
+                data_elements = handler.read_data_elements("ndata", file_path)
+                self.assertTrue(numpy.array_equal(numpy.ones((8, 8)), data_elements[0]["data"]))
+
+    def test_export_job_writes_all_display_items_and_reports_progress(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                handler = ImportExportManager.NDataImportExportHandler("ndata1-io-handler", "ndata", ["ndata"])
+                display_items_and_paths = list()
+                for i in range(10):
+                    data_item = DataItem.DataItem(numpy.full((8, 8), i))
+                    document_model.append_data_item(data_item)
+                    display_item = document_model.get_display_item_for_data_item(data_item)
+                    display_items_and_paths.append((display_item, pathlib.Path(temp_dir) / f"{i}.ndata"))
+                # a budget of one item limits the snapshots waiting to be written to one.
+                export_job = ImportExportManager.ExportJob(handler, display_items_and_paths, max_workers=2, budget_bytes=8 * 8 * 8)
+                progress = list()
+                progress_threads = set()
+
+                def progress_changed(completed_count: int, count: int) -> None:
+                    progress.append((completed_count, count))
+                    progress_threads.add(threading.current_thread())
+
+                event_loop = asyncio.new_event_loop()
+                try:
+                    with contextlib.closing(export_job.progress_changed_event.listen(progress_changed)):
+                        export_job.start(event_loop)
+                        start_time = time.perf_counter()
+                        while not export_job.is_finished and time.perf_counter() - start_time < 10.0:
+                            event_loop.run_until_complete(asyncio.sleep(0.01))
+                finally:
+                    event_loop.close()
+                self.assertTrue(export_job.is_finished)
+                self.assertEqual(10, export_job.completed_count)
+                self.assertFalse(export_job.errors)
+                self.assertEqual([(i + 1, 10) for i in range(10)], progress)
+                self.assertEqual({threading.current_thread()}, progress_threads)
+                for i in range(10):
+                    data_elements = handler.read_data_elements("ndata", pathlib.Path(temp_dir) / f"{i}.ndata")
+                    self.assertTrue(numpy.array_equal(numpy.full((8, 8), i), data_elements[0]["data"]))
+
+    def test_export_job_writes_with_writer_without_prepared_write_on_calling_thread(self):
+
+        class Handler(ImportExportManager.ImportExportHandler):
+            def __init__(self) -> None:
+                super().__init__("npy-test-io-handler", "npy", ["npy"])
+                self.write_threads = set()
+
+            def can_write(self, data_metadata, extension):
+                return True
+
+            def write_display_item(self, display_item, path, extension):
+                self.write_threads.add(threading.current_thread())
+                numpy.save(path, display_item.data_item.data)
+
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                handler = Handler()
+                display_items_and_paths = list()
+                for i in range(3):
+                    data_item = DataItem.DataItem(numpy.full((8, 8), i))
+                    document_model.append_data_item(data_item)
+                    display_item = document_model.get_display_item_for_data_item(data_item)
+                    display_items_and_paths.append((display_item, pathlib.Path(temp_dir) / f"{i}.npy"))
+                export_job = ImportExportManager.ExportJob(handler, display_items_and_paths)
+                export_job.run()
+                self.assertTrue(export_job.is_finished)
+                self.assertEqual(3, export_job.completed_count)
+                self.assertEqual({threading.current_thread()}, handler.write_threads)
+                self.assertEqual(3, len(os.listdir(temp_dir)))
+
+    def test_cancelled_export_job_writes_no_more_items(self):
+        with TestContext.create_memory_context() as test_context:
+            document_model = test_context.create_document_model()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                handler = ImportExportManager.NDataImportExportHandler("ndata1-io-handler", "ndata", ["ndata"])
+                data_item = DataItem.DataItem(numpy.zeros((8, 8)))
+                document_model.append_data_item(data_item)
+                display_item = document_model.get_display_item_for_data_item(data_item)
+                export_job = ImportExportManager.ExportJob(handler, [(display_item, pathlib.Path(temp_dir) / "a.ndata")])
+                export_job.cancel()
+                export_job.run()
+                self.assertEqual(0, export_job.completed_count)
+                self.assertEqual([], os.listdir(temp_dir))
+
     def test_npy_write_to_then_read_from_temp_file(self):
         with TestContext.create_memory_context() as test_context:
             document_model = test_context.create_document_model()
@@ -303,6 +474,33 @@ class TestImportExportManagerClass(unittest.TestCase):
             finally:
                 os.remove(file_path)
 
+    def test_csv_writer_matches_savetxt_and_reader_matches_loadtxt(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = pathlib.Path(temp_dir) / "__file.csv"
+            savetxt_file_path = pathlib.Path(temp_dir) / "__savetxt.csv"
+            for data in (numpy.random.randn(40, 3), numpy.random.randn(40), numpy.arange(12, dtype=numpy.int16).reshape(3, 4)):
+                ImportExportManager.write_csv_array(file_path, data)
+                numpy.savetxt(savetxt_file_path, data, delimiter=", ")
+                self.assertEqual(savetxt_file_path.read_text(), file_path.read_text())
+                self.assertTrue(numpy.array_equal(numpy.loadtxt(savetxt_file_path, delimiter=","), ImportExportManager.read_csv_array(file_path)))
+
+    def test_csv_reader_reads_in_blocks_and_skips_comments(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = pathlib.Path(temp_dir) / "__file.csv"
+            file_path.write_text("# X, Y\n" + "".join(f"{i}, {i * 2}\n" for i in range(1000)) + "\n")
+            blocks = list(ImportExportManager.iter_csv_blocks(file_path))
+            self.assertLess(len(blocks), 1000)
+            data = ImportExportManager.read_csv_array(file_path)
+            self.assertEqual((1000, 2), data.shape)
+            self.assertTrue(numpy.array_equal(numpy.arange(1000) * 2, data[:, 1]))
+            file_path.write_text("1, 2\n3\n")
+            with self.assertRaises(ValueError):
+                ImportExportManager.read_csv_array(file_path)
+            # ragged rows whose total value count is a multiple of the column count are rejected too.
+            file_path.write_text("1, 2, 3\n1, 2, 3, 4, 5\n1, 2, 3, 4\n1, 2, 3, 4\n")
+            with self.assertRaisesRegex(ValueError, "line 2"):
+                ImportExportManager.read_csv_array(file_path)
+
     def test_data_item_to_data_element_produces_json_compatible_dict(self):
         data_item = DataItem.DataItem(numpy.zeros((16, 16)))
         with contextlib.closing(data_item):
@@ -359,6 +557,37 @@ class TestImportExportManagerClass(unittest.TestCase):
             data_element = ImportExportManager.create_data_element_from_data_item(data_item, include_data=False)
             json.dumps(data_element)
 
+    def test_lazy_io_handler_loads_handler_on_first_read_and_unregisters_itself(self):
+        class TestIOHandler(ImportExportManager.ImportExportHandler):
+            def __init__(self) -> None:
+                super().__init__("lazy-test-io-handler", "Lazy Test", ["lazytest"])
+
+            def read_data_elements(self, extension, path):
+                return [{"data": numpy.ones((4, 4))}]
+
+        io_handlers = list()
+
+        def load() -> None:
+            io_handlers.append(TestIOHandler())
+            ImportExportManager.ImportExportManager().register_io_handler(io_handlers[-1])
+
+        import_export_manager = ImportExportManager.ImportExportManager()
+        lazy_io_handler = ImportExportManager.LazyImportExportHandler(load, "lazy-test-io-handler", "Lazy Test", ["lazytest"])
+        import_export_manager.register_io_handler(lazy_io_handler)
+        try:
+            self.assertIn(lazy_io_handler, import_export_manager.get_readers())
+            self.assertEqual(0, len(io_handlers))
+            data_elements = import_export_manager.read_data_elements(pathlib.Path("file.lazytest"))
+            self.assertEqual(1, len(io_handlers))
+            self.assertTrue(numpy.array_equal(numpy.ones((4, 4)), data_elements[0]["data"]))
+            self.assertNotIn(lazy_io_handler, import_export_manager.get_readers())
+            self.assertIs(io_handlers[0], import_export_manager.get_io_handler_by_id("lazy-test-io-handler"))
+            import_export_manager.read_data_elements(pathlib.Path("file.lazytest"))
+            self.assertEqual(1, len(io_handlers))
+        finally:
+            for io_handler in io_handlers:
+                import_export_manager.unregister_io_handler(io_handler)
+
 
 if __name__ == '__main__':
     logging.getLogger().setLevel(logging.DEBUG)
@@ -0,0 +1,54 @@
+# standard libraries
+import json
+import logging
+import pathlib
+import sys
+import tempfile
+import unittest
+
+# third party libraries
+# None
+
+# local libraries
+from nion.swift.model import PlugInManager
+
+
+class TestPlugInManagerClass(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__sys_path = list(sys.path)
+
+    def tearDown(self):
+        PlugInManager.unload_plug_ins()
+        sys.path[:] = self.__sys_path
+        sys.modules.pop("lazy_test_plug_in", None)
+        self.__temp_dir.cleanup()
+
+    def test_plug_in_declaring_contributions_is_imported_on_first_use(self):
+        plug_in_dir = pathlib.Path(self.__temp_dir.name) / "PlugIns" / "lazy_test_plug_in"
+        plug_in_dir.mkdir(parents=True)
+        manifest = {
+            "name": "Lazy Test", "identifier": "lazy_test", "version": "1.0.0",
+            "contributes": {"panels": [{"panel_id": "lazy-test-panel", "panel_name": "Lazy Test"}]}
+        }
+        (plug_in_dir / "manifest.json").write_text(json.dumps(manifest))
+        (plug_in_dir / "__init__.py").write_text("run_count = 0\n\ndef run():\n    global run_count\n    run_count += 1\n")
+        PlugInManager.load_plug_ins(None, None, self.__temp_dir.name)
+        self.assertNotIn("lazy_test_plug_in", sys.modules)
+        lazy_plug_ins = [lazy_plug_in for lazy_plug_in in PlugInManager.get_lazy_plug_ins() if lazy_plug_in.module_name == "lazy_test_plug_in"]
+        self.assertEqual(1, len(lazy_plug_ins))
+        lazy_plug_in = lazy_plug_ins[0]
+        self.assertFalse(lazy_plug_in.is_loaded)
+        self.assertEqual("lazy-test-panel", lazy_plug_in.contributions["panels"][0]["panel_id"])
+        module = lazy_plug_in.load()
+        self.assertIsNotNone(module)
+        self.assertTrue(lazy_plug_in.is_loaded)
+        self.assertIs(module, lazy_plug_in.load())
+        self.assertEqual(1, getattr(module, "run_count"))
+        self.assertIn("lazy_test_plug_in", [module_name for module_name, duration in PlugInManager.get_load_times()])
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
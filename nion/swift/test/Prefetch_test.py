@@ -0,0 +1,89 @@
+# standard libraries
+import logging
+import time
+import unittest
+
+# third party libraries
+import numpy
+
+# local libraries
+from nion.swift import Application
+from nion.swift.model import DataItem
+from nion.swift.model import DataResidency
+from nion.swift.model import Prefetch
+from nion.swift.test import TestContext
+from nion.ui import TestUI
+
+
+class TestPrefetchClass(unittest.TestCase):
+
+    def setUp(self):
+        TestContext.begin_leaks()
+        self.app = Application.Application(TestUI.UserInterface(), set_global=False)
+
+    def tearDown(self):
+        DataResidency.set_budget(0)
+        TestContext.end_leaks(self)
+
+    def __wait_for_prefetched_count(self, prefetcher: Prefetch.DisplayItemPrefetcher, count: int) -> None:
+        start = time.perf_counter()
+        while prefetcher.prefetched_count < count and time.perf_counter() - start < 5.0:
+            time.sleep(0.01)
+        self.assertEqual(count, prefetcher.prefetched_count)
+
+    def test_prefetch_loads_data_and_display_values_of_neighbors(self):
+        with TestContext.MemoryProfileContext() as profile_context:
+            document_model = profile_context.create_document_model()
+            for i in range(5):
+                document_model.append_data_item(DataItem.DataItem(numpy.full((8, 8), i, numpy.float32)))
+            display_items = document_model.display_items
+            self.assertFalse(any(display_item.data_item.is_data_loaded for display_item in display_items))
+            DataResidency.set_budget(1024 * 1024)
+            prefetcher = Prefetch.DisplayItemPrefetcher(count=1)
+            try:
+                prefetcher.prefetch(display_items, 2)
+                self.__wait_for_prefetched_count(prefetcher, 2)
+            finally:
+                prefetcher.close()
+            self.assertEqual([False, True, False, True, False], [display_item.data_item.is_data_loaded for display_item in display_items])
+            display_values = display_items[3].display_data_channel.get_calculated_display_values()
+            self.assertEqual((3, 3), display_values.data_range)
+
+    def test_prefetch_stops_at_first_neighbor_beyond_budget(self):
+        with TestContext.MemoryProfileContext() as profile_context:
+            document_model = profile_context.create_document_model()
+            # items are 256 bytes except item 4, which is 1024 bytes.
+            for i in range(5):
+                data_shape = (16, 16) if i == 4 else (8, 8)
+                document_model.append_data_item(DataItem.DataItem(numpy.full(data_shape, i, numpy.float32)))
+            prefetcher = Prefetch.DisplayItemPrefetcher(count=2, budget_bytes=768)
+            try:
+                # neighbors of item 2 in order are 3, 1, 4, 0. item 4 does not fit, so item 0 is not prefetched
+                # even though it would fit.
+                prefetcher.prefetch(document_model.display_items, 2)
+                self.__wait_for_prefetched_count(prefetcher, 2)
+                time.sleep(0.1)
+                self.assertEqual(2, prefetcher.prefetched_count)
+            finally:
+                prefetcher.close()
+
+    def test_new_prefetch_replaces_pending_prefetch(self):
+        with TestContext.MemoryProfileContext() as profile_context:
+            document_model = profile_context.create_document_model()
+            for i in range(9):
+                document_model.append_data_item(DataItem.DataItem(numpy.full((8, 8), i, numpy.float32)))
+            prefetcher = Prefetch.DisplayItemPrefetcher(count=2)
+            try:
+                # the dispatcher waits briefly before starting, so the first request is replaced before it starts.
+                prefetcher.prefetch(document_model.display_items, 2)
+                prefetcher.prefetch(document_model.display_items, 8)
+                self.__wait_for_prefetched_count(prefetcher, 2)
+                time.sleep(0.1)
+                self.assertEqual(2, prefetcher.prefetched_count)
+            finally:
+                prefetcher.close()
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
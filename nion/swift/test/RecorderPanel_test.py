@@ -87,3 +87,69 @@ class TestRecorderPanelClass(unittest.TestCase):
                         else:
                             self.assertEqual(recorder_state_ref[0], "stopped")
                 self.assertEqual(recorder_state_ref[0], "stopped")
+
+    def test_recorder_writes_each_frame_into_reserved_sequence(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            data_item = DataItem.DataItem(numpy.zeros((8, 8)))
+            document_model.append_data_item(data_item)
+            recorder = RecorderPanel.Recorder(document_controller, data_item)
+            with contextlib.closing(recorder):
+                with document_model.data_item_live(data_item):
+                    count = 4
+                    recorder.start_recording(10, 1, count)
+                    for i in range(count):
+                        recorder.continue_recording(10 + i + 0.25)
+                        recorded_data_item = document_model.data_items[1]
+                        # the full sequence is reserved with the first frame
+                        self.assertEqual((count, 8, 8), recorded_data_item.data_shape)
+                        data_item.set_data(data_item.data + 1)
+            recorded_data_item = document_model.data_items[1]
+            for i in range(count):
+                self.assertTrue(numpy.array_equal(numpy.full((8, 8), i), recorded_data_item.data[i]))
+            self.assertEqual("s", recorded_data_item.xdata.dimensional_calibrations[0].units)
+
+    def test_recorder_stopped_early_keeps_only_recorded_frames(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            data_item = DataItem.DataItem(numpy.zeros((8, 8)))
+            document_model.append_data_item(data_item)
+            recorder = RecorderPanel.Recorder(document_controller, data_item)
+            with contextlib.closing(recorder):
+                with document_model.data_item_live(data_item):
+                    recorder.start_recording(10, 1, 10)
+                    for i in range(3):
+                        recorder.continue_recording(10 + i + 0.25)
+                        data_item.set_data(data_item.data + 1)
+                    recorder.stop_recording()
+            recorded_data_item = document_model.data_items[1]
+            self.assertTrue(recorded_data_item.xdata.is_sequence)
+            self.assertEqual((3, 8, 8), recorded_data_item.data_shape)
+            self.assertTrue(numpy.array_equal(numpy.full((8, 8), 2), recorded_data_item.data[2]))
+            self.assertFalse(recorded_data_item.in_transaction_state)
+
+    def test_recorder_converts_recording_when_frame_type_changes(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            data_item = DataItem.DataItem(numpy.zeros((8, 8), numpy.uint16))
+            document_model.append_data_item(data_item)
+            recorder = RecorderPanel.Recorder(document_controller, data_item)
+            with contextlib.closing(recorder):
+                with document_model.data_item_live(data_item):
+                    count = 4
+                    recorder.start_recording(10, 1, count)
+                    for i in range(count):
+                        recorder.continue_recording(10 + i + 0.25)
+                        # a wider type part way through, and a narrower type afterwards.
+                        data_dtype = numpy.float32 if i == 1 else numpy.uint8
+                        data_item.set_data(numpy.full((8, 8), i + 1.5, data_dtype))
+            recorded_data_item = document_model.data_items[1]
+            self.assertEqual((count, 8, 8), recorded_data_item.data_shape)
+            self.assertEqual(numpy.float32, recorded_data_item.data_dtype)
+            self.assertTrue(numpy.array_equal(numpy.full((8, 8), 0), recorded_data_item.data[0]))
+            self.assertTrue(numpy.array_equal(numpy.full((8, 8), 1), recorded_data_item.data[1]))
+            self.assertTrue(numpy.array_equal(numpy.full((8, 8), 2.5), recorded_data_item.data[2]))
+            self.assertTrue(numpy.array_equal(numpy.full((8, 8), 3), recorded_data_item.data[3]))
@@ -0,0 +1,107 @@
+# standard libraries
+import logging
+import unittest
+
+# third party libraries
+import numpy
+
+# local libraries
+from nion.data import Calibration
+from nion.data import Core
+from nion.data import DataAndMetadata
+from nion.swift import Application
+from nion.swift.model import DataItem
+from nion.swift.model import SliceSum
+from nion.swift.test import TestContext
+from nion.ui import TestUI
+
+
+class TestSliceSumClass(unittest.TestCase):
+
+    def setUp(self):
+        TestContext.begin_leaks()
+        self.app = Application.Application(TestUI.UserInterface(), set_global=False)
+
+    def tearDown(self):
+        SliceSum.set_budget(512 * 1024 * 1024)
+        TestContext.end_leaks(self)
+
+    def __create_spectrum_image(self, dtype) -> DataAndMetadata.DataAndMetadata:
+        data = (numpy.random.RandomState(0).rand(4, 5, 37) * 100).astype(dtype)
+        return DataAndMetadata.new_data_and_metadata(data, intensity_calibration=Calibration.Calibration(units="e"),
+                                                     dimensional_calibrations=[Calibration.Calibration(scale=2.0, units="nm"), Calibration.Calibration(scale=2.0, units="nm"), Calibration.Calibration(scale=0.5, units="eV")],
+                                                     data_descriptor=DataAndMetadata.DataDescriptor(False, 2, 1))
+
+    def test_slice_sums_from_cumulative_sums_match_direct_slice_sums(self):
+        for dtype in (numpy.uint16, numpy.int32, numpy.float32, numpy.float64):
+            xdata = self.__create_spectrum_image(dtype)
+            slice_sum_cache = SliceSum.SliceSumCache(max_stride=4)
+            try:
+                for slice_center, slice_width in ((0, 1), (18, 1), (18, 7), (3, 8), (20, 16), (18, 37), (36, 5), (30, 100)):
+                    expected = Core.function_slice_sum(xdata, slice_center, slice_width)
+                    result = slice_sum_cache.get_slice_sum(xdata, 0, slice_center, slice_width)
+                    self.assertEqual(expected.data_dtype, result.data_dtype)
+                    self.assertEqual(expected.dimensional_calibrations, result.dimensional_calibrations)
+                    self.assertEqual(expected.intensity_calibration, result.intensity_calibration)
+                    if numpy.issubdtype(dtype, numpy.integer):
+                        self.assertTrue(numpy.array_equal(expected.data, result.data))
+                    else:
+                        self.assertTrue(numpy.allclose(expected.data, result.data, rtol=1E-5))
+                self.assertEqual(1, slice_sum_cache.stride)
+            finally:
+                slice_sum_cache.close()
+        self.assertEqual(0, SliceSum.get_reserved_bytes())
+
+    def test_cumulative_sums_use_larger_stride_to_fit_budget(self):
+        xdata = self.__create_spectrum_image(numpy.uint16)
+        # each plane of cumulative sums is 4 x 5 x 8 bytes = 160 bytes. a stride of 4 needs 10 planes.
+        SliceSum.set_budget(1600)
+        slice_sum_cache = SliceSum.SliceSumCache()
+        try:
+            slice_sum_cache.get_slice_sum(xdata, 0, 10, 3)
+            self.assertIsNone(slice_sum_cache.stride)
+            result = slice_sum_cache.get_slice_sum(xdata, 0, 20, 11)
+            self.assertEqual(4, slice_sum_cache.stride)
+            self.assertEqual(1600, SliceSum.get_reserved_bytes())
+            self.assertTrue(numpy.array_equal(Core.function_slice_sum(xdata, 20, 11).data, result.data))
+        finally:
+            slice_sum_cache.close()
+        self.assertEqual(0, SliceSum.get_reserved_bytes())
+
+    def test_cumulative_sums_are_discarded_when_data_key_changes(self):
+        xdata = self.__create_spectrum_image(numpy.uint16)
+        slice_sum_cache = SliceSum.SliceSumCache()
+        try:
+            slice_sum_cache.get_slice_sum(xdata, 0, 10, 3)
+            slice_sum_cache.get_slice_sum(xdata, 0, 10, 4)
+            self.assertIsNotNone(slice_sum_cache.stride)
+            # modify the data in place and change the data key
+            xdata._data_ex[..., 10] += 1
+            result = slice_sum_cache.get_slice_sum(xdata, 1, 10, 4)
+            self.assertIsNone(slice_sum_cache.stride)
+            self.assertTrue(numpy.array_equal(Core.function_slice_sum(xdata, 10, 4).data, result.data))
+        finally:
+            slice_sum_cache.close()
+
+    def test_display_of_spectrum_image_updates_when_slice_changes(self):
+        with TestContext.MemoryProfileContext() as profile_context:
+            document_model = profile_context.create_document_model()
+            xdata = self.__create_spectrum_image(numpy.float32)
+            data_item = DataItem.new_data_item(xdata)
+            document_model.append_data_item(data_item)
+            display_data_channel = document_model.get_display_item_for_data_item(data_item).display_data_channel
+            for slice_center, slice_width in ((10, 3), (12, 5), (20, 9)):
+                display_data_channel.slice_center = slice_center
+                display_data_channel.slice_width = slice_width
+                display_data = display_data_channel.get_calculated_display_values(True).display_data_and_metadata.data
+                expected = numpy.sum(xdata.data[..., slice_center - slice_width // 2:slice_center - slice_width // 2 + slice_width], -1)
+                self.assertTrue(numpy.allclose(expected, display_data, rtol=1E-5))
+            # modify the data and check the display uses the new data
+            data_item.set_data(xdata.data + 1)
+            display_data = display_data_channel.get_calculated_display_values(True).display_data_and_metadata.data
+            self.assertTrue(numpy.allclose(numpy.sum(xdata.data[..., 16:25] + 1, -1), display_data, rtol=1E-5))
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -32,6 +32,8 @@ from nion.swift.model import DataItem
 from nion.swift.model import DocumentModel
 from nion.swift.model import FileStorageSystem
 from nion.swift.model import Graphics
+from nion.swift.model import ImportExportManager
+from nion.swift.model import NDataHandler
 from nion.swift.model import Persistence
 from nion.swift.model import Profile
 from nion.swift.model import Symbolic
@@ -381,6 +383,63 @@ class TestStorageClass(unittest.TestCase):
             with document_model.ref():
                     self.assertEqual(data_read_count_ref[0], 0)
 
+    def test_prepared_data_item_storage_is_used_when_data_item_is_inserted(self):
+        with create_memory_profile_context() as profile_context:
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                project_storage_system = document_model._project.project_storage_system
+                data_item = DataItem.DataItem(numpy.ones((8, 8)))
+                project_storage_system.prepare_data_item_storage(data_item)
+                written_data = profile_context.data_map[str(data_item.uuid)]
+                document_model.append_data_item(data_item)
+                project_storage_system.discard_data_item_storage(data_item)
+                # the data written when preparing the storage is not written again.
+                self.assertIs(written_data, profile_context.data_map[str(data_item.uuid)])
+                discarded_data_item = DataItem.DataItem(numpy.ones((8, 8)))
+                project_storage_system.prepare_data_item_storage(discarded_data_item)
+                project_storage_system.discard_data_item_storage(discarded_data_item)
+                self.assertNotIn(str(discarded_data_item.uuid), profile_context.data_map)
+                discarded_data_item.close()
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                self.assertEqual(1, len(document_model.data_items))
+                self.assertTrue(numpy.array_equal(numpy.ones((8, 8)), document_model.data_items[0].data))
+
+    def test_imported_lazy_data_is_written_to_storage_and_reloads(self):
+        with create_temp_profile_context() as profile_context:
+            npy_path = profile_context.workspace_dir / "import.npy"
+            data = numpy.random.randn(4, 8, 8)
+            numpy.save(npy_path, data)
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                data_items = ImportExportManager.ImportExportManager().read_data_items(npy_path)
+                self.assertEqual(1, len(data_items))
+                self.assertTrue(data_items[0].has_lazy_data)
+                document_model.append_data_item(data_items[0])
+                self.assertFalse(data_items[0].is_data_loaded)
+                document_model.write_lazy_data(data_items)
+            # closing the document waits for the data to be written.
+            os.remove(npy_path)
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                self.assertFalse(document_model.data_items[0].has_lazy_data)
+                self.assertTrue(numpy.array_equal(data, document_model.data_items[0].data))
+
+    def test_imported_lazy_data_is_restored_when_removal_is_undone(self):
+        with create_temp_profile_context() as profile_context:
+            npy_path = profile_context.workspace_dir / "import.npy"
+            data = numpy.random.randn(8, 8)
+            numpy.save(npy_path, data)
+            document_model = profile_context.create_document_model(auto_close=False)
+            with document_model.ref():
+                data_items = ImportExportManager.ImportExportManager().read_data_items(npy_path)
+                document_model.append_data_item(data_items[0])
+                undelete_log = document_model.remove_data_item_with_log(data_items[0], safe=True)
+                os.remove(npy_path)
+                document_model.undelete_all(undelete_log)
+                undelete_log.close()
+                self.assertTrue(numpy.array_equal(data, document_model.data_items[0].data))
+
     def test_reload_data_item_initializes_display_slice(self):
         with create_memory_profile_context() as profile_context:
             document_model = profile_context.create_document_model(auto_close=False)
@@ -839,6 +898,44 @@ class TestStorageClass(unittest.TestCase):
             with document_model.ref():
                 self.assertEqual(len(list(document_model._project.project_storage_system._trash_dir.rglob("*"))), 0)
 
+    def test_delete_and_undelete_from_file_storage_system_restores_data_items_after_reload_within_retention_period(self):
+        trash_retention_period = FileStorageSystem.FileProjectStorageSystem.trash_retention_period
+        FileStorageSystem.FileProjectStorageSystem.trash_retention_period = datetime.timedelta(days=1)
+        try:
+            with create_temp_profile_context() as profile_context:
+                document_model = profile_context.create_document_model(auto_close=False)
+                with document_model.ref():
+                    data_item_uuids = list()
+                    for i in range(4):
+                        data_item = DataItem.DataItem(numpy.full((16, 16), i))
+                        data_item.large_format = i % 2 == 1
+                        document_model.append_data_item(data_item)
+                        data_item_uuids.append(data_item.uuid)
+                    for data_item in list(document_model.data_items):
+                        document_model.remove_data_item(data_item, safe=True)
+                    trash_dir = document_model._project.project_storage_system._trash_dir
+                    self.assertTrue((trash_dir / FileStorageSystem.FileProjectStorageSystem._trash_manifest_name).exists())
+                    document_model.restore_data_item(data_item_uuids[0])
+                    self.assertEqual(1, len(document_model.data_items))
+                # read it back; the remaining trashed items are retained
+                document_model = profile_context.create_document_model(auto_close=False)
+                with document_model.ref():
+                    self.assertEqual(1, len(document_model.data_items))
+                    for data_item_uuid in data_item_uuids[1:]:
+                        document_model.restore_data_item(data_item_uuid)
+                    self.assertEqual(4, len(document_model.data_items))
+                    for i, data_item_uuid in enumerate(data_item_uuids):
+                        data_item = document_model.get_data_item_by_uuid(data_item_uuid)
+                        self.assertEqual(i % 2 == 1, data_item.large_format)
+                        self.assertTrue(numpy.array_equal(numpy.full((16, 16), i), data_item.data))
+                # read it back; the trash is empty
+                document_model = profile_context.create_document_model(auto_close=False)
+                with document_model.ref():
+                    self.assertEqual(4, len(document_model.data_items))
+                    self.assertEqual(0, len(list(document_model._project.project_storage_system._trash_dir.rglob("*"))))
+        finally:
+            FileStorageSystem.FileProjectStorageSystem.trash_retention_period = trash_retention_period
+
     def disabled_test_delete_and_undelete_from_file_storage_system_restores_data_item_after_reload(self):
         # this test is disabled for now; launching the application empties the trash until a user interface
         # is established for restoring items in the trash.
@@ -4263,6 +4360,71 @@ class TestStorageClass(unittest.TestCase):
                 self.assertIsNotNone(DocumentModel.MappedItemManager().get_item_r_var(document_model.display_items[0]))
             self.assertEqual(0, len(DocumentModel.MappedItemManager().item_map.keys()))
 
+    def test_copy_data_file_links_or_copies_file(self):
+        with create_temp_profile_context() as profile_context:
+            source_path = profile_context.workspace_dir / "source.bin"
+            source_path.write_bytes(bytes(range(256)))
+            for link_mode in ("copy", "reflink", "hardlink"):
+                target_path = profile_context.workspace_dir / f"target-{link_mode}.bin"
+                FileStorageSystem.copy_data_file(source_path, target_path, link_mode)
+                self.assertEqual(source_path.read_bytes(), target_path.read_bytes())
+            self.assertNotEqual(os.stat(source_path).st_ino, os.stat(profile_context.workspace_dir / "target-copy.bin").st_ino)
+            self.assertEqual(os.stat(source_path).st_ino, os.stat(profile_context.workspace_dir / "target-hardlink.bin").st_ino)
+
+    def test_legacy_library_migration_resumes_from_journal_and_removes_it(self):
+        with create_temp_profile_context() as profile_context:
+            # construct a version 13 library with three data items
+            library_path = profile_context.workspace_dir / "Legacy"
+            library_path.mkdir()
+            (library_path / "Nion Swift Library 13.nslib").write_text(json.dumps({"version": 3, "uuid": str(uuid.uuid4())}), "utf-8")
+            data_item_uuids = list()
+            for i in range(3):
+                data_item = DataItem.DataItem(numpy.full((8, 8), i, numpy.uint32))
+                with contextlib.closing(data_item):
+                    properties = data_item.write_to_dict()
+                    properties["version"] = DataItem.DataItem.writer_version
+                    data_item_uuids.append(data_item.uuid)
+                    data_path = library_path / "Nion Swift Data 13" / f"data_{i}.ndata"
+                    data_path.parent.mkdir(exist_ok=True)
+                    storage_handler = NDataHandler.NDataHandler(data_path)
+                    with contextlib.closing(storage_handler):
+                        storage_handler.write_data(data_item.data, datetime.datetime.now())
+                        storage_handler.write_properties(properties, datetime.datetime.now())
+            target_project_path = profile_context.workspace_dir / "Legacy.nsproj"
+            target_project_path.write_text(json.dumps({"version": FileStorageSystem.PROJECT_VERSION, "uuid": str(uuid.uuid4()), "project_data_folders": ["Legacy Data"]}), "utf-8")
+            migration_journal_path = FileStorageSystem.get_migration_journal_path(target_project_path)
+            copied_paths = list()
+            original_copy_data_file = FileStorageSystem.copy_data_file
+
+            def copy_data_file(source_path: pathlib.Path, target_path: pathlib.Path, link_mode: str = "copy") -> None:
+                copied_paths.append(target_path)
+                original_copy_data_file(source_path, target_path, link_mode)
+
+            def migrate() -> None:
+                with contextlib.closing(FileStorageSystem.make_folder_project_storage_system(library_path)) as source_storage_system:
+                    source_storage_system.load_properties()
+                    with contextlib.closing(FileStorageSystem.FileProjectStorageSystem(target_project_path)) as target_storage_system:
+                        target_storage_system.load_properties()
+                        FileStorageSystem.copy_data_file = copy_data_file
+                        try:
+                            FileStorageSystem.migrate_to_latest(source_storage_system, target_storage_system)
+                        finally:
+                            FileStorageSystem.copy_data_file = original_copy_data_file
+
+            migrate()
+            self.assertEqual(3, len(copied_paths))
+            self.assertFalse(migration_journal_path.exists())
+            # simulate an interrupted migration which transferred the first two data items, then resume it
+            migration_journal_path.write_text("".join(str(data_item_uuid) + "\n" for data_item_uuid in data_item_uuids[:2]), "utf-8")
+            copied_paths.clear()
+            migrate()
+            self.assertEqual(1, len(copied_paths))
+            self.assertFalse(migration_journal_path.exists())
+            with contextlib.closing(FileStorageSystem.FileProjectStorageSystem(target_project_path)) as target_storage_system:
+                target_storage_system.load_properties()
+                project_properties = target_storage_system.read_project_properties()
+                self.assertEqual({str(data_item_uuid) for data_item_uuid in data_item_uuids}, {d["uuid"] for d in project_properties["data_items"]})
+
     def disabled_test_document_controller_disposes_threads(self):
         thread_count = threading.activeCount()
         with TestContext.create_memory_context() as test_context:
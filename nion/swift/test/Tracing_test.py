@@ -0,0 +1,92 @@
+# standard libraries
+import datetime
+import json
+import logging
+import pathlib
+import tempfile
+import threading
+import unittest
+
+# third party libraries
+import numpy
+
+# local libraries
+from nion.swift.model import NDataHandler
+from nion.swift.model import Tracing
+
+
+class TestTracingClass(unittest.TestCase):
+
+    def setUp(self):
+        Tracing.enable()
+
+    def tearDown(self):
+        Tracing.disable()
+        Tracing.clear()
+
+    def test_spans_are_only_recorded_while_enabled(self):
+        with Tracing.span("a"):
+            pass
+        Tracing.disable()
+        with Tracing.span("b"):
+            pass
+        self.assertEqual(["a"], [event["name"] for event in Tracing.get_chrome_trace_events() if event["ph"] == "X"])
+
+    def test_ring_buffer_keeps_most_recent_spans(self):
+        Tracing.enable(capacity=4)
+        for i in range(10):
+            with Tracing.span(str(i)):
+                pass
+        self.assertEqual(["6", "7", "8", "9"], [event["name"] for event in Tracing.get_chrome_trace_events() if event["ph"] == "X"])
+
+    def test_traced_function_records_span_named_by_function(self):
+        @Tracing.traced("test")
+        def f(x):
+            return x + 1
+
+        self.assertEqual(2, f(1))
+        events = [event for event in Tracing.get_chrome_trace_events() if event["ph"] == "X"]
+        self.assertEqual(1, len(events))
+        self.assertTrue(events[0]["name"].endswith("f"))
+        self.assertEqual("test", events[0]["cat"])
+
+    def test_export_writes_chrome_trace_with_spans_from_each_thread(self):
+        with Tracing.span("outer", args={"count": 2}):
+            with Tracing.span("inner"):
+                pass
+
+        def record_span_on_thread() -> None:
+            with Tracing.span("thread"):
+                pass
+
+        thread = threading.Thread(target=record_span_on_thread, name="tracing-test")
+        thread.start()
+        thread.join()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = pathlib.Path(temp_dir) / "trace.json"
+            Tracing.export_chrome_trace(path)
+            trace = json.loads(path.read_text())
+        events = trace["traceEvents"]
+        spans = {event["name"]: event for event in events if event["ph"] == "X"}
+        self.assertEqual({"outer", "inner", "thread"}, set(spans.keys()))
+        self.assertEqual({"count": 2}, spans["outer"]["args"])
+        self.assertLessEqual(spans["outer"]["ts"], spans["inner"]["ts"])
+        self.assertGreaterEqual(spans["outer"]["dur"], spans["inner"]["dur"])
+        self.assertNotEqual(spans["outer"]["tid"], spans["thread"]["tid"])
+        self.assertIn("tracing-test", [event["args"]["name"] for event in events if event["ph"] == "M"])
+
+    def test_storage_reads_and_writes_are_traced(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            handler = NDataHandler.NDataHandler(pathlib.Path(temp_dir) / "data.ndata")
+            handler.write_properties({"a": 1}, datetime.datetime.now())
+            handler.write_data(numpy.zeros((4, 4)), datetime.datetime.now())
+            handler.read_data()
+            handler.close()
+        names = [event["name"] for event in Tracing.get_chrome_trace_events() if event.get("cat") == "storage"]
+        self.assertIn("NDataHandler.write_data", names)
+        self.assertIn("NDataHandler.read_data", names)
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
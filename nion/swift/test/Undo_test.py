@@ -0,0 +1,146 @@
+# standard libraries
+import logging
+import typing
+import unittest
+
+# third party libraries
+import numpy
+
+# local libraries
+from nion.swift import Application
+from nion.swift import Undo
+from nion.swift.model import DataItem
+from nion.swift.model import Graphics
+from nion.swift.test import TestContext
+from nion.ui import TestUI
+
+
+class ArrayHolder:
+
+    def __init__(self, value: numpy.ndarray) -> None:
+        self.value = value
+
+
+class SetArrayCommand(Undo.UndoableCommand):
+
+    def __init__(self, holder: ArrayHolder, value: numpy.ndarray) -> None:
+        super().__init__("Set Array")
+        self.__holder = holder
+        self.__old_value = holder.value
+        holder.value = value
+        self.initialize()
+
+    def _get_modified_state(self) -> typing.Any:
+        return None
+
+    def _set_modified_state(self, modified_state: typing.Any) -> None:
+        pass
+
+    def _get_spill_state(self) -> typing.Any:
+        return self.__old_value
+
+    def _set_spill_state(self, spill_state: typing.Any) -> None:
+        self.__old_value = spill_state
+
+    def _undo(self) -> None:
+        self.__holder.value, self.__old_value = self.__old_value, self.__holder.value
+
+
+class SetUnpicklableArrayCommand(SetArrayCommand):
+
+    def _get_spill_state(self) -> typing.Any:
+        return (super()._get_spill_state(), lambda: None)
+
+
+class TestUndoClass(unittest.TestCase):
+
+    def setUp(self):
+        TestContext.begin_leaks()
+        self.app = Application.Application(TestUI.UserInterface(), set_global=False)
+
+    def tearDown(self):
+        TestContext.end_leaks(self)
+
+    def test_retained_size_measures_arrays_held_by_command(self):
+        holder = ArrayHolder(numpy.zeros((128, 128)))
+        command = SetArrayCommand(holder, numpy.ones((128, 128)))
+        self.assertGreaterEqual(command.retained_size, holder.value.nbytes)
+        self.assertLess(command.retained_size, 2 * holder.value.nbytes)
+        command.close()
+
+    def test_commands_over_budget_are_spilled_and_restored_on_undo(self):
+        array_nbytes = numpy.zeros((128, 128)).nbytes
+        undo_stack = Undo.UndoStack(memory_budget=array_nbytes * 3 // 2)
+        holder = ArrayHolder(numpy.zeros((128, 128)))
+        arrays = [numpy.full((128, 128), i, dtype=float) for i in range(1, 4)]
+        commands = list()
+        for array in arrays:
+            command = SetArrayCommand(holder, array)
+            undo_stack.push(command)
+            commands.append(command)
+        self.assertEqual([True, True, False], [command.is_spilled for command in commands])
+        self.assertEqual(3, undo_stack._undo_count)
+        self.assertLessEqual(undo_stack.retained_size, undo_stack.memory_budget)
+        for i in reversed(range(3)):
+            self.assertTrue(numpy.array_equal(arrays[i], holder.value))
+            undo_stack.undo()
+        self.assertTrue(numpy.array_equal(numpy.zeros((128, 128)), holder.value))
+        undo_stack.redo()
+        self.assertTrue(numpy.array_equal(arrays[0], holder.value))
+        undo_stack.close()
+
+    def test_oldest_commands_are_dropped_when_spilling_is_disabled(self):
+        array_nbytes = numpy.zeros((128, 128)).nbytes
+        undo_stack = Undo.UndoStack(memory_budget=array_nbytes * 3 // 2, spill_enabled=False)
+        holder = ArrayHolder(numpy.zeros((128, 128)))
+        for i in range(1, 4):
+            undo_stack.push(SetArrayCommand(holder, numpy.full((128, 128), i, dtype=float)))
+        self.assertEqual(1, undo_stack._undo_count)
+        undo_stack.undo()
+        self.assertTrue(numpy.array_equal(numpy.full((128, 128), 2, dtype=float), holder.value))
+        undo_stack.close()
+
+    def test_commands_with_unpicklable_spill_state_stay_in_memory(self):
+        array_nbytes = numpy.zeros((128, 128)).nbytes
+        undo_stack = Undo.UndoStack(memory_budget=array_nbytes * 3 // 2)
+        holder = ArrayHolder(numpy.zeros((128, 128)))
+        commands = list()
+        for i in range(1, 4):
+            command = SetUnpicklableArrayCommand(holder, numpy.full((128, 128), i, dtype=float))
+            undo_stack.push(command)
+            commands.append(command)
+        self.assertFalse(any(command.is_spilled for command in commands))
+        self.assertEqual(1, undo_stack._undo_count)
+        undo_stack.undo()
+        self.assertTrue(numpy.array_equal(numpy.full((128, 128), 2, dtype=float), holder.value))
+        undo_stack.close()
+
+    def test_spilled_remove_graphics_commands_undo_in_document(self):
+        with TestContext.create_memory_context() as test_context:
+            document_controller = test_context.create_document_controller()
+            document_model = document_controller.document_model
+            document_controller._undo_stack.memory_budget = 2 * Undo.SPILL_SIZE_THRESHOLD
+            data_item = DataItem.DataItem(numpy.zeros((8, 8)))
+            document_model.append_data_item(data_item)
+            display_item = document_model.get_display_item_for_data_item(data_item)
+            labels = ["a" * Undo.SPILL_SIZE_THRESHOLD, "b" * Undo.SPILL_SIZE_THRESHOLD, "c"]
+            for label in labels:
+                graphic = Graphics.PointGraphic()
+                graphic.label = label
+                display_item.add_graphic(graphic)
+            commands = list()
+            for i in range(3):
+                command = document_controller.RemoveGraphicsCommand(document_controller, display_item, [display_item.graphics[0]])
+                command.perform()
+                document_controller.push_undo_command(command)
+                commands.append(command)
+            self.assertEqual(0, len(display_item.graphics))
+            self.assertTrue(commands[0].is_spilled)
+            for i in range(3):
+                document_controller.handle_undo()
+            self.assertEqual(labels, [graphic.label for graphic in display_item.graphics])
+
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()